@@ -0,0 +1,57 @@
+"""Runs the benchmarks of altqq.
+
+Usage: `python -m benchmarks [--save] [--filter TEXT] [--time-threshold X]`.
+The run fails when a case is slower, or allocates more memory, than the
+baseline by more than the thresholds.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks import runner
+from benchmarks.cases import create_cases
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the benchmarks.
+
+    Args:
+        argv (Optional[List[str]], optional): Command line arguments. Defaults
+            to the arguments of the process.
+
+    Returns:
+        int: Exit code, 1 when there are regressions.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="overwrite the baseline")
+    parser.add_argument("--filter", default="", help="only run matching cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--time-threshold", type=float, default=2.0)
+    parser.add_argument("--memory-threshold", type=float, default=1.1)
+    args = parser.parse_args(argv)
+
+    cases = [c for c in create_cases() if args.filter in c.name]
+    results = runner.run(cases, args.repeat)
+    baseline = runner.load(args.baseline) if args.baseline.exists() else {}
+    print(runner.format_table(results, baseline))
+
+    if args.save:
+        runner.save(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = runner.compare(
+        results, baseline, args.time_threshold, args.memory_threshold
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""Benchmark cases of altqq.
+
+The cases cover the creation of `Query` classes, their instantiation and the
+translations, across the nesting depth, the field count and the list length,
+and the throughput of the translations shared by multiple threads.
+"""
+
+import atexit
+import contextlib
+import dataclasses as dc
+import sqlite3
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ContextManager, Dict, Generic, List, Optional, TypeVar
+
+import altqq
+
+DEPTHS = (1, 8, 32)
+FIELD_COUNTS = (1, 16, 64)
+LIST_LENGTHS = (1, 64, 1024)
+THREAD_COUNTS = (1, 4, 8)
+VALIDATED_ROWS = 100
+THREADED_QUERIES = 256
+
+_T = TypeVar("_T")
+
+# Resources of the cases, closed when the benchmarks exit
+_RESOURCES = contextlib.ExitStack()
+atexit.register(_RESOURCES.close)
+
+TRANSLATORS: Dict[str, Callable[[altqq.Query], Any]] = {
+    "pyodbc": altqq.to_pyodbc,
+    "psycopg": altqq.to_psycopg,
+    "mysql": altqq.to_mysql,
+    "asyncpg": altqq.to_asyncpg,
+    "sqlite": altqq.to_sqlite,
+    "plain_text": altqq.to_plain_text,
+}
+
+
+@dc.dataclass(frozen=True)
+class Case:
+    """A single benchmarked function.
+
+    Attributes:
+        name (str): Unique name of the case, used as key in the baseline.
+        func (Callable[[], Any]): Function measured, called without arguments.
+    """
+
+    name: str
+    func: Callable[[], Any]
+
+
+class LazyResource(Generic[_T]):
+    """Resource shared by cases, created when a case first uses it.
+
+    The resource is entered as a context manager and exited when the
+    benchmarks exit, so cases skipped by the filter create nothing.
+    """
+
+    def __init__(self, create: Callable[[], ContextManager[_T]]):
+        self._create = create
+        self._value: Optional[_T] = None
+
+    def get(self) -> _T:
+        """Returns the resource, creating it on the first call."""
+        if self._value is None:
+            self._value = _RESOURCES.enter_context(self._create())
+        return self._value
+
+
+class Leaf(altqq.Query):
+    """Innermost query of the nested queries."""
+
+    __query__ = 'SELECT * FROM "{table}" WHERE a = {value}'
+
+    table: altqq.NonParameter[str]
+    value: int
+
+
+class Wrap(altqq.Query):
+    """Query wrapping another query."""
+
+    __query__ = "SELECT * FROM ({inner}) AS t WHERE b = {value}"
+
+    inner: altqq.Query
+    value: int
+
+
+class SelectIn(altqq.Query):
+    """Query with a single list parameter."""
+
+    __query__ = "SELECT * FROM t WHERE a IN {values}"
+
+    values: altqq.ListParameter[int]
+
+
+def create_wide_class(n_fields: int, defer_build: bool = False) -> type:
+    """Creates a `Query` class with `n_fields` integer parameters.
+
+    Args:
+        n_fields (int): Number of fields of the class.
+        defer_build (bool, optional): Defers the build of the validator.
+            Defaults to False.
+
+    Returns:
+        type: The created `Query` class.
+    """
+    names = [f"f{i}" for i in range(n_fields)]
+    conditions = " AND ".join(f"c{i} = {{{name}}}" for i, name in enumerate(names))
+    namespace = {
+        "__query__": f"SELECT * FROM t WHERE {conditions}",
+        "__annotations__": {name: int for name in names},
+    }
+    return types.new_class(
+        f"Wide{n_fields}",
+        (altqq.Query,),
+        {"defer_build": defer_build},
+        lambda ns: ns.update(namespace),
+    )
+
+
+def create_nested(depth: int) -> altqq.Query:
+    """Creates a query with `depth` levels of nesting.
+
+    Args:
+        depth (int): Number of queries nested, including the outermost.
+
+    Returns:
+        altqq.Query: The nested query.
+    """
+    query: altqq.Query = Leaf("Users", 0)
+    for i in range(1, depth):
+        query = Wrap(query, i)
+    return query
+
+
+def create_database(n_rows: int) -> sqlite3.Connection:
+    """Creates an in-memory database with a table `t` of `n_rows` rows.
+
+    Args:
+        n_rows (int): Number of rows of the table.
+
+    Returns:
+        sqlite3.Connection: Connection to the database.
+    """
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (a INTEGER PRIMARY KEY, b INTEGER)")
+    connection.executemany(
+        "INSERT INTO t VALUES (?, ?)", ((i, i) for i in range(n_rows))
+    )
+    return connection
+
+
+def execute_sqlite(
+    connection: LazyResource[sqlite3.Connection], query: altqq.Query
+) -> List[Any]:
+    """Translates a query and executes it in sqlite3.
+
+    Args:
+        connection (LazyResource[sqlite3.Connection]): Connection to the
+            database.
+        query (altqq.Query): Query to execute.
+
+    Returns:
+        List[Any]: Rows returned by the query.
+    """
+    res = altqq.to_sqlite(query)
+    return connection.get().execute(res.query, res.parameters).fetchall()
+
+
+def translate_threaded(
+    executor: LazyResource[ThreadPoolExecutor],
+    n_threads: int,
+    queries: List[altqq.Query],
+) -> None:
+    """Translates the queries split across threads, sharing the translators.
+
+    Args:
+        executor (LazyResource[ThreadPoolExecutor]): Pool with `n_threads`
+            workers.
+        n_threads (int): Number of parts the queries are split into.
+        queries (List[altqq.Query]): Queries to translate.
+    """
+    parts = [queries[i::n_threads] for i in range(n_threads)]
+    for _ in executor.get().map(
+        lambda part: [altqq.to_psycopg(q) for q in part], parts
+    ):
+        pass
+
+
+def create_cases() -> List[Case]:
+    """Creates all the benchmark cases.
+
+    Returns:
+        List[Case]: Cases in a stable order.
+    """
+    cases: List[Case] = []
+    for n in FIELD_COUNTS:
+        cases.append(
+            Case(f"class_creation[fields={n}]", lambda n=n: create_wide_class(n))
+        )
+        cases.append(
+            Case(
+                f"class_creation_deferred[fields={n}]",
+                lambda n=n: create_wide_class(n, defer_build=True),
+            )
+        )
+
+    for n in FIELD_COUNTS:
+        cls = create_wide_class(n)
+        values = {f"f{i}": i for i in range(n)}
+        cases.append(Case(f"instantiation[fields={n}]", lambda c=cls, v=values: c(**v)))
+        cases.append(
+            Case(f"construct[fields={n}]", lambda c=cls, v=values: c.construct(**v))
+        )
+        rows = [values] * VALIDATED_ROWS
+        cases.append(
+            Case(
+                f"validate_many[fields={n},rows={VALIDATED_ROWS}]",
+                lambda c=cls, r=rows: c.validate_many(r),
+            )
+        )
+
+    queries: Dict[str, altqq.Query] = {}
+    for depth in DEPTHS:
+        queries[f"depth={depth}"] = create_nested(depth)
+    for n in FIELD_COUNTS:
+        queries[f"fields={n}"] = create_wide_class(n)(**{f"f{i}": i for i in range(n)})
+    for n in LIST_LENGTHS:
+        queries[f"list={n}"] = SelectIn(list(range(n)))
+
+    for translator, func in TRANSLATORS.items():
+        for key, query in queries.items():
+            cases.append(Case(f"{translator}[{key}]", lambda f=func, q=query: f(q)))
+
+    connection = LazyResource(
+        lambda: contextlib.closing(create_database(max(LIST_LENGTHS)))
+    )
+    for n in LIST_LENGTHS:
+        query = SelectIn(list(range(n)))
+        cases.append(
+            Case(
+                f"sqlite_execute[list={n}]",
+                lambda q=query: execute_sqlite(connection, q),
+            )
+        )
+
+    # The same work is split across the threads, so the time per call drops
+    # with the thread count when the translations run in parallel
+    threaded_queries = [create_nested(8) for _ in range(THREADED_QUERIES)]
+    for n in THREAD_COUNTS:
+        executor = LazyResource(lambda n=n: ThreadPoolExecutor(n))
+        cases.append(
+            Case(
+                f"threaded_translation[threads={n}]",
+                lambda e=executor, n=n: translate_threaded(e, n, threaded_queries),
+            )
+        )
+
+    return cases
@@ -0,0 +1,169 @@
+"""Measures the benchmark cases and compares them to a baseline."""
+
+import dataclasses as dc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from benchmarks.cases import Case
+
+
+@dc.dataclass(frozen=True)
+class Result:
+    """Measurements of a benchmark case.
+
+    Attributes:
+        name (str): Name of the case.
+        time (float): Best time of a single call in seconds.
+        peak_memory (int): Peak memory allocated by a single call in bytes.
+    """
+
+    name: str
+    time: float
+    peak_memory: int
+
+
+def measure_time(case: Case, repeat: int = 5, min_time: float = 0.02) -> float:
+    """Measures the best time of a single call of a case.
+
+    The number of calls of each run is increased until a run takes at least
+    `min_time`, and the best of `repeat` runs is kept to reduce the noise.
+    The case is called once before, so the resources it creates on its first
+    call are not measured.
+
+    Args:
+        case (Case): Case to measure.
+        repeat (int, optional): Number of runs. Defaults to 5.
+        min_time (float, optional): Minimum time of a run. Defaults to 0.02.
+
+    Returns:
+        float: Time of a single call in seconds.
+    """
+    case.func()
+    timer = timeit.Timer(case.func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+
+def measure_memory(case: Case) -> int:
+    """Measures the peak memory allocated by a single call of a case.
+
+    Args:
+        case (Case): Case to measure.
+
+    Returns:
+        int: Peak memory in bytes.
+    """
+    case.func()
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(cases: Iterable[Case], repeat: int = 5) -> List[Result]:
+    """Measures the cases.
+
+    Args:
+        cases (Iterable[Case]): Cases to measure.
+        repeat (int, optional): Number of timing runs. Defaults to 5.
+
+    Returns:
+        List[Result]: Measurements of the cases.
+    """
+    return [
+        Result(case.name, measure_time(case, repeat), measure_memory(case))
+        for case in cases
+    ]
+
+
+def save(results: List[Result], path: Path) -> None:
+    """Saves the results as a baseline.
+
+    Args:
+        results (List[Result]): Results to save.
+        path (Path): JSON file of the baseline.
+    """
+    baseline = {
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "results": {
+            r.name: {"time": r.time, "peak_memory": r.peak_memory} for r in results
+        },
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Loads the results of a baseline.
+
+    Args:
+        path (Path): JSON file of the baseline.
+
+    Returns:
+        Dict[str, Any]: Measurements of the baseline by case name.
+    """
+    return json.loads(path.read_text())["results"]
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, Any],
+    time_threshold: float,
+    memory_threshold: float,
+) -> List[str]:
+    """Compares the results to a baseline.
+
+    Args:
+        results (List[Result]): Results of the current run.
+        baseline (Dict[str, Any]): Measurements of the baseline by case name.
+        time_threshold (float): Maximum ratio of the time to the baseline.
+        memory_threshold (float): Maximum ratio of the peak memory to the
+            baseline.
+
+    Returns:
+        List[str]: Description of the regressions, empty if there are none.
+    """
+    regressions: List[str] = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        time_ratio = result.time / expected["time"]
+        if time_ratio > time_threshold:
+            regressions.append(f"{result.name}: time x{time_ratio:.2f}")
+        memory_ratio = result.peak_memory / max(expected["peak_memory"], 1)
+        if memory_ratio > memory_threshold:
+            regressions.append(f"{result.name}: peak memory x{memory_ratio:.2f}")
+    return regressions
+
+
+def format_table(results: List[Result], baseline: Dict[str, Any]) -> str:
+    """Formats the results as a text table.
+
+    Args:
+        results (List[Result]): Results of the current run.
+        baseline (Dict[str, Any]): Measurements of the baseline by case name.
+
+    Returns:
+        str: Table with the time, peak memory and ratio to the baseline.
+    """
+    width = max(len(r.name) for r in results)
+    lines = [f"{'case':<{width}}  {'time (us)':>10}  {'peak (KiB)':>10}  {'ratio':>6}"]
+    for r in results:
+        expected = baseline.get(r.name)
+        ratio = f"{r.time / expected['time']:.2f}" if expected else "-"
+        lines.append(
+            f"{r.name:<{width}}  {r.time * 1e6:>10.2f}  "
+            f"{r.peak_memory / 1024:>10.1f}  {ratio:>6}"
+        )
+    return "\n".join(lines)
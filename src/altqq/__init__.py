@@ -1,34 +1,219 @@
 """Main entry point for the altqq library."""
 
-from altqq.structs import Calculated, Query
-from altqq.translators.mysql import MySQLQuery, MySQLTranslator
-from altqq.translators.plain_text import PlainTextTranslator
-from altqq.translators.psycopg import PsycopgQuery, PsycopgTranslator
-from altqq.translators.pyodbc import PyODBCQuery, PyODBCTranslator
-from altqq.types import ListParameter, NonParameter
+import importlib
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from altqq.structs import Calculated, Query, prewarm
+from altqq.types import ArrayParameter, ListParameter, NonParameter
+
+if TYPE_CHECKING:
+    from altqq.bound import BoundQuery
+    from altqq.translators.asyncpg import (
+        AsyncpgBatchQuery,
+        AsyncpgQuery,
+        AsyncpgTranslator,
+    )
+    from altqq.translators.cache import CacheInfo
+    from altqq.translators.common import ListBucketing
+    from altqq.translators.hooks import TranslationEvent
+    from altqq.translators.literals import LiteralRenderer
+    from altqq.translators.mysql import (
+        MySQLBatchQuery,
+        MySQLQuery,
+        MySQLTranslator,
+    )
+    from altqq.translators.plain_text import PlainTextTranslator, SupportsWrite
+    from altqq.translators.postgres_copy import CopyFormat, CopyWriter
+    from altqq.translators.psycopg import (
+        PsycopgBatchQuery,
+        PsycopgNamedQuery,
+        PsycopgNamedTranslator,
+        PsycopgQuery,
+        PsycopgTranslator,
+    )
+    from altqq.translators.pyodbc import (
+        PyODBCBatchQuery,
+        PyODBCQuery,
+        PyODBCTranslator,
+    )
+    from altqq.translators.sqlite import (
+        SQLiteBatchQuery,
+        SQLiteNamedQuery,
+        SQLiteNamedTranslator,
+        SQLiteQuery,
+        SQLiteTranslator,
+    )
 
 __all__ = [
     "Query",
     "Calculated",
     "NonParameter",
     "ListParameter",
+    "ArrayParameter",
+    "ListBucketing",
+    "BoundQuery",
+    "TranslationEvent",
+    "LiteralRenderer",
+    "CacheInfo",
+    "PyODBCTranslator",
+    "PsycopgTranslator",
+    "PsycopgNamedTranslator",
+    "CopyWriter",
+    "CopyFormat",
+    "MySQLTranslator",
+    "AsyncpgTranslator",
+    "SQLiteTranslator",
+    "SQLiteNamedTranslator",
+    "PlainTextTranslator",
     "to_pyodbc",
     "to_psycopg",
+    "to_psycopg_named",
     "to_mysql",
+    "to_asyncpg",
+    "to_sqlite",
+    "to_sqlite_named",
     "to_plain_text",
+    "iter_plain_text",
+    "write_plain_text",
+    "to_pyodbc_many",
+    "to_psycopg_many",
+    "to_mysql_many",
+    "to_asyncpg_many",
+    "to_sqlite_many",
+    "to_pyodbc_values",
+    "to_psycopg_values",
+    "to_mysql_values",
+    "to_asyncpg_values",
+    "to_sqlite_values",
+    "fingerprint",
+    "prewarm",
 ]
 
 
+# The translators are only imported when they are used, so the processes only
+# pay for the dialects they use
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "AsyncpgBatchQuery": "altqq.translators.asyncpg",
+    "AsyncpgQuery": "altqq.translators.asyncpg",
+    "AsyncpgTranslator": "altqq.translators.asyncpg",
+    "BoundQuery": "altqq.bound",
+    "CacheInfo": "altqq.translators.cache",
+    "ListBucketing": "altqq.translators.common",
+    "TranslationEvent": "altqq.translators.hooks",
+    "LiteralRenderer": "altqq.translators.literals",
+    "MySQLBatchQuery": "altqq.translators.mysql",
+    "MySQLQuery": "altqq.translators.mysql",
+    "MySQLTranslator": "altqq.translators.mysql",
+    "PlainTextTranslator": "altqq.translators.plain_text",
+    "CopyFormat": "altqq.translators.postgres_copy",
+    "CopyWriter": "altqq.translators.postgres_copy",
+    "PsycopgBatchQuery": "altqq.translators.psycopg",
+    "PsycopgNamedQuery": "altqq.translators.psycopg",
+    "PsycopgNamedTranslator": "altqq.translators.psycopg",
+    "PsycopgQuery": "altqq.translators.psycopg",
+    "PsycopgTranslator": "altqq.translators.psycopg",
+    "PyODBCBatchQuery": "altqq.translators.pyodbc",
+    "PyODBCQuery": "altqq.translators.pyodbc",
+    "PyODBCTranslator": "altqq.translators.pyodbc",
+    "SQLiteBatchQuery": "altqq.translators.sqlite",
+    "SQLiteNamedQuery": "altqq.translators.sqlite",
+    "SQLiteNamedTranslator": "altqq.translators.sqlite",
+    "SQLiteQuery": "altqq.translators.sqlite",
+    "SQLiteTranslator": "altqq.translators.sqlite",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the translator objects on their first access."""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> Iterable[str]:
+    """Lists the attributes of the module, including the lazy ones."""
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
+
+_T = TypeVar("_T")
+
+
+class _LazyTranslator(Generic[_T]):
+    """Class attribute creating a translator on its first access.
+
+    The created translator replaces the attribute, so the later accesses are
+    plain class attribute lookups.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, module: str, class_name: str):
+        self.module = module
+        self.class_name = class_name
+        self.owner: type = object
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> _T:
+        with self._lock:
+            value = self.owner.__dict__[self.name]
+            if value is self:
+                cls = getattr(importlib.import_module(self.module), self.class_name)
+                value = cls()
+                setattr(self.owner, self.name, value)
+        return value
+
+
 class Translators:
-    """Definition of available translators."""
+    """Definition of available translators.
+
+    Each translator is created, and its module imported, on its first use.
+    """
 
-    PYODBC = PyODBCTranslator()
-    PSYCOPG = PsycopgTranslator()
-    MYSQL = MySQLTranslator()
-    PLAIN_TEXT = PlainTextTranslator()
+    PYODBC: "_LazyTranslator[PyODBCTranslator]" = _LazyTranslator(
+        "altqq.translators.pyodbc", "PyODBCTranslator"
+    )
+    PSYCOPG: "_LazyTranslator[PsycopgTranslator]" = _LazyTranslator(
+        "altqq.translators.psycopg", "PsycopgTranslator"
+    )
+    PSYCOPG_NAMED: "_LazyTranslator[PsycopgNamedTranslator]" = _LazyTranslator(
+        "altqq.translators.psycopg", "PsycopgNamedTranslator"
+    )
+    MYSQL: "_LazyTranslator[MySQLTranslator]" = _LazyTranslator(
+        "altqq.translators.mysql", "MySQLTranslator"
+    )
+    ASYNCPG: "_LazyTranslator[AsyncpgTranslator]" = _LazyTranslator(
+        "altqq.translators.asyncpg", "AsyncpgTranslator"
+    )
+    SQLITE: "_LazyTranslator[SQLiteTranslator]" = _LazyTranslator(
+        "altqq.translators.sqlite", "SQLiteTranslator"
+    )
+    SQLITE_NAMED: "_LazyTranslator[SQLiteNamedTranslator]" = _LazyTranslator(
+        "altqq.translators.sqlite", "SQLiteNamedTranslator"
+    )
+    PLAIN_TEXT: "_LazyTranslator[PlainTextTranslator]" = _LazyTranslator(
+        "altqq.translators.plain_text", "PlainTextTranslator"
+    )
 
 
-def to_pyodbc(query: Query) -> PyODBCQuery:
+def to_pyodbc(query: Query) -> "PyODBCQuery":
     """Converts a `Query` to its corresponding `PyODBCQuery` object.
 
     Args:
@@ -40,7 +225,7 @@ def to_pyodbc(query: Query) -> PyODBCQuery:
     return Translators.PYODBC(query)
 
 
-def to_psycopg(query: Query) -> PsycopgQuery:
+def to_psycopg(query: Query) -> "PsycopgQuery":
     """Converts a `Query` to its corresponding `PsycopgQuery` object.
 
     Args:
@@ -52,7 +237,24 @@ def to_psycopg(query: Query) -> PsycopgQuery:
     return Translators.PSYCOPG(query)
 
 
-def to_mysql(query: Query) -> MySQLQuery:
+def to_psycopg_named(query: Query) -> "PsycopgNamedQuery":
+    """Converts a `Query` to its corresponding `PsycopgNamedQuery` object.
+
+    The parameters are written as `%(name)s`, named after the path of their
+    field, e.g. `%(query1__filter_value)s` for the `filter_value` of the nested
+    query in `query1`. A field written more than once by the same query
+    instance is bound a single time.
+
+    Args:
+        query (Query): Query to translate to Psycopg
+
+    Returns:
+        PsycopgNamedQuery: Equivalent query for Psycopg usage.
+    """
+    return Translators.PSYCOPG_NAMED(query)
+
+
+def to_mysql(query: Query) -> "MySQLQuery":
     """Converts a `Query` to its corresponding `MySQL` object.
 
     Args:
@@ -64,12 +266,261 @@ def to_mysql(query: Query) -> MySQLQuery:
     return Translators.MYSQL(query)
 
 
+def to_asyncpg(query: Query) -> "AsyncpgQuery":
+    """Converts a `Query` to its corresponding `AsyncpgQuery` object.
+
+    The parameters are written as `$1`, `$2`, ... in the order of the values
+    in `parameters`.
+
+    Args:
+        query (Query): Query to translate to asyncpg
+
+    Returns:
+        AsyncpgQuery: Equivalent query for asyncpg usage.
+    """
+    return Translators.ASYNCPG(query)
+
+
+def to_sqlite(query: Query) -> "SQLiteQuery":
+    """Converts a `Query` to its corresponding `SQLiteQuery` object.
+
+    Args:
+        query (Query): Query to translate to sqlite3
+
+    Returns:
+        SQLiteQuery: Equivalent query for sqlite3 usage.
+    """
+    return Translators.SQLITE(query)
+
+
+def to_sqlite_named(query: Query) -> "SQLiteNamedQuery":
+    """Converts a `Query` to its corresponding `SQLiteNamedQuery` object.
+
+    The parameters are written as `:name`, named after the path of their
+    field, e.g. `:query1__filter_value` for the `filter_value` of the nested
+    query in `query1`. A field written more than once by the same query
+    instance is bound a single time.
+
+    Args:
+        query (Query): Query to translate to sqlite3
+
+    Returns:
+        SQLiteNamedQuery: Equivalent query for sqlite3 usage.
+    """
+    return Translators.SQLITE_NAMED(query)
+
+
+def to_pyodbc_many(queries: Iterable[Query]) -> "PyODBCBatchQuery":
+    """Converts queries to a single `PyODBCBatchQuery` object.
+
+    All the queries must generate the same SQL, i.e. have the same classes,
+    non-parameter values and list parameter lengths. Only the parameters are
+    collected for each query, which are ready for `cursor.executemany`.
+
+    Args:
+        queries (Iterable[Query]): Queries to translate to PyODBC
+
+    Returns:
+        PyODBCBatchQuery: Equivalent query for PyODBC `executemany` usage.
+    """
+    return Translators.PYODBC.many(queries)
+
+
+def to_psycopg_many(queries: Iterable[Query]) -> "PsycopgBatchQuery":
+    """Converts queries to a single `PsycopgBatchQuery` object.
+
+    All the queries must generate the same SQL, i.e. have the same classes,
+    non-parameter values and list parameter lengths. Only the parameters are
+    collected for each query, which are ready for `cursor.executemany`.
+
+    Args:
+        queries (Iterable[Query]): Queries to translate to Psycopg
+
+    Returns:
+        PsycopgBatchQuery: Equivalent query for Psycopg `executemany` usage.
+    """
+    return Translators.PSYCOPG.many(queries)
+
+
+def to_mysql_many(queries: Iterable[Query]) -> "MySQLBatchQuery":
+    """Converts queries to a single `MySQLBatchQuery` object.
+
+    All the queries must generate the same SQL, i.e. have the same classes,
+    non-parameter values and list parameter lengths. Only the parameters are
+    collected for each query, which are ready for `cursor.executemany`.
+
+    Args:
+        queries (Iterable[Query]): Queries to translate to MySQL
+
+    Returns:
+        MySQLBatchQuery: Equivalent query for MySQL `executemany` usage.
+    """
+    return Translators.MYSQL.many(queries)
+
+
+def to_asyncpg_many(queries: Iterable[Query]) -> "AsyncpgBatchQuery":
+    """Converts queries to a single `AsyncpgBatchQuery` object.
+
+    All the queries must generate the same SQL, i.e. have the same classes,
+    non-parameter values and list parameter lengths. Only the parameters are
+    collected for each query, which are ready for `connection.executemany`.
+
+    Args:
+        queries (Iterable[Query]): Queries to translate to asyncpg
+
+    Returns:
+        AsyncpgBatchQuery: Equivalent query for asyncpg `executemany` usage.
+    """
+    return Translators.ASYNCPG.many(queries)
+
+
+def to_sqlite_many(queries: Iterable[Query]) -> "SQLiteBatchQuery":
+    """Converts queries to a single `SQLiteBatchQuery` object.
+
+    All the queries must generate the same SQL, i.e. have the same classes,
+    non-parameter values and list parameter lengths. Only the parameters are
+    collected for each query, which are ready for `cursor.executemany`.
+
+    Args:
+        queries (Iterable[Query]): Queries to translate to sqlite3
+
+    Returns:
+        SQLiteBatchQuery: Equivalent query for sqlite3 `executemany` usage.
+    """
+    return Translators.SQLITE.many(queries)
+
+
+def to_pyodbc_values(
+    statement: Union[str, Query], rows: Iterable[Any]
+) -> Iterator["PyODBCQuery"]:
+    """Converts rows to multi-row `VALUES` `PyODBCQuery` objects.
+
+    The rows are written after the statement as `(...),(...),...`. Rows can be
+    `Query` objects, e.g. with `__query__ = "({first_name}, {age})"`, or
+    dataclass instances, whose fields are all written as parameters. A new
+    query is started whenever the SQL Server parameter limit would be exceeded.
+
+    Args:
+        statement (Union[str, Query]): Statement written before the rows,
+            e.g. `INSERT INTO Users (first_name, age) VALUES`.
+        rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+
+    Returns:
+        Iterator[PyODBCQuery]: Queries inserting the rows.
+    """
+    return Translators.PYODBC.values(statement, rows)
+
+
+def to_psycopg_values(
+    statement: Union[str, Query], rows: Iterable[Any]
+) -> Iterator["PsycopgQuery"]:
+    """Converts rows to multi-row `VALUES` `PsycopgQuery` objects.
+
+    The rows are written after the statement as `(...),(...),...`. Rows can be
+    `Query` objects, e.g. with `__query__ = "({first_name}, {age})"`, or
+    dataclass instances, whose fields are all written as parameters. A new
+    query is started whenever the PostgreSQL parameter limit would be exceeded.
+
+    Args:
+        statement (Union[str, Query]): Statement written before the rows,
+            e.g. `INSERT INTO Users (first_name, age) VALUES`.
+        rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+
+    Returns:
+        Iterator[PsycopgQuery]: Queries inserting the rows.
+    """
+    return Translators.PSYCOPG.values(statement, rows)
+
+
+def to_mysql_values(
+    statement: Union[str, Query], rows: Iterable[Any]
+) -> Iterator["MySQLQuery"]:
+    """Converts rows to multi-row `VALUES` `MySQLQuery` objects.
+
+    The rows are written after the statement as `(...),(...),...`. Rows can be
+    `Query` objects, e.g. with `__query__ = "({first_name}, {age})"`, or
+    dataclass instances, whose fields are all written as parameters. A new
+    query is started whenever the MySQL parameter limit would be exceeded.
+
+    Args:
+        statement (Union[str, Query]): Statement written before the rows,
+            e.g. `INSERT INTO Users (first_name, age) VALUES`.
+        rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+
+    Returns:
+        Iterator[MySQLQuery]: Queries inserting the rows.
+    """
+    return Translators.MYSQL.values(statement, rows)
+
+
+def to_asyncpg_values(
+    statement: Union[str, Query], rows: Iterable[Any]
+) -> Iterator["AsyncpgQuery"]:
+    """Converts rows to multi-row `VALUES` `AsyncpgQuery` objects.
+
+    The rows are written after the statement as `(...),(...),...`. Rows can be
+    `Query` objects, e.g. with `__query__ = "({first_name}, {age})"`, or
+    dataclass instances, whose fields are all written as parameters. A new
+    query is started whenever the asyncpg parameter limit would be exceeded.
+
+    Args:
+        statement (Union[str, Query]): Statement written before the rows,
+            e.g. `INSERT INTO Users (first_name, age) VALUES`.
+        rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+
+    Returns:
+        Iterator[AsyncpgQuery]: Queries inserting the rows.
+    """
+    return Translators.ASYNCPG.values(statement, rows)
+
+
+def to_sqlite_values(
+    statement: Union[str, Query], rows: Iterable[Any]
+) -> Iterator["SQLiteQuery"]:
+    """Converts rows to multi-row `VALUES` `SQLiteQuery` objects.
+
+    The rows are written after the statement as `(...),(...),...`. Rows can be
+    `Query` objects, e.g. with `__query__ = "({first_name}, {age})"`, or
+    dataclass instances, whose fields are all written as parameters. A new
+    query is started whenever the SQLite parameter limit would be exceeded.
+
+    Args:
+        statement (Union[str, Query]): Statement written before the rows,
+            e.g. `INSERT INTO Users (first_name, age) VALUES`.
+        rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+
+    Returns:
+        Iterator[SQLiteQuery]: Queries inserting the rows.
+    """
+    return Translators.SQLITE.values(statement, rows)
+
+
+def fingerprint(query: Query) -> str:
+    """Computes the fingerprint of the SQL generated by a `Query`.
+
+    Queries with the same fingerprint generate the same SQL and only differ in
+    their parameters. The fingerprint depends on the query classes, the
+    non-parameter values and the list lengths, so it is computed without
+    generating the SQL. It is equal to the `fingerprint` attribute of the
+    translated `PyODBCQuery`, `PsycopgQuery`, `MySQLQuery`, `AsyncpgQuery` and
+    `SQLiteQuery`.
+
+    Args:
+        query (Query): Query to compute the fingerprint of.
+
+    Returns:
+        str: Hexadecimal digest of the structure of the query.
+    """
+    return Translators.PYODBC.fingerprint(query)
+
+
 def to_plain_text(query: Query) -> str:
     """Converts a `Query` to a plain text SQL.
 
     The conversion to plain text also handles some of the data types. None
     is converted to `NULL`, numeric values are written as they are and
-    string values and other object types are escaped using `'`.
+    string values and other object types are quoted using `'`, doubling the
+    `'` they contain. See `altqq.LiteralRenderer` for the other types.
 
     Args:
         query (Query): Query to convert.
@@ -78,3 +529,46 @@ def to_plain_text(query: Query) -> str:
         str: Query as plain text.
     """
     return Translators.PLAIN_TEXT(query)
+
+
+def iter_plain_text(queries: Iterable[Query], separator: str = ";\n") -> Iterator[str]:
+    r"""Converts queries to a plain text SQL script, generated as chunks.
+
+    The queries are consumed lazily and each one is followed by the
+    `separator`, so scripts of any size can be generated.
+
+    Args:
+        queries (Iterable[Query]): Queries to convert.
+        separator (str, optional): Text written after each query. Defaults to
+            ";\n".
+
+    Returns:
+        Iterator[str]: Chunks of the SQL script.
+    """
+    return Translators.PLAIN_TEXT.iter_chunks(queries, separator)
+
+
+def write_plain_text(
+    queries: Iterable[Query],
+    fp: "SupportsWrite",
+    separator: str = ";\n",
+    encoding: Optional[str] = None,
+) -> int:
+    r"""Writes queries as a plain text SQL script to a file-like object.
+
+    The SQL is written while it is generated, including the values of large
+    list parameters, so the memory used does not depend on the size of the
+    script. Set the `encoding` to write to binary files or `mmap` objects.
+
+    Args:
+        queries (Iterable[Query]): Queries to convert.
+        fp (SupportsWrite): Object with a `write` method, e.g. a file.
+        separator (str, optional): Text written after each query. Defaults to
+            ";\n".
+        encoding (Optional[str], optional): Encodes the text before it is
+            written. Defaults to None, which writes the text as it is.
+
+    Returns:
+        int: Number of characters written, or of bytes if encoded.
+    """
+    return Translators.PLAIN_TEXT.write(queries, fp, separator, encoding)
@@ -0,0 +1,215 @@
+"""Queries with some of their fields bound ahead of the translation."""
+
+import dataclasses as dc
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from altqq.plans import QueryField
+from altqq.structs import Query
+from altqq.types import QueryValueTypes
+
+if TYPE_CHECKING:
+    from altqq.translators.asyncpg import AsyncpgQuery
+    from altqq.translators.mysql import MySQLQuery
+    from altqq.translators.psycopg import PsycopgNamedQuery, PsycopgQuery
+    from altqq.translators.pyodbc import PyODBCQuery
+    from altqq.translators.sqlite import SQLiteQuery
+
+_Q = TypeVar("_Q", bound=Query)
+_T = TypeVar("_T", covariant=True)
+
+
+class BoundTranslator(Protocol[_T]):
+    """Translator able to reuse the SQL written for a `BoundQuery`."""
+
+    def translate_bound(self, bound: "BoundQuery[Any]", query: Query) -> _T:
+        """Converts a query created from a `BoundQuery`."""
+        ...
+
+
+class BoundQuery(Generic[_Q]):
+    """Query class with some of its fields bound, usually the structural ones.
+
+    Created with `Query.bind`, e.g. `SelectTableByFilter.bind(table="Users",
+    filter_column="id")`. The translators write the SQL of a bound query once
+    and reuse it for the later translations, which only collect the values of
+    the remaining, dynamic, fields. The SQL is written again when the
+    structure of the dynamic fields changes, e.g. the length of a list
+    parameter.
+
+    Attributes:
+        query_class (Type[_Q]): Class of the created queries.
+        values (Dict[str, Any]): Values of the bound fields.
+        dynamic_fields (FrozenSet[str]): Fields that are not bound, including
+            the calculated ones.
+        structural_fields (Tuple[QueryField, ...]): Dynamic fields changing the
+            SQL, i.e. non-parameters, list parameters and possible queries.
+    """
+
+    def __init__(self, query_class: Type[_Q], values: Dict[str, Any]):
+        """Binds the values of some fields of a query class.
+
+        Args:
+            query_class (Type[_Q]): Class of the created queries.
+            values (Dict[str, Any]): Values of the bound fields.
+
+        Raises:
+            TypeError: When a value is given for an unknown field.
+        """
+        init_fields = {f.name for f in query_class.__query_init_fields__}
+        unknown = [name for name in values if name not in init_fields]
+        if unknown:
+            raise TypeError(f"Unknown fields {', '.join(unknown)}.")
+
+        self.query_class = query_class
+        self.values = dict(values)
+        self.dynamic_fields: FrozenSet[str] = frozenset(
+            f.name for f in dc.fields(query_class) if f.name not in values
+        )
+        self.structural_fields: Tuple[QueryField, ...] = tuple(
+            f
+            for f in query_class.__query_plan__.placed_fields
+            if f.name in self.dynamic_fields
+            and (
+                f.may_be_query
+                or f.role == QueryValueTypes.NON_PARAMETER
+                or f.role == QueryValueTypes.LIST_PARAMETER
+            )
+        )
+
+    def __repr__(self) -> str:
+        """Represents the bound query with its class and bound values."""
+        values = ", ".join(f"{k}={v!r}" for k, v in self.values.items())
+        return f"{self.query_class.__name__}.bind({values})"
+
+    def create(self, **values: Any) -> _Q:
+        """Creates a query with the bound values and the given values.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Raises:
+            TypeError: When a value is given for a bound field.
+
+        Returns:
+            _Q: Validated query.
+        """
+        bound = [name for name in values if name in self.values]
+        if bound:
+            raise TypeError(f"Fields {', '.join(bound)} are already bound.")
+        return self.query_class(**self.values, **values)
+
+    def translate(self, translator: BoundTranslator[_T], **values: Any) -> _T:
+        """Creates a query and converts it with a translator.
+
+        Args:
+            translator (BoundTranslator[_T]): Translator of the query, e.g.
+                `Translators.PSYCOPG`.
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            _T: Equivalent query for the driver.
+        """
+        return translator.translate_bound(self, self.create(**values))
+
+    def to_pyodbc(self, **values: Any) -> "PyODBCQuery":
+        """Creates a query and converts it to a `PyODBCQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            PyODBCQuery: Equivalent query for PyODBC usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.PYODBC, **values)
+
+    def to_psycopg(self, **values: Any) -> "PsycopgQuery":
+        """Creates a query and converts it to a `PsycopgQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            PsycopgQuery: Equivalent query for Psycopg usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.PSYCOPG, **values)
+
+    def to_psycopg_named(self, **values: Any) -> "PsycopgNamedQuery":
+        """Creates a query and converts it to a `PsycopgNamedQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            PsycopgNamedQuery: Equivalent query for Psycopg usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.PSYCOPG_NAMED, **values)
+
+    def to_mysql(self, **values: Any) -> "MySQLQuery":
+        """Creates a query and converts it to a `MySQLQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            MySQLQuery: Equivalent query for MySQL usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.MYSQL, **values)
+
+    def to_asyncpg(self, **values: Any) -> "AsyncpgQuery":
+        """Creates a query and converts it to an `AsyncpgQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            AsyncpgQuery: Equivalent query for asyncpg usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.ASYNCPG, **values)
+
+    def to_sqlite(self, **values: Any) -> "SQLiteQuery":
+        """Creates a query and converts it to a `SQLiteQuery` object.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            SQLiteQuery: Equivalent query for sqlite3 usage.
+        """
+        from altqq import Translators
+
+        return self.translate(Translators.SQLITE, **values)
+
+    def to_plain_text(self, **values: Any) -> str:
+        """Creates a query and converts it to a plain text SQL.
+
+        The plain text has no parameters, so it is always fully translated.
+
+        Args:
+            **values (Any): Values of the dynamic fields.
+
+        Returns:
+            str: Query as plain text.
+        """
+        from altqq import Translators
+
+        return Translators.PLAIN_TEXT(self.create(**values))
@@ -0,0 +1,94 @@
+"""Columnar values of the fields of a query class."""
+
+import typing
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, cast
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+# Validators of the field columns, by query class and field name
+_ADAPTERS: "weakref.WeakKeyDictionary[type, Dict[str, TypeAdapter[Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def column_to_list(column: Any) -> List[Any]:
+    """Converts a column of values to a list of Python objects.
+
+    NumPy arrays, and other objects with a `tolist` method, are converted with
+    it, which converts their items to Python objects in a single call. Objects
+    supporting the buffer protocol, e.g. `array.array`, are converted through
+    a `memoryview`.
+
+    Args:
+        column (Any): Sequence, array or buffer of the values.
+
+    Raises:
+        TypeError: When the column is a string or is not iterable.
+
+    Returns:
+        List[Any]: Values of the column.
+    """
+    if isinstance(column, list):
+        return cast(List[Any], column)
+    if isinstance(column, (str, bytes)):
+        raise TypeError("A column must be a sequence of values, not a string.")
+    tolist: Any = getattr(column, "tolist", None)
+    if tolist is not None:
+        return list(tolist())
+    try:
+        view = memoryview(column)
+    except TypeError:
+        return list(column)
+    with view:
+        return view.tolist()
+
+
+def _field_types(query_class: type) -> Dict[str, Any]:
+    try:
+        return typing.get_type_hints(query_class, include_extras=True)
+    except Exception:
+        # Types that can't be resolved are validated with the raw annotations
+        return dict(getattr(query_class, "__annotations__", {}))
+
+
+def _adapter(query_class: type, name: str) -> "TypeAdapter[Any]":
+    adapters = _ADAPTERS.get(query_class)
+    if adapters is None:
+        adapters = _ADAPTERS.setdefault(query_class, {})
+    adapter = adapters.get(name)
+    if adapter is None:
+        from pydantic import ConfigDict, TypeAdapter
+
+        field_type = _field_types(query_class).get(name, Any)
+        config = ConfigDict(arbitrary_types_allowed=True)
+        adapter = adapters[name] = TypeAdapter(
+            cast(Any, List)[field_type], config=config
+        )
+    return adapter
+
+
+def validate_columns(
+    query_class: type, columns: Mapping[str, List[Any]]
+) -> Dict[str, List[Any]]:
+    """Validates and converts the columns of the fields of a query class.
+
+    Each column is validated in a single call against the type of its field,
+    with the same conversions as the instantiation of the class. The errors
+    are located by the row index.
+
+    Args:
+        query_class (type): Class of the query.
+        columns (Mapping[str, List[Any]]): Values of the fields, by name.
+
+    Raises:
+        pydantic.ValidationError: When a value is not valid for its field.
+
+    Returns:
+        Dict[str, List[Any]]: Converted values of the fields, by name.
+    """
+    return {
+        name: _adapter(query_class, name).validate_python(values)
+        for name, values in columns.items()
+    }
@@ -0,0 +1,133 @@
+"""Per-class description of how the fields of a query are translated."""
+
+import collections.abc
+import dataclasses as dc
+import datetime
+import decimal
+import enum
+import sys
+import typing
+import uuid
+from typing import Any, Dict, List, Tuple, TypeVar, Union
+
+from typing_extensions import Annotated, Literal
+
+from altqq.templates import QueryTemplate
+from altqq.types import QueryValueTypes, get_parameter_type
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    UNION_TYPES: Tuple[Any, ...] = (Union, UnionType)
+else:
+    UNION_TYPES: Tuple[Any, ...] = (Union,)
+
+# Classes whose values are never queries, even when a query inherits them
+_NON_QUERY_TYPES: Tuple[type, ...] = (
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    bytearray,
+    memoryview,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    uuid.UUID,
+    enum.Enum,
+    type(None),
+    collections.abc.Collection,
+    collections.abc.Iterator,
+)
+
+
+@dc.dataclass(frozen=True)
+class QueryField:
+    """Translation details of a single field of a `Query` class."""
+
+    name: str
+    role: QueryValueTypes
+    may_be_query: bool
+    slots: Tuple[int, ...]
+
+
+@dc.dataclass(frozen=True)
+class QueryPlan:
+    """Translation details of a `Query` class.
+
+    The plan is computed once when the class is created so the translators do
+    not need to inspect the types of the fields on every translation. The
+    `placed_fields` are the fields used in the template and `slots` are the
+    fields of each template placeholder, in order.
+    """
+
+    template: QueryTemplate
+    fields: Tuple[QueryField, ...]
+    placed_fields: Tuple[QueryField, ...]
+    slots: Tuple[QueryField, ...]
+
+
+def _may_be_query(cls: Any, query_type: type) -> bool:
+    # Unresolved or unknown typing constructs could hold anything
+    if isinstance(cls, (str, TypeVar)) or cls is Any or cls is object:
+        return True
+    if isinstance(cls, query_type):
+        return True
+
+    origin = typing.get_origin(cls)
+    if origin is Annotated:
+        return _may_be_query(typing.get_args(cls)[0], query_type)
+    if origin in UNION_TYPES:
+        return any(_may_be_query(arg, query_type) for arg in typing.get_args(cls))
+    if origin is Literal:
+        return False
+    if isinstance(origin, type):
+        return _may_be_query(origin, query_type)
+    # Other classes, e.g. mixins, may be inherited by the queries
+    return not isinstance(cls, type) or not issubclass(cls, _NON_QUERY_TYPES)
+
+
+def _get_field_types(dataclass: type) -> Dict[str, Any]:
+    fields = dc.fields(dataclass)
+    try:
+        hints = typing.get_type_hints(dataclass, include_extras=True)
+    except Exception:
+        # Types that can't be resolved are handled with the raw annotations
+        hints = {}
+    return {f.name: hints.get(f.name, f.type) for f in fields}
+
+
+def build_plan(dataclass: type, template: QueryTemplate, query_type: type) -> QueryPlan:
+    """Creates the translation plan of a `Query` class.
+
+    Args:
+        dataclass (type): Dataclass of the query.
+        template (QueryTemplate): Compiled `__query__` of the class.
+        query_type (type): Type of the classes that are considered a `Query`.
+
+    Returns:
+        QueryPlan: Translation plan of the class.
+    """
+    slot_indices: Dict[str, List[int]] = {}
+    for i, placeholder in enumerate(template.placeholders):
+        slot_indices.setdefault(placeholder, []).append(i)
+
+    fields = tuple(
+        QueryField(
+            name=name,
+            role=get_parameter_type(field_type),
+            may_be_query=_may_be_query(field_type, query_type),
+            slots=tuple(slot_indices.get(name, ())),
+        )
+        for name, field_type in _get_field_types(dataclass).items()
+    )
+    fields_by_name = {f.name: f for f in fields}
+    slots = tuple(fields_by_name[p] for p in template.placeholders)
+    return QueryPlan(
+        template=template,
+        fields=fields,
+        placed_fields=tuple(f for f in fields if f.slots),
+        slots=slots,
+    )
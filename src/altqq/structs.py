@@ -1,13 +1,42 @@
 """Structures used for defining queries."""
 
 import dataclasses as dc
-from typing import Any, ClassVar, Dict, Tuple
+import functools
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
-import pydantic.dataclasses as pdc
-from pydantic import ConfigDict
 from typing_extensions import dataclass_transform, get_annotations
 
+from altqq.plans import QueryPlan, build_plan
+from altqq.templates import QueryTemplate, compile_template
+
+if TYPE_CHECKING:
+    from altqq.bound import BoundQuery
+
 QUERY_ATTRIB = "__query__"
+TEMPLATE_ATTRIB = "__query_template__"
+PLAN_ATTRIB = "__query_plan__"
+INIT_FIELDS_ATTRIB = "__query_init_fields__"
+INIT_DEFAULTS_ATTRIB = "__query_init_defaults__"
+LIST_ADAPTER_ATTRIB = "__query_list_adapter__"
+
+_Q = TypeVar("_Q", bound="Query")
+
+# Classes whose Pydantic validator is not built yet
+_DEFERRED_CLASSES: "weakref.WeakSet[type]" = weakref.WeakSet()
 
 
 class _Calculated:
@@ -18,21 +47,45 @@ class _Calculated:
 Calculated: Any = _Calculated
 
 
+def _constant(value: Any) -> Any:
+    return value
+
+
 @dataclass_transform()
 class QueryMeta(type):
     """Metaclass for generating Query objects that the library supports.
 
     Classes using this metaclass are automatically converted to Pydantic
     Dataclasses for validation support. Also, the `__query__` attribute is
-    verified to be provided either as a value or as a type hint.
+    verified to be provided either as a value or as a type hint. When given as
+    a value, it is compiled once into the `__query_template__` attribute and
+    the translation plan of the fields is stored in `__query_plan__`. The base
+    `Query` class has no fields and is not converted, so Pydantic is only
+    imported once the first query class is defined.
+
+    Building the Pydantic validator of a class can be deferred to its first
+    instantiation with the `defer_build` class keyword, e.g.
+    `class MyQuery(Query, defer_build=True)`, or for all the classes defined
+    afterwards by setting `QueryMeta.defer_build` to True. `prewarm` builds
+    the deferred validators ahead of time. Deferring is a no-op with Pydantic
+    versions before 2.10, which build the validators of the dataclasses when
+    they are defined.
+
+    The `frozen` class keyword creates immutable and hashable queries, which
+    the translators can cache. The validator of the lists of queries used by
+    `validate_many` is created on its first use and stored in
+    `__query_list_adapter__`.
 
     Raises:
-        ValueError: When the `__query__` attribute is not defined.
+        ValueError: When the `__query__` attribute is not defined or when it
+            contains placeholders that are not fields of the class.
 
     Returns:
         _type_: A new type compatible for the library query functionalities.
     """
 
+    defer_build: ClassVar[bool] = False
+
     @staticmethod
     def _check_query_attribute(dataclass: "QueryMeta"):
         try:
@@ -50,17 +103,118 @@ class QueryMeta(type):
             if v == Calculated:
                 dct[k] = dc.field(init=False)
 
-    def __new__(cls, name: str, bases: Tuple[type, ...], dct: Dict[str, Any]):
+    @staticmethod
+    def _resolve_defaults(
+        fields: Tuple["dc.Field[Any]", ...],
+    ) -> Tuple[Optional[Callable[[], Any]], ...]:
+        # Fields declared with pydantic.Field keep a FieldInfo as default
+        from pydantic.fields import FieldInfo
+        from pydantic_core import PydanticUndefined
+
+        defaults: List[Optional[Callable[[], Any]]] = []
+        for field in fields:
+            default: Any = field.default
+            if field.default_factory is not dc.MISSING:
+                defaults.append(field.default_factory)
+            elif isinstance(default, FieldInfo):
+                if default.default_factory is not None:
+                    defaults.append(
+                        functools.partial(
+                            default.get_default, call_default_factory=True
+                        )
+                    )
+                elif default.default is PydanticUndefined:
+                    defaults.append(None)
+                else:
+                    defaults.append(functools.partial(_constant, default.default))
+            elif default is dc.MISSING:
+                defaults.append(None)
+            else:
+                defaults.append(functools.partial(_constant, default))
+        return tuple(defaults)
+
+    @classmethod
+    def _compile_query_attribute(cls, dataclass: type):
+        query = getattr(dataclass, QUERY_ATTRIB, None)
+        if not isinstance(query, str):
+            return
+
+        template = compile_template(query)
+        field_names = {f.name for f in dc.fields(dataclass)}
+        for placeholder in template.placeholders:
+            if placeholder not in field_names:
+                raise ValueError(
+                    f"Placeholder '{placeholder}' in {QUERY_ATTRIB} is not a field."
+                )
+        setattr(dataclass, TEMPLATE_ATTRIB, template)
+        setattr(dataclass, PLAN_ATTRIB, build_plan(dataclass, template, cls))
+
+    def __new__(
+        cls,
+        name: str,
+        bases: Tuple[type, ...],
+        dct: Dict[str, Any],
+        defer_build: Optional[bool] = None,
+        frozen: bool = False,
+    ):
         """Creates a new class of the metaclass.
 
-        This wraps the newly created class with Pydantic Dataclass and checks
-        the `__query__` attribute.
+        This wraps the newly created class with Pydantic Dataclass, checks
+        the `__query__` attribute and compiles it. When `defer_build` is not
+        given, `QueryMeta.defer_build` is used.
         """
         cls._resolve_calculated_fields(dct)
         dataclass = super().__new__(cls, name, bases, dct)
         if not cls._check_query_attribute(dataclass):
             raise ValueError(f"A {QUERY_ATTRIB} value or type hint must be provided.")
-        return pdc.dataclass(dataclass, config=ConfigDict(arbitrary_types_allowed=True))
+        if name == "Query" and dct.get("__module__") == __name__:
+            setattr(dataclass, INIT_FIELDS_ATTRIB, ())
+            setattr(dataclass, INIT_DEFAULTS_ATTRIB, ())
+            return dataclass
+
+        import pydantic.dataclasses as pdc
+        from pydantic import ConfigDict
+
+        if defer_build is None:
+            defer_build = QueryMeta.defer_build
+        config = ConfigDict(arbitrary_types_allowed=True, defer_build=defer_build)
+        dataclass = pdc.dataclass(dataclass, config=config, frozen=frozen)
+        cls._compile_query_attribute(dataclass)
+        init_fields = tuple(f for f in dc.fields(dataclass) if f.init)
+        setattr(dataclass, INIT_FIELDS_ATTRIB, init_fields)
+        setattr(dataclass, INIT_DEFAULTS_ATTRIB, cls._resolve_defaults(init_fields))
+        setattr(dataclass, LIST_ADAPTER_ATTRIB, None)
+        # Pydantic versions before 2.10 ignore defer_build for dataclasses
+        if defer_build and not getattr(dataclass, "__pydantic_complete__", True):
+            _DEFERRED_CLASSES.add(dataclass)
+        return dataclass
+
+
+def prewarm(classes: Optional[Iterable[Type["Query"]]] = None) -> int:
+    """Builds the Pydantic validators of the deferred query classes.
+
+    This moves the cost of the first instantiation of the classes created
+    with `defer_build` to a chosen moment, e.g. before forking the workers of
+    a server.
+
+    Args:
+        classes (Optional[Iterable[Type[Query]]], optional): Classes to build.
+            Defaults to None, which builds all the deferred classes.
+
+    Returns:
+        int: Number of validators built.
+    """
+    import pydantic.dataclasses as pdc
+
+    if classes is None:
+        classes = list(_DEFERRED_CLASSES)
+    built = 0
+    for cls in classes:
+        # Query classes are Pydantic dataclasses, but are not typed as such
+        if pdc.rebuild_dataclass(cast(Any, cls)):
+            built += 1
+        _DEFERRED_CLASSES.discard(cls)
+    return built
 
 
 class Query(metaclass=QueryMeta):
@@ -71,3 +225,98 @@ class Query(metaclass=QueryMeta):
     """
 
     __query__: ClassVar[str]
+    __query_template__: ClassVar[QueryTemplate]
+    __query_plan__: ClassVar[QueryPlan]
+    __query_init_fields__: ClassVar[Tuple["dc.Field[Any]", ...]]
+    __query_init_defaults__: ClassVar[Tuple[Optional[Callable[[], Any]], ...]]
+    __query_list_adapter__: ClassVar[Any] = None
+
+    @classmethod
+    def construct(cls: Type[_Q], **values: Any) -> _Q:
+        """Creates a query without validating the values.
+
+        This is meant for values that are known to be valid, like the ones
+        coming from other validated objects. The fields are assigned as they
+        are, without any of the Pydantic type conversions. The `__post_init__`
+        method is still called so the calculated values are assigned.
+
+        Args:
+            **values (Any): Values of the fields of the query.
+
+        Raises:
+            TypeError: When a required field is missing or when a value is
+                given for an unknown field.
+
+        Returns:
+            _Q: Query with the given values.
+        """
+        query = cls.__new__(cls)
+        fields = zip(cls.__query_init_fields__, cls.__query_init_defaults__)
+        for field, default in fields:
+            if field.name in values:
+                value = values.pop(field.name)
+            elif default is not None:
+                value = default()
+            else:
+                raise TypeError(f"Missing value for the field '{field.name}'.")
+            object.__setattr__(query, field.name, value)
+
+        if values:
+            raise TypeError(f"Unknown fields {', '.join(values)}.")
+
+        post_init = getattr(query, "__post_init__", None)
+        if post_init is not None:
+            post_init()
+        return query
+
+    @classmethod
+    def validate_many(cls: Type[_Q], rows: Iterable[Any]) -> List[_Q]:
+        """Creates queries from many rows with a single validation.
+
+        The rows are validated as a list by the Pydantic validator, which
+        avoids the cost of calling the validator of the class for each row.
+        The `__post_init__` method is still called for each query, so the
+        calculated values are assigned.
+
+        Args:
+            rows (Iterable[Any]): Values of the fields of each query, as
+                mappings, or queries of the class.
+
+        Raises:
+            pydantic.ValidationError: When the values of a row are not valid.
+                The location of the errors starts with the row index.
+
+        Returns:
+            List[_Q]: Queries with the values of the rows.
+        """
+        adapter = cls.__dict__.get(LIST_ADAPTER_ATTRIB)
+        if adapter is None:
+            from pydantic import TypeAdapter
+
+            adapter = TypeAdapter(cast(Any, List)[cls])
+            setattr(cls, LIST_ADAPTER_ATTRIB, adapter)
+        if not isinstance(rows, list):
+            rows = list(rows)
+        return adapter.validate_python(rows)
+
+    @classmethod
+    def bind(cls: Type[_Q], **values: Any) -> "BoundQuery[_Q]":
+        """Binds the values of some fields, usually the structural ones.
+
+        The translators write the SQL of the bound query once and reuse it
+        for the queries created from it, e.g.
+        `SelectTableByFilter.bind(table="Users", filter_column="id")` followed
+        by `.to_psycopg(filter_value=10)` for each value.
+
+        Args:
+            **values (Any): Values of the bound fields.
+
+        Raises:
+            TypeError: When a value is given for an unknown field.
+
+        Returns:
+            BoundQuery[_Q]: Bound query creating and translating the queries.
+        """
+        from altqq.bound import BoundQuery
+
+        return BoundQuery(cls, values)
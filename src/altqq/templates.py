@@ -0,0 +1,81 @@
+"""Compiled representation of the `__query__` templates."""
+
+import dataclasses as dc
+from string import Formatter
+from typing import Callable, Dict, List, Tuple
+
+LiteralEscape = Callable[[str], str]
+
+
+@dc.dataclass(frozen=True)
+class QueryTemplate:
+    """Pre-parsed `__query__` of a `Query` class.
+
+    The template is split into literal segments and placeholder slots. The
+    literal at index `i` is written right before the placeholder at index `i`,
+    which means there is always one more literal than there are placeholders.
+    """
+
+    literals: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+    _escaped: Dict[LiteralEscape, Tuple[str, ...]] = dc.field(
+        default_factory=lambda: {}, init=False, repr=False, compare=False
+    )
+
+    def escaped(self, escape: LiteralEscape) -> Tuple[str, ...]:
+        """Returns the literal segments escaped for a specific dialect.
+
+        The escaped segments are computed once per escape function and reused
+        on succeeding calls. Segments that are not changed by the escaping are
+        the same objects as in `literals`.
+
+        Args:
+            escape (LiteralEscape): Function used to escape the literal text.
+
+        Returns:
+            Tuple[str, ...]: Escaped literal segments.
+        """
+        literals = self._escaped.get(escape)
+        if literals is None:
+            escaped_literals: List[str] = []
+            for literal in self.literals:
+                escaped = escape(literal)
+                escaped_literals.append(literal if escaped == literal else escaped)
+            literals = tuple(escaped_literals)
+            self._escaped[escape] = literals
+        return literals
+
+
+def compile_template(query: str) -> QueryTemplate:
+    """Parses a `__query__` string into a `QueryTemplate`.
+
+    Args:
+        query (str): Query string following the python formatting standards.
+
+    Raises:
+        ValueError: When a placeholder is positional or uses a conversion or
+            a format specification.
+
+    Returns:
+        QueryTemplate: Compiled version of the query string.
+    """
+    literals: List[str] = []
+    placeholders: List[str] = []
+    literal_buffer: List[str] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(query):
+        literal_buffer.append(literal)
+        if field_name is None:
+            continue
+        if not field_name:
+            raise ValueError("Positional placeholders are not supported.")
+        if format_spec or conversion:
+            raise ValueError(
+                f"Placeholder '{field_name}' can not have a conversion or format."
+            )
+
+        literals.append("".join(literal_buffer))
+        placeholders.append(field_name)
+        literal_buffer = []
+
+    literals.append("".join(literal_buffer))
+    return QueryTemplate(literals=tuple(literals), placeholders=tuple(placeholders))
@@ -0,0 +1,50 @@
+"""Module for converting Query objects for asyncpg execution."""
+
+import dataclasses as dc
+from typing import Any, List, Tuple
+
+from altqq.translators.dialects import Dialect, DialectTranslator, PlaceholderStyle
+
+# asyncpg does not interpret the query text, so no escaping is needed. The
+# lists are adapted to PostgreSQL arrays.
+ASYNCPG_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.NUMERIC,
+    max_parameters=32767,
+    array_parameter=list,
+)
+
+
+@dc.dataclass
+class AsyncpgQuery:
+    """Converted `Query` object for asyncpg usage."""
+
+    query: str
+    parameters: Tuple[Any, ...]
+    fingerprint: str = dc.field(default="", compare=False)
+
+
+@dc.dataclass
+class AsyncpgBatchQuery:
+    """Converted `Query` objects for asyncpg `executemany` usage."""
+
+    query: str
+    parameters: List[Tuple[Any, ...]]
+
+
+class AsyncpgTranslator(DialectTranslator[AsyncpgQuery, AsyncpgBatchQuery]):
+    """Converts a `Query` to its corresponding `AsyncpgQuery` object."""
+
+    DIALECT = ASYNCPG_DIALECT
+    DIALECT_NAME = "asyncpg"
+
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> AsyncpgQuery:
+        return AsyncpgQuery(
+            query=query, parameters=tuple(parameters), fingerprint=fingerprint
+        )
+
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> AsyncpgBatchQuery:
+        return AsyncpgBatchQuery(query=query, parameters=parameters)
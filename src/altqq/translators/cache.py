@@ -0,0 +1,233 @@
+"""Memoization of the translations of hashable queries."""
+
+import dataclasses as dc
+import threading
+import weakref
+from typing import Any, Callable, Dict, Generic, List, Set, Tuple, TypeVar, cast
+
+from altqq.structs import Query
+
+_T = TypeVar("_T")
+
+
+def _cache_key(query: Query) -> Tuple[Any, ...]:
+    """Creates the cache key of a query, holding the type of each value.
+
+    Values like `1`, `True`, `1.0` and `Decimal(1)` are equal in Python, but
+    are translated to different parameters and literals, so the key holds the
+    type of each value of the query, including the nested queries and tuples.
+    The values are walked with an explicit stack, like `write_query`, so the
+    depth of the nesting is not limited by the recursion limit.
+
+    Raises:
+        TypeError: When the query, or a value of it, is not hashable.
+    """
+    key: List[Any] = []
+    stack: List[Any] = [query]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Query):
+            if type(value).__hash__ is None:
+                raise TypeError(f"Unhashable query: {type(value).__name__}")
+            key.append(type(value))
+            fields = value.__query_plan__.fields
+            stack.extend(getattr(value, f.name) for f in reversed(fields))
+        elif isinstance(value, tuple):
+            items = cast(Tuple[Any, ...], value)
+            key += (type(items), len(items))
+            stack.extend(reversed(items))
+        else:
+            key += (type(value), value)
+    return tuple(key)
+
+
+@dc.dataclass(frozen=True)
+class CacheInfo:
+    """Statistics of a `TranslationCache`.
+
+    Attributes:
+        hits (int): Translations returned from the cache.
+        misses (int): Translations of hashable queries not in the cache.
+        evictions (int): Translations removed to stay within `max_size`.
+        unhashable (int): Translations of queries that cannot be cached.
+        size (int): Number of translations in the cache.
+        max_size (int): Maximum number of translations in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    unhashable: int
+    size: int
+    max_size: int
+
+
+class _ThreadToken:
+    """Object kept by a thread until it finishes."""
+
+
+def _add_counts(
+    a: Tuple[int, int, int], b: Tuple[int, int, int]
+) -> Tuple[int, int, int]:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+class _ThreadStats:
+    """Statistics of a `TranslationCache` counted by a single thread."""
+
+    __slots__ = ("hits", "misses", "unhashable")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.unhashable = 0
+
+    def counts(self) -> Tuple[int, int, int]:
+        """Returns the hits, the misses and the unhashable translations."""
+        return (self.hits, self.misses, self.unhashable)
+
+
+class TranslationCache(Generic[_T]):
+    """Bounded cache of translations, keyed by the values of the query.
+
+    Only hashable queries, e.g. from classes defined with `frozen=True`, are
+    cached. Queries with equal values of the same types share the same
+    translation, so the returned objects must not be modified.
+
+    The hits take no lock. Instead of moving the entry like a strict LRU, a
+    hit marks it as used, and the eviction moves the used entries to the end
+    once, so the least recently used entries are evicted on a best effort
+    basis. The statistics are counted by each thread without a lock, and the
+    ones of the finished threads are added to the totals.
+    """
+
+    def __init__(self, max_size: int):
+        """Creates the cache.
+
+        Args:
+            max_size (int): Maximum number of translations kept.
+
+        Raises:
+            ValueError: When `max_size` is not positive.
+        """
+        if max_size <= 0:
+            raise ValueError("The maximum size of the cache must be positive.")
+        self.max_size = max_size
+        # Translations with whether they were used since their insertion
+        self._data: Dict[Any, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._live_stats: Set[_ThreadStats] = set()
+        self._retired = (0, 0, 0)
+        self._cleared = (0, 0, 0)
+        self._evictions = 0
+
+    def _stats(self) -> _ThreadStats:
+        try:
+            return self._local.stats
+        except AttributeError:
+            pass
+        stats = self._local.stats = _ThreadStats()
+        # The token is dropped with the thread, which retires its statistics
+        token = self._local.token = _ThreadToken()
+        finalizer = weakref.finalize(
+            token, self._retire_stats, weakref.ref(self), stats
+        )
+        finalizer.atexit = False
+        with self._lock:
+            self._live_stats.add(stats)
+        return stats
+
+    @staticmethod
+    def _retire_stats(
+        cache_ref: "weakref.ref[TranslationCache[Any]]", stats: _ThreadStats
+    ) -> None:
+        cache = cache_ref()
+        if cache is not None:
+            cache._retire(stats)
+
+    def _retire(self, stats: _ThreadStats) -> None:
+        with self._lock:
+            self._live_stats.discard(stats)
+            self._retired = _add_counts(self._retired, stats.counts())
+
+    def _totals(self) -> Tuple[int, int, int]:
+        totals = self._retired
+        for stats in self._live_stats:
+            totals = _add_counts(totals, stats.counts())
+        return totals
+
+    def get(self, query: Query, translate: Callable[[Query], _T]) -> _T:
+        """Returns the translation of a query, translating it if needed.
+
+        Args:
+            query (Query): Query to translate.
+            translate (Callable[[Query], _T]): Translates the query when it is
+                not in the cache.
+
+        Returns:
+            _T: Translation of the query.
+        """
+        stats = self._stats()
+        try:
+            key = _cache_key(query)
+            entry = self._data.get(key)
+        except TypeError:
+            stats.unhashable += 1
+            return translate(query)
+
+        if entry is not None:
+            entry[1] = True
+            stats.hits += 1
+            return entry[0]
+
+        stats.misses += 1
+        result = translate(query)
+        with self._lock:
+            self._data.setdefault(key, [result, False])
+            while len(self._data) > self.max_size:
+                self._evict()
+        return result
+
+    def _evict(self) -> None:
+        # Entries used since they were inserted get a second chance at the end
+        key = next(iter(self._data))
+        for _ in range(len(self._data)):
+            entry = self._data[key]
+            if not entry[1]:
+                break
+            entry[1] = False
+            del self._data[key]
+            self._data[key] = entry
+            key = next(iter(self._data))
+        del self._data[key]
+        self._evictions += 1
+
+    def info(self) -> CacheInfo:
+        """Returns the statistics of the cache.
+
+        Returns:
+            CacheInfo: Statistics of the cache.
+        """
+        with self._lock:
+            totals = self._totals()
+            hits, misses, unhashable = (t - c for t, c in zip(totals, self._cleared))
+            return CacheInfo(
+                hits=hits,
+                misses=misses,
+                evictions=self._evictions,
+                unhashable=unhashable,
+                size=len(self._data),
+                max_size=self.max_size,
+            )
+
+    def clear(self) -> None:
+        """Removes all the translations and resets the statistics.
+
+        The counters of the threads are not modified, the statistics are
+        counted from their values at the time of the call instead.
+        """
+        with self._lock:
+            self._data.clear()
+            self._evictions = 0
+            self._cleared = self._totals()
@@ -1,12 +1,28 @@
 """Translator related functions not belonging to other areas."""
 
-import typing
-from typing import Any, Set, Type, cast
+import dataclasses as dc
+import hashlib
+import json
+import weakref
+from collections.abc import Collection
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-from typing_extensions import Annotated
+from altqq.structs import Query, QueryMeta
+from altqq.templates import LiteralEscape
 
-from altqq.structs import Query
+# ANNOTATED_TYPES and get_parameter_type moved to altqq.types, but are still
+# exposed here for the existing imports of this module
+from altqq.types import ANNOTATED_TYPES as ANNOTATED_TYPES
 from altqq.types import QueryValueTypes
+from altqq.types import get_parameter_type as get_parameter_type
 
 
 def is_query_instance(value: Any) -> bool:
@@ -21,39 +37,445 @@ def is_query_instance(value: Any) -> bool:
     return isinstance(value, Query)
 
 
-ANNOTATED_TYPES: Set[QueryValueTypes] = {
-    QueryValueTypes.NON_PARAMETER,
-    QueryValueTypes.LIST_PARAMETER,
-}
+def create_list_markers(marker: str, n: int) -> str:
+    """Creates list markers for list parameter types.
+
+    Args:
+        marker (str): Parameter marker used by the translation
+        n (int): Number of parameters in the list
+
+    Returns:
+        str: String to represent the list
+    """
+    comma_separated = ",".join(marker for _ in range(n))
+    return f"({comma_separated})"
+
 
+def to_json_array(value: Collection[Any]) -> str:
+    """Converts the values of an array parameter to a JSON array.
 
-def get_parameter_type(cls: Type[Any]) -> QueryValueTypes:
-    """Extracts the value type based on the typing.
+    Values that are not supported by JSON are written as strings.
 
     Args:
-        cls (Type[Any]): Type to check.
+        value (Collection[Any]): Values of the array parameter.
 
     Returns:
-        QueryValueTypes: Role of the value in the query
+        str: JSON array of the values.
     """
-    if typing.get_origin(cls) == Annotated:
-        # Pyright can't match the __metadata__ attribute to Annotated
-        for metadata in cls.__metadata__:  # type: ignore
-            if metadata in ANNOTATED_TYPES:
-                return cast(QueryValueTypes, metadata)
+    return json.dumps(list(value), default=str)
 
-    return QueryValueTypes.PARAMETER
 
+def _keep_list(value: Collection[Any]) -> Collection[Any]:
+    return value
 
-def create_list_markers(marker: str, n: int) -> str:
-    """Creates list markers for list parameter types.
+
+@dc.dataclass(frozen=True)
+class ParameterConverters:
+    """Conversions applied to the parameters by a translator.
+
+    Attributes:
+        array_parameter (Callable[[Collection[Any]], Any]): Converts the values
+            of an array parameter to the value bound by the driver.
+        list_parameter (Callable[[Collection[Any]], Collection[Any]]): Converts
+            the values of a list parameter before they are expanded.
+    """
+
+    array_parameter: Callable[[Collection[Any]], Any] = list
+    list_parameter: Callable[[Collection[Any]], Collection[Any]] = _keep_list
+
+
+DEFAULT_CONVERTERS = ParameterConverters()
+
+
+@dc.dataclass(frozen=True)
+class ListBucketing:
+    """Rounds up the number of list parameter markers to fixed sizes.
+
+    Every list length generates a different SQL, which prevents the database
+    from reusing its cached statements and plans. Padding the lists to a fixed
+    set of sizes limits the number of different SQL generated. The lists are
+    padded by repeating their last value, which does not change the result of
+    an `IN` condition.
+
+    Attributes:
+        sizes (Tuple[int, ...]): Allowed list sizes. Lists longer than the
+            largest size, or all lists if no size is given, are rounded up to
+            the next power of two.
+        pad_with_null (bool): Pads the lists with `None` instead of their last
+            value. Avoid this for `NOT IN` conditions.
+    """
+
+    sizes: Tuple[int, ...] = ()
+    pad_with_null: bool = False
+
+    def __post_init__(self):
+        """Sorts the sizes so the smallest fitting size is found first."""
+        object.__setattr__(self, "sizes", tuple(sorted(self.sizes)))
+
+    def size(self, n: int) -> int:
+        """Computes the number of markers used for a list.
+
+        Args:
+            n (int): Length of the list.
+
+        Returns:
+            int: Number of markers, which is at least `n`.
+        """
+        if n == 0:
+            return 0
+        for size in self.sizes:
+            if size >= n:
+                return size
+        return 1 << (n - 1).bit_length()
+
+    def pad(self, value: Collection[Any]) -> Collection[Any]:
+        """Pads a list to its bucket size.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+
+        Returns:
+            Collection[Any]: Values padded to the bucket size.
+        """
+        n = len(value)
+        padding = self.size(n) - n
+        if padding == 0:
+            return value
+
+        values = list(value)
+        fill = None if self.pad_with_null else values[-1]
+        values.extend(fill for _ in range(padding))
+        return values
+
+
+class SegmentWriter:
+    """Collects the segments of a query translation.
+
+    The segments of the SQL are written in `parts`, the parameter values in
+    `parameters` and the structure of the SQL in `structure`. The SQL is
+    only joined once, at the end of the translation. The default
+    implementation writes the parameters with a single parameter `marker`.
+    Translators can subclass it to write the segments differently.
+
+    When an `escape` function is given, the literal text and the non-parameter
+    values are escaped. The original text of the escaped segments is kept in
+    `unescaped`, since the escaping is only needed when there are parameters.
+
+    Writers setting `track_references` receive the field written in
+    `reference`, which identifies the query instance and the field, and in
+    `name`, which is the path of the field from the translated query.
+    """
+
+    def __init__(
+        self,
+        marker: str = "",
+        converters: ParameterConverters = DEFAULT_CONVERTERS,
+        escape: Optional[LiteralEscape] = None,
+    ):
+        self.marker = marker
+        self.converters = converters
+        self.escape = escape
+        self.parts: List[str] = []
+        self.parameters: List[Any] = []
+        self.structure: List[Any] = []
+        self.unescaped: List[Tuple[int, str]] = []
+        self.track_references = False
+        self.reference: Tuple[int, str] = (0, "")
+        self.name = ""
+
+    def next_marker(self) -> str:
+        """Returns the marker of the next parameter.
+
+        Returns:
+            str: Parameter marker.
+        """
+        return self.marker
+
+    def list_markers(self, n: int) -> str:
+        """Returns the markers of the next `n` parameters as a list.
+
+        Args:
+            n (int): Number of parameters in the list.
+
+        Returns:
+            str: String to represent the list.
+        """
+        return create_list_markers(self.marker, n)
+
+    def non_parameter(self, value: str) -> None:
+        """Writes a non-parameter value.
+
+        Args:
+            value (str): Value converted to a string.
+        """
+        if self.escape is not None:
+            escaped = self.escape(value)
+            if escaped != value:
+                self.unescaped.append((len(self.parts), value))
+                value = escaped
+        self.parts.append(value)
+
+    def parameter(self, value: Any) -> None:
+        """Writes a parameter value.
+
+        Args:
+            value (Any): Parameter value.
+        """
+        self.parts.append(self.next_marker())
+        self.parameters.append(value)
+
+    def list_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of a list parameter.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+        """
+        value = self.converters.list_parameter(value)
+        self.structure.append(len(value))
+        self.parts.append(self.list_markers(len(value)))
+        self.parameters.extend(value)
+
+    def array_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of an array parameter.
+
+        Args:
+            value (Collection[Any]): Values of the array parameter.
+        """
+        self.parts.append(self.next_marker())
+        self.parameters.append(self.converters.array_parameter(value))
+
+    def render(self, escaped: Optional[bool] = None) -> str:
+        """Joins the written segments.
+
+        Args:
+            escaped (Optional[bool], optional): Whether to keep the escaped
+                segments. Defaults to None, which escapes only if there are
+                parameters.
+
+        Returns:
+            str: SQL of the written segments.
+        """
+        if escaped is None:
+            escaped = len(self.parameters) > 0
+        if escaped or not self.unescaped:
+            return "".join(self.parts)
+
+        parts = list(self.parts)
+        for i, text in self.unescaped:
+            parts[i] = text
+        return "".join(parts)
+
+    @property
+    def sql(self) -> str:
+        """SQL of the written segments."""
+        return self.render()
+
+
+_Writer = TypeVar("_Writer", bound=SegmentWriter)
+
+
+def write_query(query: Query, writer: _Writer, prefix: str = "") -> _Writer:
+    """Writes the segments of a query, including its nested queries.
+
+    The nested queries are written in place with an explicit stack instead of
+    recursion, so every segment is only written once regardless of the depth.
 
     Args:
-        marker (str): Parameter marker used by the translation
-        n (int): Number of parameters in the list
+        query (Query): Query to write.
+        writer (_Writer): Writer receiving the segments.
+        prefix (str, optional): Prefix of the field names given to writers
+            tracking the references. Defaults to "".
 
     Returns:
-        str: String to represent the list
+        _Writer: The writer given.
     """
-    comma_separated = ",".join(marker for _ in range(n))
-    return f"({comma_separated})"
+    parts = writer.parts
+    structure = writer.structure
+    unescaped = writer.unescaped
+    escape = writer.escape
+    track = writer.track_references
+    stack: List[Tuple[Query, int, str]] = [(query, 0, prefix)]
+    while stack:
+        current, start, prefix = stack.pop()
+        plan = current.__query_plan__
+        literals = plan.template.literals
+        written = literals if escape is None else plan.template.escaped(escape)
+        slots = plan.slots
+        if start == 0:
+            structure.append(type(current))
+
+        for i in range(start, len(slots)):
+            if written[i] is not literals[i]:
+                unescaped.append((len(parts), literals[i]))
+            parts.append(written[i])
+
+            field = slots[i]
+            value = getattr(current, field.name)
+            if field.may_be_query:
+                if is_query_instance(value):
+                    stack.append((current, i + 1, prefix))
+                    stack.append((value, 0, f"{prefix}{field.name}__"))
+                    break
+                structure.append(None)
+            if track:
+                writer.reference = (id(current), field.name)
+                writer.name = prefix + field.name
+
+            if field.role == QueryValueTypes.NON_PARAMETER:
+                text = str(value)
+                structure.append(text)
+                writer.non_parameter(text)
+            elif field.role == QueryValueTypes.LIST_PARAMETER:
+                writer.list_parameter(value)
+            elif field.role == QueryValueTypes.ARRAY_PARAMETER:
+                writer.array_parameter(value)
+            else:
+                writer.parameter(value)
+        else:
+            if written[-1] is not literals[-1]:
+                unescaped.append((len(parts), literals[-1]))
+            parts.append(written[-1])
+
+    return writer
+
+
+# Structure tokens of the classes, by class
+_CLASS_TOKENS: "weakref.WeakKeyDictionary[type, str]" = weakref.WeakKeyDictionary()
+
+
+def _class_token(cls: type) -> str:
+    token = _CLASS_TOKENS.get(cls)
+    if token is None:
+        # Classes can share their name, e.g. when created by a factory, so the
+        # token also holds what the class writes
+        name = f"{cls.__module__}.{cls.__qualname__}"
+        if isinstance(cls, QueryMeta):
+            written = getattr(cls, "__query__", "")
+        elif dc.is_dataclass(cls):
+            written = tuple(f.name for f in dc.fields(cls))
+        else:
+            written = ""
+        token = _CLASS_TOKENS[cls] = f"C{name}{written!r}"
+    return token
+
+
+def _structure_token(token: Any) -> str:
+    if isinstance(token, type):
+        return _class_token(token)
+    if isinstance(token, str):
+        return f"N{token!r}"
+    if token is None:
+        return "P"
+    if isinstance(token, tuple):
+        return f"R{token[1]}"
+    return f"L{token}"
+
+
+def structure_fingerprint(structure: List[Any]) -> str:
+    """Computes a stable fingerprint of a structure from a `SegmentWriter`.
+
+    The fingerprint does not depend on the running process, so it can be
+    stored or shared between processes.
+
+    Args:
+        structure (List[Any]): Structure of a query.
+
+    Returns:
+        str: Hexadecimal digest of the structure.
+    """
+    text = "\0".join(_structure_token(token) for token in structure)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def write_structure(
+    query: Query,
+    converters: ParameterConverters = DEFAULT_CONVERTERS,
+    deduplicate: bool = False,
+    parameters: Optional[List[Any]] = None,
+) -> List[Any]:
+    """Collects the structure of a query, without writing its segments.
+
+    The structure is the same as the one collected by a `SegmentWriter`, or
+    by a `DialectWriter` with `deduplicate`, but no SQL is written, so it is
+    cheaper to compute. The parameter values, in the order they would be
+    written, are only collected when a `parameters` list is given.
+
+    Args:
+        query (Query): Query to collect the structure of.
+        converters (ParameterConverters, optional): Conversions applied to
+            the parameters by the translator.
+        deduplicate (bool, optional): Whether the fields written again by the
+            same query instance reuse their first parameters. Defaults to
+            False.
+        parameters (Optional[List[Any]], optional): List receiving the
+            parameter values. Defaults to None.
+
+    Returns:
+        List[Any]: Structure of the query.
+    """
+    structure: List[Any] = []
+    references: Dict[Tuple[int, str], int] = {}
+    stack: List[Tuple[Query, int]] = [(query, 0)]
+    while stack:
+        current, start = stack.pop()
+        slots = current.__query_plan__.slots
+        if start == 0:
+            structure.append(type(current))
+
+        for i in range(start, len(slots)):
+            field = slots[i]
+            value = getattr(current, field.name)
+            if field.may_be_query:
+                if is_query_instance(value):
+                    stack.append((current, i + 1))
+                    stack.append((value, 0))
+                    break
+                structure.append(None)
+
+            if field.role == QueryValueTypes.NON_PARAMETER:
+                structure.append(str(value))
+                continue
+            if deduplicate:
+                reference = (id(current), field.name)
+                index = references.get(reference)
+                if index is not None:
+                    structure.append(("ref", index))
+                    continue
+                references[reference] = len(references)
+            if field.role == QueryValueTypes.LIST_PARAMETER:
+                values = converters.list_parameter(value)
+                structure.append(len(values))
+                if parameters is not None:
+                    parameters.extend(values)
+            elif parameters is None:
+                continue
+            elif field.role == QueryValueTypes.ARRAY_PARAMETER:
+                parameters.append(converters.array_parameter(value))
+            else:
+                parameters.append(value)
+
+    return structure
+
+
+def fingerprint(
+    query: Query,
+    converters: ParameterConverters = DEFAULT_CONVERTERS,
+    deduplicate: bool = False,
+) -> str:
+    """Computes the fingerprint of the SQL generated by a query.
+
+    Queries with the same fingerprint generate the same SQL. It only depends
+    on the query classes, the non-parameter values and the list lengths, so
+    the SQL does not need to be generated to compute it.
+
+    Args:
+        query (Query): Query to compute the fingerprint of.
+        converters (ParameterConverters, optional): Conversions applied to
+            the parameters by the translator.
+        deduplicate (bool, optional): Whether the translator reuses the
+            parameters of the fields written again. Defaults to False.
+
+    Returns:
+        str: Hexadecimal digest of the structure of the query.
+    """
+    return structure_fingerprint(write_structure(query, converters, deduplicate))
@@ -0,0 +1,739 @@
+"""Translation core shared by the translators with query parameters."""
+
+import abc
+import dataclasses as dc
+import enum
+import itertools
+import time
+import weakref
+from collections.abc import Collection
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from altqq.bound import BoundQuery
+from altqq.columns import column_to_list, validate_columns
+from altqq.structs import Query
+from altqq.templates import LiteralEscape
+from altqq.translators import common
+from altqq.translators.cache import TranslationCache
+from altqq.translators.hooks import InstrumentedTranslator
+from altqq.types import QueryValueTypes
+
+
+def escape_percent(text: str) -> str:
+    """Escapes the `%` characters in a query text.
+
+    Args:
+        text (str): Text to escape.
+
+    Returns:
+        str: Text with `%` written as `%%`.
+    """
+    return text.replace("%", "%%")
+
+
+class PlaceholderStyle(enum.Enum):
+    """Defines how the parameters are written in the SQL."""
+
+    QMARK = "?"
+    FORMAT = "%s"
+    NUMERIC = "${}"
+    NAMED = ":{}"
+    PYFORMAT = "%({})s"
+
+    @property
+    def numbered(self) -> bool:
+        """Whether the marker contains the position of the parameter."""
+        return "{}" in self.value and not self.named
+
+    @property
+    def named(self) -> bool:
+        """Whether the marker contains the name of the parameter."""
+        return self in (PlaceholderStyle.NAMED, PlaceholderStyle.PYFORMAT)
+
+    def marker(self, key: Union[int, str]) -> str:
+        """Returns the marker of a parameter.
+
+        Args:
+            key (Union[int, str]): One-based position of the parameter, or its
+                name for the named styles.
+
+        Returns:
+            str: Parameter marker.
+        """
+        return self.value.format(key)
+
+
+@dc.dataclass(frozen=True)
+class Dialect:
+    """Description of the SQL expected by a database driver.
+
+    Attributes:
+        placeholder (PlaceholderStyle): How the parameters are written.
+        max_parameters (int): Maximum number of parameters of a query.
+        escape (Optional[LiteralEscape]): Escapes the literal text of the query
+            when there are parameters.
+        array_parameter (Callable[[Collection[Any]], Any]): Converts the values
+            of an array parameter to the value bound by the driver.
+    """
+
+    placeholder: PlaceholderStyle
+    max_parameters: int
+    escape: Optional[LiteralEscape] = None
+    array_parameter: Callable[[Collection[Any]], Any] = list
+
+
+class DialectWriter(common.SegmentWriter):
+    """Collects the segments of a translation following a `Dialect`.
+
+    The position of numbered parameter markers starts after `offset`. Named
+    parameter markers use the path of their field, e.g. `filter__value`, and
+    the names are kept in `names` in the order of the parameters.
+
+    With `deduplicate`, or with a named placeholder style, a field written
+    again by the same query instance reuses the markers written the first
+    time instead of binding its value again.
+    """
+
+    def __init__(
+        self,
+        dialect: Dialect,
+        converters: common.ParameterConverters = common.DEFAULT_CONVERTERS,
+        offset: int = 0,
+        deduplicate: bool = False,
+    ):
+        super().__init__(dialect.placeholder.value, converters, dialect.escape)
+        self.placeholder = dialect.placeholder
+        self.numbered = dialect.placeholder.numbered
+        self.named = dialect.placeholder.named
+        self.offset = offset
+        self.deduplicate = deduplicate or self.named
+        self.track_references = self.deduplicate
+        self.names: List[str] = []
+        self._used_names: Set[str] = set()
+        # Markers of the written references, and the order they were written
+        self.references: Dict[Tuple[int, str], Tuple[str, int]] = {}
+
+    def _name_marker(self, name: str) -> str:
+        if name in self._used_names:
+            raise ValueError(f"Parameter name {name!r} is used by different fields.")
+        self._used_names.add(name)
+        self.names.append(name)
+        return self.placeholder.marker(name)
+
+    def next_marker(self) -> str:
+        """Returns the marker of the next parameter.
+
+        Returns:
+            str: Parameter marker.
+        """
+        if self.named:
+            return self._name_marker(self.name)
+        if not self.numbered:
+            return self.marker
+        return self.placeholder.marker(self.offset + len(self.parameters) + 1)
+
+    def list_markers(self, n: int) -> str:
+        """Returns the markers of the next `n` parameters as a list.
+
+        Args:
+            n (int): Number of parameters in the list.
+
+        Returns:
+            str: String to represent the list.
+        """
+        if self.named:
+            markers = ",".join(self._name_marker(f"{self.name}__{i}") for i in range(n))
+            return f"({markers})"
+        if not self.numbered:
+            return common.create_list_markers(self.marker, n)
+
+        start = self.offset + len(self.parameters) + 1
+        markers = ",".join(self.placeholder.marker(p) for p in range(start, start + n))
+        return f"({markers})"
+
+    def _reuse(self) -> bool:
+        written = self.references.get(self.reference)
+        if written is None:
+            return False
+        self.parts.append(written[0])
+        self.structure.append(("ref", written[1]))
+        return True
+
+    def _remember(self) -> None:
+        self.references[self.reference] = (self.parts[-1], len(self.references))
+
+    def parameter(self, value: Any) -> None:
+        """Writes a parameter value.
+
+        Args:
+            value (Any): Parameter value.
+        """
+        if not self.deduplicate:
+            super().parameter(value)
+        elif not self._reuse():
+            super().parameter(value)
+            self._remember()
+
+    def list_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of a list parameter.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+        """
+        if not self.deduplicate:
+            super().list_parameter(value)
+        elif not self._reuse():
+            super().list_parameter(value)
+            self._remember()
+
+    def array_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of an array parameter.
+
+        Args:
+            value (Collection[Any]): Values of the array parameter.
+        """
+        if not self.deduplicate:
+            super().array_parameter(value)
+        elif not self._reuse():
+            super().array_parameter(value)
+            self._remember()
+
+    def bound_parameters(self) -> List[Any]:
+        """Returns the parameters in the form passed to the translator.
+
+        Returns:
+            List[Any]: The parameter values, or `(name, value)` pairs for the
+                named placeholder styles.
+        """
+        if self.named:
+            return list(zip(self.names, self.parameters))
+        return self.parameters
+
+
+class TemplateRecorder(DialectWriter):
+    """Records where the parameters of a translation come from.
+
+    The parameters of the `dynamic` fields of the `root` query are recorded
+    as `(kind, field name)` sources, and all the other parameters as
+    `("const", value)` sources, so the translation can be repeated for other
+    values of the dynamic fields without writing the SQL again.
+    """
+
+    def __init__(
+        self,
+        dialect: Dialect,
+        converters: common.ParameterConverters,
+        deduplicate: bool,
+        root: Query,
+        dynamic: FrozenSet[str],
+    ):
+        super().__init__(dialect, converters, 0, deduplicate)
+        self.track_references = True
+        self.root_id = id(root)
+        self.dynamic = dynamic
+        self.sources: List[Tuple[str, Any]] = []
+
+    def _record(self, kind: str, before: int) -> None:
+        if len(self.parameters) == before:
+            return
+        instance_id, name = self.reference
+        if instance_id == self.root_id and name in self.dynamic:
+            self.sources.append((kind, name))
+        else:
+            self.sources.extend(("const", v) for v in self.parameters[before:])
+
+    def parameter(self, value: Any) -> None:
+        """Writes a parameter value.
+
+        Args:
+            value (Any): Parameter value.
+        """
+        before = len(self.parameters)
+        super().parameter(value)
+        self._record("parameter", before)
+
+    def list_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of a list parameter.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+        """
+        before = len(self.parameters)
+        super().list_parameter(value)
+        self._record("list", before)
+
+    def array_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of an array parameter.
+
+        Args:
+            value (Collection[Any]): Values of the array parameter.
+        """
+        before = len(self.parameters)
+        super().array_parameter(value)
+        self._record("array", before)
+
+
+@dc.dataclass(frozen=True)
+class BoundTemplate:
+    """Translation of a bound query, without the values of its dynamic fields.
+
+    Attributes:
+        sql (str): Translated SQL.
+        sources (Tuple[Tuple[str, Any], ...]): Sources of the parameters, see
+            `TemplateRecorder`.
+        names (Tuple[str, ...]): Names of the parameters for the named
+            placeholder styles.
+        fingerprint (str): Fingerprint of the translated SQL.
+    """
+
+    sql: str
+    sources: Tuple[Tuple[str, Any], ...]
+    names: Tuple[str, ...]
+    fingerprint: str
+
+
+# Translated SQL of the bound queries, by the structure of their dynamic fields
+_BoundTemplates = weakref.WeakKeyDictionary[
+    BoundQuery[Any], Dict[Tuple[Any, ...], BoundTemplate]
+]
+
+_TQuery = TypeVar("_TQuery")
+_TBatch = TypeVar("_TBatch")
+
+
+class DialectTranslator(InstrumentedTranslator, Generic[_TQuery, _TBatch], abc.ABC):
+    """Converts `Query` objects following a `Dialect`.
+
+    Subclasses define the `DIALECT` and the objects returned. The translation
+    is a single pass over the query, regardless of the dialect. For the named
+    placeholder styles, the parameters given to `_create_query` and the rows
+    given to `_create_batch` are `(name, value)` pairs. A subclass not
+    defining these two methods cannot be instantiated.
+    """
+
+    DIALECT: ClassVar[Dialect]
+
+    def __init__(
+        self,
+        list_bucketing: Optional[common.ListBucketing] = None,
+        deduplicate: bool = False,
+        cache_size: int = 0,
+    ):
+        """Creates the translator.
+
+        Args:
+            list_bucketing (Optional[common.ListBucketing], optional): Pads the
+                list parameters to fixed sizes. Defaults to None, which expands
+                the lists as they are.
+            deduplicate (bool, optional): Binds a single parameter for a field
+                written more than once by the same query instance, e.g. a
+                nested query used twice. Only available for the numbered and
+                named placeholder styles, which always deduplicate. Defaults
+                to False.
+            cache_size (int, optional): Number of translations of hashable
+                queries kept in `cache`. Defaults to 0, which disables the
+                cache.
+
+        Raises:
+            ValueError: When `deduplicate` is set for a dialect whose markers
+                cannot refer to a parameter more than once.
+        """
+        super().__init__()
+        placeholder = self.DIALECT.placeholder
+        if deduplicate and not (placeholder.numbered or placeholder.named):
+            raise ValueError(
+                f"Parameters cannot be deduplicated with {placeholder.name} markers."
+            )
+        self.list_bucketing = list_bucketing
+        self.deduplicate = deduplicate or placeholder.named
+        self.cache: Optional[TranslationCache[_TQuery]] = None
+        if cache_size > 0:
+            self.cache = TranslationCache(cache_size)
+        self._bound_templates: _BoundTemplates = weakref.WeakKeyDictionary()
+        self._converters = common.ParameterConverters(
+            array_parameter=self.DIALECT.array_parameter,
+            list_parameter=self._list_parameter,
+        )
+
+    def _list_parameter(self, value: Collection[Any]) -> Collection[Any]:
+        if self.list_bucketing is None:
+            return value
+        return self.list_bucketing.pad(value)
+
+    @abc.abstractmethod
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> _TQuery: ...
+
+    @abc.abstractmethod
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> _TBatch: ...
+
+    def _writer(self, offset: int = 0) -> DialectWriter:
+        return DialectWriter(self.DIALECT, self._converters, offset, self.deduplicate)
+
+    def __call__(self, query: Query) -> _TQuery:
+        """Converts a `Query` to its corresponding query object.
+
+        Args:
+            query (Query): Query to translate.
+
+        Returns:
+            _TQuery: Equivalent query for the driver.
+        """
+        if self.cache is not None:
+            return self.cache.get(query, self._translate)
+        return self._translate(query)
+
+    def _translate(self, query: Query) -> _TQuery:
+        start = time.perf_counter() if self.hooks else 0.0
+        writer = common.write_query(query, self._writer())
+        sql = writer.sql
+        result = self._create_query(
+            sql,
+            writer.bound_parameters(),
+            common.structure_fingerprint(writer.structure),
+        )
+        if self.hooks:
+            self._emit(query, writer, sql, start)
+        return result
+
+    def _bound_shape(
+        self, bound: BoundQuery[Any], query: Query
+    ) -> Optional[Tuple[Any, ...]]:
+        shape: List[Any] = []
+        for field in bound.structural_fields:
+            value = getattr(query, field.name)
+            if field.may_be_query and common.is_query_instance(value):
+                return None
+            if field.role == QueryValueTypes.NON_PARAMETER:
+                shape.append(str(value))
+            elif field.role == QueryValueTypes.LIST_PARAMETER:
+                shape.append(len(self._converters.list_parameter(value)))
+        return tuple(shape)
+
+    def _record_template(self, bound: BoundQuery[Any], query: Query) -> BoundTemplate:
+        start = time.perf_counter() if self.hooks else 0.0
+        recorder = TemplateRecorder(
+            self.DIALECT,
+            self._converters,
+            self.deduplicate,
+            query,
+            bound.dynamic_fields,
+        )
+        common.write_query(query, recorder)
+        sql = recorder.sql
+        if self.hooks:
+            self._emit(query, recorder, sql, start)
+        return BoundTemplate(
+            sql=sql,
+            sources=tuple(recorder.sources),
+            names=tuple(recorder.names),
+            fingerprint=common.structure_fingerprint(recorder.structure),
+        )
+
+    def translate_bound(self, bound: BoundQuery[Any], query: Query) -> _TQuery:
+        """Converts a query created from a `BoundQuery`.
+
+        The SQL is only written once for each bound query and structure of
+        its dynamic fields, e.g. the lengths of their lists. Later queries
+        with the same structure only collect their parameters, and are not
+        reported to the hooks. Dynamic fields holding nested queries are
+        translated as usual.
+
+        Args:
+            bound (BoundQuery[Any]): Bound query the query is created from.
+            query (Query): Query created with the values of the dynamic fields.
+
+        Returns:
+            _TQuery: Equivalent query for the driver.
+        """
+        shape = self._bound_shape(bound, query)
+        if shape is None:
+            return self(query)
+
+        templates = self._bound_templates.get(bound)
+        if templates is None:
+            templates = self._bound_templates.setdefault(bound, {})
+        template = templates.get(shape)
+        if template is None:
+            template = templates[shape] = self._record_template(bound, query)
+
+        converters = self._converters
+        values: List[Any] = []
+        for kind, source in template.sources:
+            if kind == "const":
+                values.append(source)
+            elif kind == "parameter":
+                values.append(getattr(query, source))
+            elif kind == "array":
+                values.append(converters.array_parameter(getattr(query, source)))
+            else:
+                values.extend(converters.list_parameter(getattr(query, source)))
+
+        parameters = list(zip(template.names, values)) if template.names else values
+        return self._create_query(template.sql, parameters, template.fingerprint)
+
+    def fingerprint(self, query: Query) -> str:
+        """Computes the fingerprint of the SQL generated for a query.
+
+        This is the same as the fingerprint of the translated query, but
+        without generating the SQL.
+
+        Args:
+            query (Query): Query to compute the fingerprint of.
+
+        Returns:
+            str: Hexadecimal digest of the structure of the query.
+        """
+        deduplicate = self.deduplicate or self.DIALECT.placeholder.named
+        return common.fingerprint(query, self._converters, deduplicate)
+
+    def many(self, queries: Iterable[Query]) -> _TBatch:
+        """Converts queries with the same SQL to a batch query object.
+
+        Args:
+            queries (Iterable[Query]): Queries to translate. All of them must
+                generate the same SQL.
+
+        Raises:
+            ValueError: When no query is provided or when a query translates to
+                a different SQL than the first query.
+
+        Returns:
+            _TBatch: Equivalent query for the driver `executemany`.
+        """
+        iterator = iter(queries)
+        first = next(iterator, None)
+        if first is None:
+            raise ValueError("At least one query must be provided.")
+
+        # Only the first query is written, the others only collect parameters
+        first_writer = common.write_query(first, self._writer())
+        structure = first_writer.structure
+        names = first_writer.names
+        parameters = [tuple(first_writer.bound_parameters())]
+        for i, query in enumerate(iterator, start=1):
+            values: List[Any] = []
+            row = common.write_structure(
+                query, self._converters, self.deduplicate, values
+            )
+            if row != structure:
+                raise ValueError(
+                    f"Query at index {i} does not have the same SQL as the first query."
+                )
+            parameters.append(tuple(zip(names, values)) if names else tuple(values))
+
+        return self._create_batch(first_writer.sql, parameters)
+
+    def many_columns(
+        self,
+        query: Union[Type[Query], BoundQuery[Any]],
+        columns: Mapping[str, Any],
+        validate: bool = True,
+    ) -> _TBatch:
+        """Converts columns of field values to a batch query object.
+
+        No query is created for the rows. The SQL is written once, and the
+        parameters of each row are collected from the columns. The fields
+        changing the SQL, i.e. the non-parameters, the list parameters and the
+        nested queries, must be bound with `Query.bind` or have a default.
+
+        Args:
+            query (Union[Type[Query], BoundQuery[Any]]): Query class, or bound
+                query, of the rows.
+            columns (Mapping[str, Any]): Values of the other fields by name, as
+                equal length sequences, NumPy arrays or buffers.
+            validate (bool, optional): Validates and converts each column
+                against the type of its field. Defaults to True.
+
+        Raises:
+            TypeError: When a column is given for an unknown field, or when a
+                field has neither a column nor a value.
+            ValueError: When the columns are empty or do not have the same
+                length, or when a column changes the SQL or the class has
+                calculated fields.
+            pydantic.ValidationError: When a value is not valid for its field.
+
+        Returns:
+            _TBatch: Equivalent query for the driver `executemany`.
+        """
+        bound = query if isinstance(query, BoundQuery) else query.bind()
+        query_class = bound.query_class
+        fields = {f.name: f for f in query_class.__query_init_fields__}
+        unknown = [name for name in columns if name not in fields]
+        if unknown:
+            raise TypeError(f"Unknown fields {', '.join(unknown)}.")
+        defaults = zip(
+            query_class.__query_init_fields__, query_class.__query_init_defaults__
+        )
+        missing = [
+            f.name
+            for f, default in defaults
+            if f.name not in columns and f.name not in bound.values and default is None
+        ]
+        if missing:
+            raise TypeError(f"Missing columns for the fields {', '.join(missing)}.")
+        for field in bound.structural_fields:
+            if field.name in columns:
+                raise ValueError(f"Field '{field.name}' changes the SQL, bind it.")
+        if len(fields) < len(dc.fields(query_class)):
+            raise ValueError("Columns cannot be used for calculated fields.")
+
+        values = {name: column_to_list(column) for name, column in columns.items()}
+        lengths = {len(column) for column in values.values()}
+        if len(lengths) > 1:
+            raise ValueError("All the columns must have the same length.")
+        n_rows = lengths.pop() if lengths else 0
+        if n_rows == 0:
+            raise ValueError("At least one row must be provided.")
+        if validate:
+            values = validate_columns(query_class, values)
+
+        first = {name: column[0] for name, column in values.items()}
+        if validate:
+            sample = bound.create(**first)
+        else:
+            sample = query_class.construct(**bound.values, **first)
+        recorder = TemplateRecorder(
+            self.DIALECT,
+            self._converters,
+            self.deduplicate,
+            sample,
+            frozenset(values),
+        )
+        common.write_query(sample, recorder)
+
+        sources: List[Iterable[Any]] = []
+        for kind, source in recorder.sources:
+            if kind == "const":
+                sources.append(itertools.repeat(source, n_rows))
+            elif kind == "array":
+                sources.append(map(self._converters.array_parameter, values[source]))
+            else:
+                sources.append(values[source])
+
+        parameters: List[Tuple[Any, ...]]
+        if not sources:
+            parameters = [() for _ in range(n_rows)]
+        elif recorder.named:
+            names = recorder.names
+            parameters = [tuple(zip(names, row)) for row in zip(*sources)]
+        else:
+            parameters = list(zip(*sources))
+        return self._create_batch(recorder.sql, parameters)
+
+    def _write_statement(self, statement: Union[str, Query]) -> DialectWriter:
+        writer = self._writer()
+        if isinstance(statement, str):
+            writer.structure.append(statement)
+            writer.non_parameter(statement)
+            return writer
+        return common.write_query(statement, writer)
+
+    def _write_row(self, row: Any, index: int, offset: int) -> DialectWriter:
+        writer = self._writer(offset)
+        prefix = f"r{index}__"
+        if common.is_query_instance(row):
+            return common.write_query(row, writer, prefix)
+        if not dc.is_dataclass(row) or isinstance(row, type):
+            raise TypeError(f"Row {row!r} is neither a Query nor a dataclass.")
+
+        writer.structure.append(type(row))
+        markers: List[str] = []
+        for f in dc.fields(row):
+            writer.name = prefix + f.name
+            markers.append(writer.next_marker())
+            writer.parameters.append(getattr(row, f.name))
+        writer.parts.append(f"({','.join(markers)})")
+        return writer
+
+    def _join_values(
+        self, statement: DialectWriter, rows: List[DialectWriter]
+    ) -> _TQuery:
+        parameters = list(statement.bound_parameters())
+        structure = list(statement.structure)
+        for row in rows:
+            parameters.extend(row.bound_parameters())
+            structure.extend(row.structure)
+
+        escaped = len(parameters) > 0
+        values = ",".join(row.render(escaped) for row in rows)
+        return self._create_query(
+            f"{statement.render(escaped)} {values}",
+            parameters,
+            common.structure_fingerprint(structure),
+        )
+
+    def values(
+        self,
+        statement: Union[str, Query],
+        rows: Iterable[Any],
+        max_parameters: Optional[int] = None,
+    ) -> Iterator[_TQuery]:
+        """Converts rows to multi-row `VALUES` query objects.
+
+        The rows are written after the statement, separated by commas. A new
+        query is started when adding a row would exceed `max_parameters`. With
+        the named placeholder styles, the names of the row parameters are
+        prefixed with the index of the row, e.g. `r0__first_name`.
+
+        Args:
+            statement (Union[str, Query]): Statement written before the rows,
+                e.g. `INSERT INTO Users (first_name, age) VALUES`.
+            rows (Iterable[Any]): `Query` or dataclass instances of the rows.
+                Dataclass rows write all of their fields as parameters.
+            max_parameters (Optional[int], optional): Maximum number of
+                parameters of a query. Defaults to the limit of the dialect.
+
+        Raises:
+            TypeError: When a row is neither a `Query` nor a dataclass.
+            ValueError: When a single row does not fit in a query.
+
+        Yields:
+            _TQuery: Queries with the rows, chunked to stay within the
+                parameter limit.
+        """
+        max_parameters = max_parameters or self.DIALECT.max_parameters
+        head = self._write_statement(statement)
+        n_head = len(head.parameters)
+        chunk: List[DialectWriter] = []
+        n_parameters = n_head
+        for i, row in enumerate(rows):
+            writer = self._write_row(row, i, n_parameters)
+            n_row = len(writer.parameters)
+            if n_head + n_row > max_parameters:
+                raise ValueError(
+                    f"A row with {n_row} parameters does not fit in a query "
+                    f"with a maximum of {max_parameters} parameters."
+                )
+            if chunk and n_parameters + n_row > max_parameters:
+                yield self._join_values(head, chunk)
+                chunk = []
+                n_parameters = n_head
+                if self.DIALECT.placeholder.numbered:
+                    writer = self._write_row(row, i, n_parameters)
+
+            chunk.append(writer)
+            n_parameters += n_row
+
+        if chunk:
+            yield self._join_values(head, chunk)
@@ -0,0 +1,115 @@
+"""Instrumentation of the translations."""
+
+import dataclasses as dc
+import threading
+import time
+from typing import Callable, ClassVar, List, Tuple, Type
+
+from altqq.structs import Query
+from altqq.translators import common
+
+
+@dc.dataclass(frozen=True)
+class TranslationEvent:
+    """Details of a single translation reported to the hooks.
+
+    Attributes:
+        query_class (Type[Query]): Class of the translated query.
+        dialect (str): Name of the dialect of the translator.
+        elapsed (float): Time taken by the translation in seconds.
+        depth (int): Number of nesting levels of the query, 1 when there are
+            no nested queries.
+        parameter_count (int): Number of parameters bound to the query.
+        sql_length (int): Length of the generated SQL.
+        list_sizes (Tuple[int, ...]): Number of markers of each list
+            parameter, in order.
+    """
+
+    query_class: Type[Query]
+    dialect: str
+    elapsed: float
+    depth: int
+    parameter_count: int
+    sql_length: int
+    list_sizes: Tuple[int, ...]
+
+
+TranslationHook = Callable[[TranslationEvent], None]
+
+
+def query_depth(query: Query) -> int:
+    """Computes the number of nesting levels of a query.
+
+    Args:
+        query (Query): Query to inspect.
+
+    Returns:
+        int: Number of nesting levels, 1 when there are no nested queries.
+    """
+    depth = 0
+    stack = [(query, 1)]
+    while stack:
+        current, level = stack.pop()
+        depth = max(depth, level)
+        for field in current.__query_plan__.placed_fields:
+            if field.may_be_query:
+                value = getattr(current, field.name)
+                if common.is_query_instance(value):
+                    stack.append((value, level + 1))
+    return depth
+
+
+class InstrumentedTranslator:
+    """Base class of the translators reporting their translations to hooks.
+
+    The hooks are called after every translation of a single query. When no
+    hook is added, the translation is not measured at all. Adding and removing
+    hooks replaces the `hooks` list under a lock, so the translations running
+    concurrently read the list without locking and keep calling the hooks of
+    the list they started with.
+    """
+
+    DIALECT_NAME: ClassVar[str] = ""
+
+    def __init__(self):
+        self.hooks: List[TranslationHook] = []
+        self._hooks_lock = threading.Lock()
+
+    def add_hook(self, hook: TranslationHook) -> TranslationHook:
+        """Adds a hook called after every translation.
+
+        Args:
+            hook (TranslationHook): Function receiving a `TranslationEvent`.
+
+        Returns:
+            TranslationHook: The hook given, so this can be used as decorator.
+        """
+        with self._hooks_lock:
+            self.hooks = [*self.hooks, hook]
+        return hook
+
+    def remove_hook(self, hook: TranslationHook) -> None:
+        """Removes a hook added with `add_hook`.
+
+        Args:
+            hook (TranslationHook): Hook to remove.
+        """
+        with self._hooks_lock:
+            hooks = list(self.hooks)
+            hooks.remove(hook)
+            self.hooks = hooks
+
+    def _emit(
+        self, query: Query, writer: common.SegmentWriter, sql: str, start: float
+    ) -> None:
+        event = TranslationEvent(
+            query_class=type(query),
+            dialect=self.DIALECT_NAME,
+            elapsed=time.perf_counter() - start,
+            depth=query_depth(query),
+            parameter_count=len(writer.parameters),
+            sql_length=len(sql),
+            list_sizes=tuple(t for t in writer.structure if type(t) is int),
+        )
+        for hook in self.hooks:
+            hook(event)
@@ -0,0 +1,84 @@
+"""Deprecated classes of the `str.format` based translators.
+
+The translators write the compiled templates of the queries instead, so these
+classes are no longer used. They are kept for the code importing them from
+`altqq.translators.pyodbc` and `altqq.translators.psycopg`, which warns about
+their removal in a future release.
+"""
+
+import dataclasses as dc
+import warnings
+from string import Formatter
+from typing import Any, Iterable, List, Mapping, Sequence, Union
+
+
+@dc.dataclass
+class Statement:
+    """Represents a generated statement and its parameters."""
+
+    statement: Any
+    parameters: Iterable[Any]
+
+
+class StatementFormatter(Formatter):
+    """Converts `Statement` objects to query string.
+
+    Aside from converting the `Statement`, this class also tracks the
+    parameter substitutions during the formatting. These values are stored
+    in the `parameter_values` attribute.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Resets the state of the formatter."""
+        self.parameter_values: List[Any] = []
+
+    def get_value(
+        self,
+        key: Union[str, int],
+        args: Sequence[Any],
+        kwargs: Mapping[str, Any],
+    ) -> Any:
+        """Retrieves the value formatting values from the statement mapping.
+
+        Args:
+            key (Union[str, int]): Key found in the raw string. Always `str`.
+            args (Sequence[Any]): Ordered arguments. Unused.
+            kwargs (Mapping[str, Any]): Key mapping to the statements.
+
+        Returns:
+            Any: The statement value provided in the statement.
+        """
+        # The args section is never used
+        assert isinstance(key, str)
+
+        field = kwargs[key]
+        self.parameter_values.extend(field.parameters)
+        return field.statement
+
+
+def deprecated_attribute(module: str, name: str, classes: Mapping[str, type]) -> type:
+    """Returns a deprecated class of a translator module, with a warning.
+
+    Args:
+        module (str): Name of the module the class is imported from.
+        name (str): Name of the class.
+        classes (Mapping[str, type]): Deprecated classes of the module.
+
+    Raises:
+        AttributeError: When the name is not a deprecated class.
+
+    Returns:
+        type: The deprecated class.
+    """
+    cls = classes.get(name)
+    if cls is None:
+        raise AttributeError(f"module {module!r} has no attribute {name!r}")
+    warnings.warn(
+        f"{module}.{name} is deprecated and will be removed in a future release.",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    return cls
@@ -0,0 +1,231 @@
+"""Rendering of Python values as SQL literals."""
+
+import datetime
+import decimal
+import math
+import uuid
+from collections.abc import Collection
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from altqq.translators import common
+
+LiteralFunction = Callable[[Any], str]
+
+
+def quote(text: str) -> str:
+    """Writes a text as a SQL string literal.
+
+    Args:
+        text (str): Text to write.
+
+    Returns:
+        str: Text between `'`, with the `'` in the text doubled.
+    """
+    return "'" + text.replace("'", "''") + "'"
+
+
+def quote_with_backslash(text: str) -> str:
+    r"""Writes a text as a string literal for databases escaping with `\`.
+
+    Args:
+        text (str): Text to write.
+
+    Returns:
+        str: Text between `'`, with the `\` and `'` in the text escaped.
+    """
+    return "'" + text.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _render_null(value: None) -> str:
+    return "NULL"
+
+
+def _render_float(value: float) -> str:
+    if math.isfinite(value):
+        return float.__repr__(value)
+    return quote(str(value).replace("inf", "Infinity").replace("nan", "NaN"))
+
+
+def _render_decimal(value: decimal.Decimal) -> str:
+    if value.is_finite():
+        return str(value)
+    return quote(str(value))
+
+
+def _render_bool(value: bool) -> str:
+    return "TRUE" if value else "FALSE"
+
+
+def _render_bool_as_int(value: bool) -> str:
+    return "1" if value else "0"
+
+
+def _render_str(value: str) -> str:
+    return quote(value)
+
+
+def _render_datetime(value: datetime.datetime) -> str:
+    return quote(value.isoformat(sep=" "))
+
+
+def _render_isoformat(value: Any) -> str:
+    return quote(value.isoformat())
+
+
+def _render_bytes(value: bytes) -> str:
+    return f"X'{bytes(value).hex().upper()}'"
+
+
+def _render_bytes_postgresql(value: bytes) -> str:
+    return f"'\\x{bytes(value).hex()}'"
+
+
+def _render_bytes_sqlserver(value: bytes) -> str:
+    return f"0x{bytes(value).hex().upper()}"
+
+
+def _render_object(value: Any) -> str:
+    return quote(str(value))
+
+
+DEFAULT_LITERALS: Mapping[type, LiteralFunction] = {
+    type(None): _render_null,
+    bool: _render_bool,
+    int: int.__repr__,
+    float: _render_float,
+    decimal.Decimal: _render_decimal,
+    str: _render_str,
+    datetime.datetime: _render_datetime,
+    datetime.date: _render_isoformat,
+    datetime.time: _render_isoformat,
+    bytes: _render_bytes,
+    bytearray: _render_bytes,
+    memoryview: _render_bytes,
+    uuid.UUID: _render_object,
+    object: _render_object,
+}
+
+DIALECT_LITERALS: Mapping[str, Mapping[type, LiteralFunction]] = {
+    "ansi": {},
+    "postgresql": {
+        bytes: _render_bytes_postgresql,
+        bytearray: _render_bytes_postgresql,
+        memoryview: _render_bytes_postgresql,
+    },
+    "sqlserver": {
+        bool: _render_bool_as_int,
+        bytes: _render_bytes_sqlserver,
+        bytearray: _render_bytes_sqlserver,
+        memoryview: _render_bytes_sqlserver,
+    },
+    "mysql": {
+        str: quote_with_backslash,
+    },
+    "sqlite": {
+        bool: _render_bool_as_int,
+    },
+}
+
+
+class LiteralRenderer:
+    """Writes Python values as SQL literals.
+
+    The literal of a value is written by the function registered for its
+    type, or for the closest of its base classes. The function found for a
+    type is cached, so the lookup is only done once per type. Values of
+    unregistered types are written as quoted strings.
+
+    `dialect` selects the literals of a database, e.g. `0x...` binary literals
+    for `sqlserver`. The available dialects are `ansi`, `postgresql`,
+    `sqlserver`, `mysql` and `sqlite`.
+    """
+
+    # Dialects with an array type, the others read JSON arrays
+    ARRAY_DIALECTS = frozenset(["postgresql"])
+
+    def __init__(
+        self,
+        dialect: str = "ansi",
+        renderers: Optional[Mapping[type, LiteralFunction]] = None,
+    ):
+        """Creates the renderer.
+
+        Args:
+            dialect (str, optional): Database of the literals. Defaults to
+                "ansi".
+            renderers (Optional[Mapping[type, LiteralFunction]], optional):
+                Additional functions by type, taking precedence over the ones
+                of the dialect. Defaults to None.
+
+        Raises:
+            ValueError: When the dialect is unknown.
+        """
+        if dialect not in DIALECT_LITERALS:
+            raise ValueError(f"Unknown literal dialect '{dialect}'.")
+        self.dialect = dialect
+        self._renderers: Dict[type, LiteralFunction] = dict(DEFAULT_LITERALS)
+        self._renderers.update(DIALECT_LITERALS[dialect])
+        self._renderers.update(renderers or {})
+        self._cache: Dict[type, LiteralFunction] = {}
+
+    def register(self, cls: type, render: LiteralFunction) -> None:
+        """Registers the function writing the literals of a type.
+
+        The function is also used for the subclasses of the type that have no
+        function registered.
+
+        Args:
+            cls (type): Type of the values.
+            render (LiteralFunction): Function writing a value as SQL.
+        """
+        # Replaced instead of modified, so the concurrent translations never
+        # cache a function looked up in the previous renderers
+        renderers = dict(self._renderers)
+        renderers[cls] = render
+        self._renderers = renderers
+        self._cache = {}
+
+    def _lookup(self, cls: type, cache: Dict[type, LiteralFunction]) -> LiteralFunction:
+        for base in cls.__mro__:
+            render = self._renderers.get(base)
+            if render is not None:
+                cache[cls] = render
+                return render
+        return _render_object
+
+    def __call__(self, value: Any) -> str:
+        """Writes a value as a SQL literal.
+
+        Args:
+            value (Any): Value to write.
+
+        Returns:
+            str: SQL literal of the value.
+        """
+        cls: type = value.__class__
+        cache = self._cache
+        render = cache.get(cls)
+        if render is None:
+            render = self._lookup(cls, cache)
+        return render(value)
+
+    def array(self, values: Collection[Any]) -> str:
+        """Writes the values of an array parameter as a SQL literal.
+
+        Dialects with an array type get an array of the literals of the
+        values, e.g. `ARRAY[1,2]` for `postgresql`. The others get a JSON
+        array string, which can be read with `json_each` or `OPENJSON`.
+
+        Args:
+            values (Collection[Any]): Values of the array parameter.
+
+        Returns:
+            str: SQL literal of the array.
+        """
+        if self.dialect not in self.ARRAY_DIALECTS:
+            return self(common.to_json_array(values))
+        if not values:
+            # An empty ARRAY[] has no type, unlike the array string
+            return "'{}'"
+        comma_separated = ",".join(map(self, values))
+        return f"ARRAY[{comma_separated}]"
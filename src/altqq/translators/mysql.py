@@ -1,14 +1,24 @@
 """Module for converting Query objects for mysql execution."""
 
-# For now the psycopg classes are being reused for mysql since they use
-# similar formatting. This can changed if there are edge cases that were
-# missed so separate classes will be introduced for it
-
 import dataclasses as dc
-from typing import Any, Tuple
-
-from altqq.structs import Query
-from altqq.translators.psycopg import PsycopgTranslator
+from typing import Any, List, Tuple
+
+from altqq.translators import common
+from altqq.translators.dialects import (
+    Dialect,
+    DialectTranslator,
+    PlaceholderStyle,
+    escape_percent,
+)
+
+# MySQL uses the same formatting as Psycopg, but it has no array type so the
+# array values are read with JSON_TABLE
+MYSQL_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.FORMAT,
+    max_parameters=65535,
+    escape=escape_percent,
+    array_parameter=common.to_json_array,
+)
 
 
 @dc.dataclass
@@ -17,22 +27,31 @@ class MySQLQuery:
 
     query: str
     parameters: Tuple[Any, ...]
+    fingerprint: str = dc.field(default="", compare=False)
 
 
-class MySQLTranslator:
-    """Converts a `Query` to its corresponding `MySQLQuery` object."""
+@dc.dataclass
+class MySQLBatchQuery:
+    """Converted `Query` objects for MySQL `executemany` usage."""
 
-    def __init__(self):
-        self._translator = PsycopgTranslator()
+    query: str
+    parameters: List[Tuple[Any, ...]]
+
+
+class MySQLTranslator(DialectTranslator[MySQLQuery, MySQLBatchQuery]):
+    """Converts a `Query` to its corresponding `MySQLQuery` object."""
 
-    def __call__(self, query: Query) -> MySQLQuery:
-        """Converts a `Query` to its corresponding `MySQL` object.
+    DIALECT = MYSQL_DIALECT
+    DIALECT_NAME = "mysql"
 
-        Args:
-            query (Query): Query to translate to MySQL
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> MySQLQuery:
+        return MySQLQuery(
+            query=query, parameters=tuple(parameters), fingerprint=fingerprint
+        )
 
-        Returns:
-            MySQLQuery: Equivalent query for MySQL usage.
-        """
-        psql_query = self._translator(query)
-        return MySQLQuery(query=psql_query.query, parameters=psql_query.parameters)
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> MySQLBatchQuery:
+        return MySQLBatchQuery(query=query, parameters=parameters)
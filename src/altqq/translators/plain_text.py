@@ -1,49 +1,178 @@
 """Module for converting Query objects to plain text SQL."""
 
-import dataclasses as dc
-from typing import Any
+import itertools
+import time
+from collections.abc import Collection
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from typing_extensions import Protocol
 
 from altqq.structs import Query
 from altqq.translators import common
-from altqq.types import QueryValueTypes, T
+from altqq.translators.cache import TranslationCache
+from altqq.translators.hooks import InstrumentedTranslator
+from altqq.translators.literals import LiteralRenderer
+
+
+class PlainTextWriter(common.SegmentWriter):
+    """Collects the segments of a plain text translation.
+
+    The parameters are written in the SQL using the `resolve` function instead
+    of being collected, and the array parameters using `resolve_array`, which
+    defaults to a JSON array string.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[Any], str],
+        resolve_array: Optional[Callable[[Collection[Any]], str]] = None,
+    ):
+        super().__init__()
+        self.resolve = resolve
+        self.resolve_array = resolve_array or self._resolve_json_array
+
+    def _resolve_json_array(self, value: Collection[Any]) -> str:
+        return self.resolve(common.to_json_array(value))
+
+    def parameter(self, value: Any) -> None:
+        """Writes a parameter value as text.
+
+        Args:
+            value (Any): Parameter value.
+        """
+        self.parts.append(self.resolve(value))
+
+    def list_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of a list parameter as text.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+        """
+        self.structure.append(len(value))
+        comma_separated = ",".join(map(self.resolve, value))
+        self.parts.append(f"({comma_separated})")
+
+    def array_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of an array parameter as text.
+
+        Args:
+            value (Collection[Any]): Values of the array parameter.
+        """
+        self.parts.append(self.resolve_array(value))
+
+
+class PlainTextStreamWriter(PlainTextWriter):
+    """Writes a plain text translation to `write` while it is generated.
+
+    The segments are passed to `write` once `flush_parts` of them are
+    collected, and the list parameters are written in batches of
+    `batch_size` values, so the memory used does not depend on the size of
+    the SQL.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[Any], str],
+        write: Callable[[str], Any],
+        flush_parts: int = 256,
+        batch_size: int = 1024,
+        resolve_array: Optional[Callable[[Collection[Any]], str]] = None,
+    ):
+        super().__init__(resolve, resolve_array)
+        self.write = write
+        self.flush_parts = flush_parts
+        self.batch_size = batch_size
+
+    def flush(self) -> None:
+        """Writes the collected segments."""
+        if self.parts:
+            self.write("".join(self.parts))
+            # Cleared in place, since the parts list is shared with the walker
+            self.parts.clear()
+
+    def non_parameter(self, value: str) -> None:
+        """Writes a non-parameter value.
+
+        Args:
+            value (str): Value converted to a string.
+        """
+        super().non_parameter(value)
+        if len(self.parts) >= self.flush_parts:
+            self.flush()
+
+    def parameter(self, value: Any) -> None:
+        """Writes a parameter value as text.
+
+        Args:
+            value (Any): Parameter value.
+        """
+        super().parameter(value)
+        if len(self.parts) >= self.flush_parts:
+            self.flush()
+
+    def list_parameter(self, value: Collection[Any]) -> None:
+        """Writes the values of a list parameter as text, in batches.
+
+        Args:
+            value (Collection[Any]): Values of the list parameter.
+        """
+        self.structure.append(len(value))
+        self.parts.append("(")
+        self.flush()
+        values = iter(value)
+        batch = ",".join(map(self.resolve, itertools.islice(values, self.batch_size)))
+        while batch:
+            self.write(batch)
+            batch = ",".join(
+                map(self.resolve, itertools.islice(values, self.batch_size))
+            )
+            if batch:
+                self.write(",")
+        self.parts.append(")")
 
 
-class PlainTextTranslator:
-    """Converts a `Query` to a plain text SQL."""
+class SupportsWrite(Protocol):
+    """File-like object receiving the written text or bytes."""
 
-    def _resolve_parameters(self, value: Any) -> str:
-        # Numeric types are not escaped
-        if isinstance(value, (int, float)):
-            return str(value)
+    def write(self, data: Any, /) -> Any:
+        """Writes the data."""
+        ...
 
-        # None is written as NULL
-        if value is None:
-            return "NULL"
 
-        # All other types fall down to strings and are escaped
-        return f"'{value}'"
+class PlainTextTranslator(InstrumentedTranslator):
+    """Converts a `Query` to a plain text SQL.
 
-    def _resolve_value(self, query: Query, field: dc.Field[T]) -> str:
-        value = getattr(query, field.name)
-        if common.is_query_instance(value):
-            return self.__call__(value)
+    The parameters are written as SQL literals by `literals`. Custom types can
+    be registered on it, e.g. `translator.literals.register(Money, str)`. The
+    array parameters are written by `literals.array`, as an array for the
+    `postgresql` literals and as a JSON array string for the others.
+    """
 
-        # Field has no typing in older python versions
-        field_type = common.get_parameter_type(field.type)  # type: ignore
-        if field_type == QueryValueTypes.NON_PARAMETER:
-            return value
-        elif field_type == QueryValueTypes.LIST_PARAMETER:
-            comma_separated = ",".join(self._resolve_parameters(p) for p in value)
-            return f"({comma_separated})"
-        else:
-            return self._resolve_parameters(value)
+    DIALECT_NAME = "plain_text"
+
+    def __init__(self, literals: Optional[LiteralRenderer] = None, cache_size: int = 0):
+        """Creates the translator.
+
+        Args:
+            literals (Optional[LiteralRenderer], optional): Writes the
+                parameters as SQL literals. Defaults to the ANSI literals.
+            cache_size (int, optional): Number of translations of hashable
+                queries kept in `cache`. Defaults to 0, which disables the
+                cache.
+        """
+        super().__init__()
+        self.literals = literals or LiteralRenderer()
+        self.cache: Optional[TranslationCache[str]] = None
+        if cache_size > 0:
+            self.cache = TranslationCache(cache_size)
 
     def __call__(self, query: Query) -> str:
         """Converts a `Query` to a plain text SQL.
 
         The conversion to plain text also handles some of the data types. None
         is converted to `NULL`, numeric values are written as they are and
-        string values and other object types are escaped using `'`.
+        string values and other object types are quoted using `'`, doubling
+        the `'` they contain.
 
         Args:
             query (Query): Query to convert.
@@ -51,6 +180,89 @@ class PlainTextTranslator:
         Returns:
             str: Query as plain text.
         """
-        fields = dc.fields(query)
-        format_dict = {f.name: self._resolve_value(query, f) for f in fields}
-        return query.__query__.format(**format_dict)
+        if self.cache is not None:
+            return self.cache.get(query, self._translate)
+        return self._translate(query)
+
+    def _translate(self, query: Query) -> str:
+        start = time.perf_counter() if self.hooks else 0.0
+        writer = PlainTextWriter(self.literals, self.literals.array)
+        sql = common.write_query(query, writer).sql
+        if self.hooks:
+            self._emit(query, writer, sql, start)
+        return sql
+
+    def _stream(
+        self, queries: Iterable[Query], write: Callable[[str], Any], separator: str
+    ) -> Iterator[None]:
+        for query in queries:
+            writer = PlainTextStreamWriter(
+                self.literals, write, resolve_array=self.literals.array
+            )
+            common.write_query(query, writer)
+            writer.parts.append(separator)
+            writer.flush()
+            yield
+
+    def iter_chunks(
+        self, queries: Iterable[Query], separator: str = ";\n"
+    ) -> Iterator[str]:
+        r"""Converts queries to plain text SQL, generated as chunks of text.
+
+        The chunks of each query are generated once the query is written, so
+        only a single statement is kept in memory at a time. Use `write` to
+        also write the statements with large list parameters in pieces.
+
+        Args:
+            queries (Iterable[Query]): Queries to convert, consumed lazily.
+            separator (str, optional): Text written after each query.
+                Defaults to ";\n".
+
+        Yields:
+            str: Chunks of the SQL script.
+        """
+        chunks: List[str] = []
+        for _ in self._stream(queries, chunks.append, separator):
+            yield from chunks
+            chunks.clear()
+
+    def write(
+        self,
+        queries: Iterable[Query],
+        fp: SupportsWrite,
+        separator: str = ";\n",
+        encoding: Optional[str] = None,
+    ) -> int:
+        r"""Writes queries as a plain text SQL script to a file-like object.
+
+        The SQL is written while it is generated, including the values of the
+        list parameters, so the memory used does not depend on the size of
+        the script. The queries are not reported to the hooks.
+
+        Args:
+            queries (Iterable[Query]): Queries to convert, consumed lazily.
+            fp (SupportsWrite): Object with a `write` method, e.g. a file.
+            separator (str, optional): Text written after each query.
+                Defaults to ";\n".
+            encoding (Optional[str], optional): Encodes the text before it is
+                written, for binary files and `mmap` objects. Defaults to None,
+                which writes the text as it is.
+
+        Returns:
+            int: Number of characters written, or of bytes if encoded.
+        """
+        written = 0
+
+        def write(text: str) -> None:
+            nonlocal written
+            if encoding is None:
+                fp.write(text)
+                written += len(text)
+            else:
+                data = text.encode(encoding)
+                fp.write(data)
+                written += len(data)
+
+        for _ in self._stream(queries, write, separator):
+            pass
+        return written
@@ -0,0 +1,238 @@
+"""Module for converting rows to PostgreSQL `COPY ... FROM STDIN` payloads."""
+
+import dataclasses as dc
+import datetime
+import enum
+import json
+import math
+import operator
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, cast
+
+from altqq.structs import Query
+from altqq.translators import common
+from altqq.translators.plain_text import SupportsWrite
+from altqq.types import QueryValueTypes
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_CSV_SPECIAL = (",", '"', "\n", "\r")
+
+
+class CopyFormat(enum.Enum):
+    """Formats of the `COPY` payloads."""
+
+    TEXT = "text"
+    CSV = "csv"
+
+
+def _array_element(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple)):
+        return copy_text(value)
+    text = copy_text(value)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def copy_text(value: Any) -> str:
+    r"""Writes a value in the PostgreSQL text representation of its type.
+
+    Lists and tuples are written as arrays, e.g. `{"a","b"}`, dictionaries as
+    JSON and bytes as `\x` followed by their hexadecimal digits.
+
+    Args:
+        value (Any): Value to write, which is not None.
+
+    Returns:
+        str: Text representation of the value.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return float.__repr__(value)
+        return str(value).replace("inf", "Infinity").replace("nan", "NaN")
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        elements = cast(Iterable[Any], value)
+        return "{" + ",".join(map(_array_element, elements)) + "}"
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _text_field(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if type(value) is int:
+        return int.__repr__(value)
+    return copy_text(value).translate(_TEXT_ESCAPES)
+
+
+def _csv_field(value: Any) -> str:
+    if value is None:
+        return ""
+    if type(value) is int:
+        return int.__repr__(value)
+    text = copy_text(value)
+    if not text or text == "\\." or any(c in text for c in _CSV_SPECIAL):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _row_columns(row_class: Any) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    if isinstance(row_class, type) and issubclass(row_class, Query):
+        slots = row_class.__query_plan__.slots
+        for field in slots:
+            if field.role not in (
+                QueryValueTypes.PARAMETER,
+                QueryValueTypes.ARRAY_PARAMETER,
+            ):
+                raise ValueError(
+                    f"Field '{field.name}' of a COPY row must be a parameter."
+                )
+        names = tuple(field.name for field in slots)
+        if len(set(names)) != len(names):
+            raise ValueError("The fields of a COPY row must be written once.")
+        queries = tuple(field.name for field in slots if field.may_be_query)
+        return names, queries
+    if isinstance(row_class, type) and dc.is_dataclass(cast(Any, row_class)):
+        return tuple(f.name for f in dc.fields(cast(Any, row_class))), ()
+    raise TypeError(f"Row class {row_class!r} is neither a Query nor a dataclass.")
+
+
+class CopyWriter:
+    """Converts rows to the payload of a PostgreSQL `COPY ... FROM STDIN`.
+
+    The columns are the fields of the `row_class`. For `Query` classes, they
+    are the fields in the order of `__query__`, e.g. `({first_name}, {age})`,
+    which is the row of the multi-row `VALUES` translations. For dataclasses,
+    they are all of their fields. The `statement` is the matching `COPY`
+    statement, to execute with the payload, e.g. with Psycopg:
+
+        with cursor.copy(writer.statement) as copy:
+            writer.write(rows, copy)
+
+    Attributes:
+        table (str): Table written in the statement, as it is.
+        format (CopyFormat): Format of the payload.
+        columns (Tuple[str, ...]): Names of the columns.
+        statement (str): `COPY` statement of the payload.
+    """
+
+    def __init__(
+        self,
+        row_class: type,
+        table: str,
+        format: CopyFormat = CopyFormat.TEXT,
+        buffer_size: int = 65536,
+    ):
+        """Creates the writer for the rows of a class.
+
+        Args:
+            row_class (type): `Query` or dataclass of the rows.
+            table (str): Table loaded by the statement, e.g. `public.users`.
+            format (CopyFormat, optional): Format of the payload. Defaults to
+                `CopyFormat.TEXT`.
+            buffer_size (int, optional): Number of characters collected before
+                they are written. Defaults to 65536.
+
+        Raises:
+            TypeError: When the row class is neither a `Query` nor a dataclass.
+            ValueError: When a field of a `Query` row class is not a parameter
+                or is written more than once.
+        """
+        self.table = table
+        self.format = format
+        self.buffer_size = buffer_size
+        self.columns, self._query_fields = _row_columns(row_class)
+        self._field: Callable[[Any], str] = (
+            _csv_field if format == CopyFormat.CSV else _text_field
+        )
+        self._separator = "," if format == CopyFormat.CSV else "\t"
+        self._getter = operator.attrgetter(*self.columns) if self.columns else None
+
+        columns = ", ".join(f'"{c}"' for c in self.columns)
+        options = " (FORMAT csv)" if format == CopyFormat.CSV else ""
+        self.statement = f"COPY {table} ({columns}) FROM STDIN{options}"
+
+    def _values(self, row: Any) -> Tuple[Any, ...]:
+        if isinstance(row, (tuple, list)):
+            values: Tuple[Any, ...] = tuple(row)  # type: ignore
+            if len(values) != len(self.columns):
+                raise ValueError(
+                    f"Row {row!r} has {len(values)} values for "
+                    f"{len(self.columns)} columns."
+                )
+            return values
+        for name in self._query_fields:
+            if common.is_query_instance(getattr(row, name)):
+                raise ValueError(f"Field '{name}' of a COPY row cannot be a Query.")
+        if self._getter is None:
+            return ()
+        values = self._getter(row)
+        return values if len(self.columns) > 1 else (values,)
+
+    def line(self, row: Any) -> str:
+        """Writes a row as a line of the payload.
+
+        Args:
+            row (Any): Instance of the row class, or tuple of its values.
+
+        Returns:
+            str: Line of the row, ending with a newline.
+        """
+        return self._separator.join(map(self._field, self._values(row))) + "\n"
+
+    def iter_chunks(self, rows: Iterable[Any]) -> Iterator[str]:
+        """Converts rows to the payload, generated as chunks of text.
+
+        Args:
+            rows (Iterable[Any]): Instances of the row class, or tuples of their
+                values, consumed lazily.
+
+        Yields:
+            str: Chunks of at least `buffer_size` characters, except the last.
+        """
+        lines: List[str] = []
+        size = 0
+        for row in rows:
+            line = self.line(row)
+            lines.append(line)
+            size += len(line)
+            if size >= self.buffer_size:
+                yield "".join(lines)
+                lines.clear()
+                size = 0
+        if lines:
+            yield "".join(lines)
+
+    def write(
+        self, rows: Iterable[Any], fp: SupportsWrite, encoding: Optional[str] = None
+    ) -> int:
+        """Writes the payload of rows to a file-like object.
+
+        Args:
+            rows (Iterable[Any]): Instances of the row class, or tuples of their
+                values, consumed lazily.
+            fp (SupportsWrite): Object with a `write` method, e.g. a file or
+                the Psycopg `Copy` object.
+            encoding (Optional[str], optional): Encodes the text before it is
+                written, for binary files. Defaults to None, which writes the
+                text as it is.
+
+        Returns:
+            int: Number of characters written, or of bytes if encoded.
+        """
+        written = 0
+        for chunk in self.iter_chunks(rows):
+            data = chunk if encoding is None else chunk.encode(encoding)
+            fp.write(data)
+            written += len(data)
+        return written
@@ -1,112 +1,120 @@
 """Module for converting Query objects for Psycopg execution."""
 
 import dataclasses as dc
-from string import Formatter
-from typing import Any, Iterable, List, Mapping, Sequence, Tuple, Union
-
-from altqq.structs import Query
-from altqq.translators import common
-from altqq.types import QueryValueTypes, T
+from typing import Any, Dict, List, Tuple
+
+from altqq.translators import legacy
+from altqq.translators.dialects import (
+    Dialect,
+    DialectTranslator,
+    PlaceholderStyle,
+    escape_percent,
+)
+
+# Psycopg adapts lists to PostgreSQL arrays
+PSYCOPG_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.FORMAT,
+    max_parameters=65535,
+    escape=escape_percent,
+    array_parameter=list,
+)
+
+# Psycopg named parameters, bound from a mapping
+PSYCOPG_NAMED_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.PYFORMAT,
+    max_parameters=65535,
+    escape=escape_percent,
+    array_parameter=list,
+)
 
 
 @dc.dataclass
-class PsycopgStatement:
-    """Represents a generated Psycopg statement."""
+class PsycopgQuery:
+    """Converted `Query` object for Psycopg usage."""
 
-    statement: Any
-    parameters: Iterable[Any]
+    query: str
+    parameters: Tuple[Any, ...]
+    fingerprint: str = dc.field(default="", compare=False)
 
 
 @dc.dataclass
-class PsycopgQuery:
-    """Converted `Query` object for Psycopg usage."""
+class PsycopgBatchQuery:
+    """Converted `Query` objects for Psycopg `executemany` usage."""
 
     query: str
-    parameters: Tuple[Any, ...]
+    parameters: List[Tuple[Any, ...]]
 
 
-class PsycopgFormatter(Formatter):
-    """Converts `PsycopgStatement` objects to query string.
+class PsycopgTranslator(DialectTranslator[PsycopgQuery, PsycopgBatchQuery]):
+    """Converts a `Query` to its corresponding `PsycopgQuery` object."""
 
-    Aside from converting the `PsycopgStatement`, this class also tracks the
-    parameter substitutions during the formatting. These values are stored
-    in the `parameter_values` attribute.
-    """
+    DIALECT = PSYCOPG_DIALECT
+    DIALECT_NAME = "psycopg"
 
-    def __init__(self):
-        self.reset()
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> PsycopgQuery:
+        return PsycopgQuery(
+            query=query, parameters=tuple(parameters), fingerprint=fingerprint
+        )
 
-    def reset(self):
-        """Resets the state of the formatter."""
-        self.parameter_values: List[Any] = []
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> PsycopgBatchQuery:
+        return PsycopgBatchQuery(query=query, parameters=parameters)
 
-    def get_value(
-        self,
-        key: Union[str, int],
-        args: Sequence[Any],
-        kwargs: Mapping[str, PsycopgStatement],
-    ) -> Any:
-        """Retrieves the value formatting values from the statement mapping.
 
-        Args:
-            key (Union[str, int]): Key found in the raw string. Always `str`.
-            args (Sequence[Any]): Ordered arguments. Unused.
-            kwargs (Mapping[str, PsycopgStatement]): Key mapping to the
-                PsycopgStatements.
+@dc.dataclass
+class PsycopgNamedQuery:
+    """Converted `Query` object for Psycopg usage with named parameters.
 
-        Returns:
-            Any: The statement value provided in the PsycopgStatement.
-        """
-        # The args section is never used
-        assert isinstance(key, str)
+    The parameters are named after the path of their field, e.g.
+    `%(query1__filter_value)s`, and a field written more than once by the same
+    query instance is only bound once.
+    """
 
-        field = kwargs[key]
-        self.parameter_values.extend(field.parameters)
-        return field.statement
+    query: str
+    parameters: Dict[str, Any]
+    fingerprint: str = dc.field(default="", compare=False)
 
 
-class PsycopgTranslator:
-    """Converts a `Query` to its corresponding `PsycopgQuery` object."""
+@dc.dataclass
+class PsycopgNamedBatchQuery:
+    """Converted `Query` objects for Psycopg `executemany` usage with names."""
 
-    MARKER = "%s"
-
-    def _resolve_value(self, query: Query, field: dc.Field[T]) -> PsycopgStatement:
-        value = getattr(query, field.name)
-        if common.is_query_instance(value):
-            qq = self._convert_query(value)
-            return PsycopgStatement(qq.query, qq.parameters)
-
-        # Field has no typing in older python versions
-        field_type = common.get_parameter_type(field.type)  # type: ignore
-        if field_type == QueryValueTypes.NON_PARAMETER:
-            return PsycopgStatement(str(value).replace("%", "%%"), ())
-        elif field_type == QueryValueTypes.LIST_PARAMETER:
-            return PsycopgStatement(
-                common.create_list_markers(self.MARKER, len(value)), value
-            )
-        else:
-            return PsycopgStatement(self.MARKER, (value,))
-
-    def _convert_query(self, query: Query) -> PsycopgQuery:
-        formatter = PsycopgFormatter()
-        fields = dc.fields(query)
-        format_dict = {f.name: self._resolve_value(query, f) for f in fields}
+    query: str
+    parameters: List[Dict[str, Any]]
 
-        return PsycopgQuery(
-            query=formatter.format(query.__query__.replace("%", "%%"), **format_dict),
-            parameters=tuple(formatter.parameter_values),
+
+class PsycopgNamedTranslator(
+    DialectTranslator[PsycopgNamedQuery, PsycopgNamedBatchQuery]
+):
+    """Converts a `Query` to its corresponding `PsycopgNamedQuery` object."""
+
+    DIALECT = PSYCOPG_NAMED_DIALECT
+    DIALECT_NAME = "psycopg"
+
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> PsycopgNamedQuery:
+        return PsycopgNamedQuery(
+            query=query, parameters=dict(parameters), fingerprint=fingerprint
         )
 
-    def __call__(self, query: Query) -> PsycopgQuery:
-        """Converts a `Query` to its corresponding `PsycopgQuery` object.
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> PsycopgNamedBatchQuery:
+        return PsycopgNamedBatchQuery(
+            query=query, parameters=[dict(row) for row in parameters]
+        )
+
+
+# Classes of the `str.format` based translation, kept for backward compatibility
+_DEPRECATED = {
+    "PsycopgStatement": legacy.Statement,
+    "PsycopgFormatter": legacy.StatementFormatter,
+}
 
-        Args:
-            query (Query): Query to translate to Psycopg
 
-        Returns:
-            PsycopgQuery: Equivalent query for Psycopg usage.
-        """
-        psql_query = self._convert_query(query)
-        if len(psql_query.parameters) == 0:
-            psql_query.query = psql_query.query.replace("%%", "%")
-        return psql_query
+def __getattr__(name: str) -> type:
+    return legacy.deprecated_attribute(__name__, name, _DEPRECATED)
@@ -1,20 +1,17 @@
 """Module for converting Query objects for PyODBC execution."""
 
 import dataclasses as dc
-from string import Formatter
-from typing import Any, Iterable, List, Mapping, Sequence, Union
+from typing import Any, Iterable, List, Tuple
 
-from altqq.structs import Query
-from altqq.translators import common
-from altqq.types import QueryValueTypes, T
+from altqq.translators import common, legacy
+from altqq.translators.dialects import Dialect, DialectTranslator, PlaceholderStyle
 
-
-@dc.dataclass
-class PyODBCStatement:
-    """Represents a generated PyODBC statement."""
-
-    statement: Any
-    parameters: Iterable[Any]
+# SQL Server has no array type, the array values are read with OPENJSON
+PYODBC_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.QMARK,
+    max_parameters=2100,
+    array_parameter=common.to_json_array,
+)
 
 
 @dc.dataclass
@@ -23,84 +20,40 @@ class PyODBCQuery:
 
     query: str
     parameters: Iterable[Any]
+    fingerprint: str = dc.field(default="", compare=False)
 
 
-class PyODBCFormatter(Formatter):
-    """Converts `PyODBCStatement` objects to query string.
+@dc.dataclass
+class PyODBCBatchQuery:
+    """Converted `Query` objects for PyODBC `executemany` usage."""
 
-    Aside from converting the `PyODBCStatement`, this class also tracks the
-    parameter substitutions during the formatting. These values are stored
-    in the `parameter_values` attribute.
-    """
+    query: str
+    parameters: List[Tuple[Any, ...]]
 
-    def __init__(self):
-        self.reset()
 
-    def reset(self):
-        """Resets the state of the formatter."""
-        self.parameter_values: List[Any] = []
+class PyODBCTranslator(DialectTranslator[PyODBCQuery, PyODBCBatchQuery]):
+    """Converts a `Query` to its corresponding `PyODBCQuery` object."""
 
-    def get_value(
-        self,
-        key: Union[str, int],
-        args: Sequence[Any],
-        kwargs: Mapping[str, PyODBCStatement],
-    ) -> Any:
-        """Retrieves the value formatting values from the statement mapping.
+    DIALECT = PYODBC_DIALECT
+    DIALECT_NAME = "pyodbc"
 
-        Args:
-            key (Union[str, int]): Key found in the raw string. Always `str`.
-            args (Sequence[Any]): Ordered arguments. Unused.
-            kwargs (Mapping[str, PyODBCStatement]): Key mapping to the
-                PyODBCStatements.
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> PyODBCQuery:
+        return PyODBCQuery(query=query, parameters=parameters, fingerprint=fingerprint)
 
-        Returns:
-            Any: The statement value provided in the PyODBCStatement.
-        """
-        # The args section is never used
-        assert isinstance(key, str)
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> PyODBCBatchQuery:
+        return PyODBCBatchQuery(query=query, parameters=parameters)
 
-        field = kwargs[key]
-        self.parameter_values.extend(field.parameters)
-        return field.statement
 
+# Classes of the `str.format` based translation, kept for backward compatibility
+_DEPRECATED = {
+    "PyODBCStatement": legacy.Statement,
+    "PyODBCFormatter": legacy.StatementFormatter,
+}
 
-class PyODBCTranslator:
-    """Converts a `Query` to its corresponding `PyODBCQuery` object."""
 
-    MARKER = "?"
-
-    def _resolve_value(self, query: Query, field: dc.Field[T]) -> PyODBCStatement:
-        value = getattr(query, field.name)
-        if common.is_query_instance(value):
-            qq = self.__call__(value)
-            return PyODBCStatement(qq.query, qq.parameters)
-
-        # Field has no typing in older python versions
-        field_type = common.get_parameter_type(field.type)  # type: ignore
-        if field_type == QueryValueTypes.NON_PARAMETER:
-            return PyODBCStatement(value, ())
-        elif field_type == QueryValueTypes.LIST_PARAMETER:
-            return PyODBCStatement(
-                common.create_list_markers(self.MARKER, len(value)), value
-            )
-        else:
-            return PyODBCStatement(self.MARKER, [value])
-
-    def __call__(self, query: Query) -> PyODBCQuery:
-        """Converts a `Query` to its corresponding `PyODBCQuery` object.
-
-        Args:
-        query (Query): Query to translate to PyODBC
-
-        Returns:
-            PyODBCQuery: Equivalent query for PyODBC usage.
-        """
-        formatter = PyODBCFormatter()
-        fields = dc.fields(query)
-        format_dict = {f.name: self._resolve_value(query, f) for f in fields}
-
-        return PyODBCQuery(
-            query=formatter.format(query.__query__, **format_dict),
-            parameters=formatter.parameter_values,
-        )
+def __getattr__(name: str) -> type:
+    return legacy.deprecated_attribute(__name__, name, _DEPRECATED)
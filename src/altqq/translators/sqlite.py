@@ -0,0 +1,102 @@
+"""Module for converting Query objects for sqlite3 execution."""
+
+import dataclasses as dc
+from typing import Any, Dict, List, Tuple
+
+from altqq.translators import common
+from altqq.translators.dialects import Dialect, DialectTranslator, PlaceholderStyle
+
+# sqlite3 does not interpret the query text, so no escaping is needed. SQLite
+# has no array type, the array values are read with json_each. SQLite before
+# 3.32 only allows 999 parameters, pass `max_parameters` to `values` for those.
+SQLITE_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.QMARK,
+    max_parameters=32766,
+    array_parameter=common.to_json_array,
+)
+
+# sqlite3 named parameters, bound from a mapping
+SQLITE_NAMED_DIALECT = Dialect(
+    placeholder=PlaceholderStyle.NAMED,
+    max_parameters=32766,
+    array_parameter=common.to_json_array,
+)
+
+
+@dc.dataclass
+class SQLiteQuery:
+    """Converted `Query` object for sqlite3 usage."""
+
+    query: str
+    parameters: Tuple[Any, ...]
+    fingerprint: str = dc.field(default="", compare=False)
+
+
+@dc.dataclass
+class SQLiteBatchQuery:
+    """Converted `Query` objects for sqlite3 `executemany` usage."""
+
+    query: str
+    parameters: List[Tuple[Any, ...]]
+
+
+class SQLiteTranslator(DialectTranslator[SQLiteQuery, SQLiteBatchQuery]):
+    """Converts a `Query` to its corresponding `SQLiteQuery` object."""
+
+    DIALECT = SQLITE_DIALECT
+    DIALECT_NAME = "sqlite"
+
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> SQLiteQuery:
+        return SQLiteQuery(
+            query=query, parameters=tuple(parameters), fingerprint=fingerprint
+        )
+
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> SQLiteBatchQuery:
+        return SQLiteBatchQuery(query=query, parameters=parameters)
+
+
+@dc.dataclass
+class SQLiteNamedQuery:
+    """Converted `Query` object for sqlite3 usage with named parameters.
+
+    The parameters are named after the path of their field, e.g.
+    `:query1__filter_value`, and a field written more than once by the same
+    query instance is only bound once.
+    """
+
+    query: str
+    parameters: Dict[str, Any]
+    fingerprint: str = dc.field(default="", compare=False)
+
+
+@dc.dataclass
+class SQLiteNamedBatchQuery:
+    """Converted `Query` objects for sqlite3 `executemany` usage with names."""
+
+    query: str
+    parameters: List[Dict[str, Any]]
+
+
+class SQLiteNamedTranslator(DialectTranslator[SQLiteNamedQuery, SQLiteNamedBatchQuery]):
+    """Converts a `Query` to its corresponding `SQLiteNamedQuery` object."""
+
+    DIALECT = SQLITE_NAMED_DIALECT
+    DIALECT_NAME = "sqlite"
+
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> SQLiteNamedQuery:
+        return SQLiteNamedQuery(
+            query=query, parameters=dict(parameters), fingerprint=fingerprint
+        )
+
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> SQLiteNamedBatchQuery:
+        return SQLiteNamedBatchQuery(
+            query=query, parameters=[dict(row) for row in parameters]
+        )
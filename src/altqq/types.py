@@ -1,8 +1,9 @@
 """Module for typing related things."""
 
 import enum
+import typing
 from collections.abc import Collection
-from typing import TypeVar
+from typing import Any, Set, Type, TypeVar, cast
 
 from typing_extensions import Annotated
 
@@ -15,7 +16,34 @@ class QueryValueTypes(enum.Enum):
     PARAMETER = enum.auto()
     LIST_PARAMETER = enum.auto()
     NON_PARAMETER = enum.auto()
+    ARRAY_PARAMETER = enum.auto()
 
 
 NonParameter = Annotated[T, QueryValueTypes.NON_PARAMETER]
 ListParameter = Annotated[Collection[T], QueryValueTypes.LIST_PARAMETER]
+ArrayParameter = Annotated[Collection[T], QueryValueTypes.ARRAY_PARAMETER]
+
+
+ANNOTATED_TYPES: Set[QueryValueTypes] = {
+    QueryValueTypes.NON_PARAMETER,
+    QueryValueTypes.LIST_PARAMETER,
+    QueryValueTypes.ARRAY_PARAMETER,
+}
+
+
+def get_parameter_type(cls: Type[Any]) -> QueryValueTypes:
+    """Extracts the value type based on the typing.
+
+    Args:
+        cls (Type[Any]): Type to check.
+
+    Returns:
+        QueryValueTypes: Role of the value in the query
+    """
+    if typing.get_origin(cls) == Annotated:
+        # Pyright can't match the __metadata__ attribute to Annotated
+        for metadata in cls.__metadata__:  # type: ignore
+            if metadata in ANNOTATED_TYPES:
+                return cast(QueryValueTypes, metadata)
+
+    return QueryValueTypes.PARAMETER
@@ -229,3 +229,37 @@ TEST_DATA = [
         """,
     ),
 ]
+
+
+class SelectWithArray(altqq.Query):
+    """Test query that uses an array."""
+
+    __query__ = """
+        SELECT * FROM table WHERE A = ANY({array})
+    """
+
+    array: altqq.ArrayParameter[int]
+
+
+class SelectWithDollar(altqq.Query):
+    """Test query with dollar and percent characters in the text."""
+
+    __query__ = """
+        SELECT '$1', (15 % 10) AS t FROM "{table}" WHERE A IN {list} AND B = {value}
+    """
+
+    table: altqq.NonParameter[str]
+    list: altqq.ListParameter[int]
+    value: int
+
+
+class SelectWithRepeated(altqq.Query):
+    """Test query that references its fields more than once."""
+
+    __query__ = """
+        SELECT * FROM table WHERE (A = {value} OR B = {value}) AND C IN {list}
+        AND D IN {list}
+    """
+
+    value: int
+    list: altqq.ListParameter[int]
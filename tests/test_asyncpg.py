@@ -0,0 +1,52 @@
+"""Tests the asyncpg translations of queries."""
+
+import altqq
+
+from tests.queries import OrderQuery, SelectWithArray, SelectWithDollar, UnionAllQuery
+from tests.queries import SelectTableByFilter as Filter
+from tests.utils import clean_whitespaces as cws
+
+
+def test_to_asyncpg__nested_queries__markers_numbered_in_order():
+    """If the query is nested, the markers continue the numbering."""
+    query = UnionAllQuery(Filter("Music", "title", "Secret"), Filter("C", "n", "P"))
+    res = altqq.to_asyncpg(query)
+    assert cws(res.query) == cws("""
+        SELECT * FROM (
+            SELECT *, (15 % 10) AS t FROM "Music" WHERE "title" = $1
+        ) AS tbl1
+        UNION ALL
+        SELECT * FROM (
+            SELECT *, (15 % 10) AS t FROM "C" WHERE "n" = $2
+        ) AS tbl2
+    """)
+    assert res.parameters == ("Secret", "P")
+
+
+def test_to_asyncpg__list_parameter__markers_numbered_in_order():
+    """If the query has a list, each value gets its own numbered marker."""
+    query = OrderQuery(SelectWithDollar("100%", [1, 2, 3], 4), "a$b", "asc")
+    res = altqq.to_asyncpg(query)
+    assert cws(res.query) == cws("""
+        SELECT * FROM (
+            SELECT '$1', (15 % 10) AS t FROM "100%" WHERE A IN ($1,$2,$3) AND B = $4
+        ) AS tbl
+        ORDER BY "a$b" asc
+    """)
+    assert res.parameters == (1, 2, 3, 4)
+
+
+def test_to_asyncpg__array_parameter__single_list_parameter():
+    """If the query uses an array parameter, a single list is bound."""
+    res = altqq.to_asyncpg(SelectWithArray([1, 2]))
+    assert cws(res.query) == "SELECT * FROM table WHERE A = ANY($1)"
+    assert res.parameters == ([1, 2],)
+
+
+def test_to_asyncpg_many__same_structure__numbered_query():
+    """If the queries have the same SQL, one numbered query is returned."""
+    res = altqq.to_asyncpg_many(
+        [Filter("Users", "age", 20), Filter("Users", "age", 30)]
+    )
+    assert '"age" = $1' in res.query
+    assert res.parameters == [(20,), (30,)]
@@ -0,0 +1,89 @@
+"""Tests the batch translations of queries."""
+
+import altqq
+import pytest
+
+from tests.queries import (
+    OrderQuery,
+    SelectTableByFilter,
+    SelectWithArray,
+    SelectWithList,
+    SelectWithRepeated,
+)
+from tests.utils import clean_whitespaces as cws
+
+
+def test_to_psycopg_many__same_structure__single_query_many_parameters():
+    """If the queries have the same SQL, one query and many rows are returned."""
+    queries = [SelectTableByFilter("Users", "age", age) for age in (20, 30, 40)]
+    res = altqq.to_psycopg_many(queries)
+    assert cws(res.query) == cws(altqq.to_psycopg(queries[0]).query)
+    assert res.parameters == [(20,), (30,), (40,)]
+
+
+def test_to_pyodbc_many__nested_queries__parameters_flattened():
+    """If the queries are nested, the parameters of each row are flattened."""
+    queries = (
+        OrderQuery(SelectTableByFilter("Users", "name", name), "age", "asc")
+        for name in ("Fine", "Arietta")
+    )
+    res = altqq.to_pyodbc_many(queries)
+    assert res.parameters == [("Fine",), ("Arietta",)]
+
+
+def test_to_mysql_many__same_list_length__parameters_expanded():
+    """If the lists have the same length, the list values are expanded."""
+    res = altqq.to_mysql_many([SelectWithList([1, 2]), SelectWithList([3, 4])])
+    assert cws(res.query) == "SELECT * FROM table WHERE A IN (%s,%s)"
+    assert res.parameters == [(1, 2), (3, 4)]
+
+
+@pytest.mark.parametrize(
+    "translator",
+    [
+        altqq.PyODBCTranslator(),
+        altqq.PsycopgNamedTranslator(),
+        altqq.AsyncpgTranslator(deduplicate=True),
+    ],
+)
+def test_many__rows_with_repeated_and_array_fields__same_as_each_query(translator):
+    """If rows reuse fields or bind arrays, their parameters match each query."""
+    queries = [
+        OrderQuery(SelectWithRepeated(i, [i, i + 1]), "age", "asc") for i in range(3)
+    ] + [OrderQuery(SelectWithArray([1, 2]), "age", "asc")]
+    rows = [translator(q) for q in queries]
+    expected = [
+        r.parameters if isinstance(r.parameters, dict) else tuple(r.parameters)
+        for r in rows
+    ]
+    res = translator.many(queries[:3])
+    assert res.query == rows[0].query
+    assert res.parameters == expected[:3]
+    res = translator.many([queries[3], queries[3]])
+    assert res.parameters == [expected[3]] * 2
+
+
+@pytest.mark.parametrize(
+    "queries",
+    [
+        [SelectWithList([1, 2]), SelectWithList([3])],
+        [
+            SelectTableByFilter("Users", "age", 20),
+            SelectTableByFilter("Cities", "age", 20),
+        ],
+        [
+            SelectTableByFilter("Users", "age", 20),
+            SelectTableByFilter("Users", "age", SelectWithList([1])),
+        ],
+    ],
+)
+def test_to_psycopg_many__different_structure__raises_error(queries):
+    """If the queries do not generate the same SQL, raise a ValueError."""
+    with pytest.raises(ValueError):
+        altqq.to_psycopg_many(queries)
+
+
+def test_to_psycopg_many__no_queries__raises_error():
+    """If no query is provided, raise a ValueError."""
+    with pytest.raises(ValueError):
+        altqq.to_psycopg_many([])
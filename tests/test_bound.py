@@ -0,0 +1,117 @@
+"""Tests the translation of the queries created from bound queries."""
+
+import altqq
+import pytest
+
+from tests.queries import (
+    OrderQuery,
+    SelectTableByFilter,
+    SelectWithCalculated,
+    SelectWithDollar,
+    SelectWithRepeated,
+)
+from tests.utils import clean_whitespaces as cws
+
+TRANSLATIONS = [
+    ("to_pyodbc", altqq.to_pyodbc),
+    ("to_psycopg", altqq.to_psycopg),
+    ("to_psycopg_named", altqq.to_psycopg_named),
+    ("to_mysql", altqq.to_mysql),
+    ("to_asyncpg", altqq.to_asyncpg),
+    ("to_sqlite", altqq.to_sqlite),
+    ("to_plain_text", altqq.to_plain_text),
+]
+
+
+@pytest.mark.parametrize("method,translate", TRANSLATIONS)
+def test_bind__translations__same_as_full_translation(method, translate):
+    """If a bound query is translated, it matches the full translation."""
+    bound = SelectWithDollar.bind(table="Users")
+    for values in [{"list": [1, 2], "value": 3}, {"list": [4, 5], "value": 6}]:
+        res = getattr(bound, method)(**values)
+        assert res == translate(SelectWithDollar(table="Users", **values))
+
+
+def test_bind__list_length_changes__sql_rewritten():
+    """If the length of a dynamic list changes, the SQL is written again."""
+    bound = SelectWithDollar.bind(table="Users")
+    short = bound.to_asyncpg(list=[1], value=2)
+    long = bound.to_asyncpg(list=[1, 2, 3], value=4)
+    assert "IN ($1) AND B = $2" in short.query
+    assert "IN ($1,$2,$3) AND B = $4" in long.query
+    assert long.parameters == (1, 2, 3, 4)
+    assert long.fingerprint == altqq.fingerprint(
+        SelectWithDollar("Users", [5, 6, 7], 8)
+    )
+
+
+def test_bind__dynamic_non_parameter__sql_follows_value():
+    """If a non-parameter is left dynamic, each value writes its own SQL."""
+    bound = SelectTableByFilter.bind(table="Users")
+    res1 = bound.to_pyodbc(filter_column="id", filter_value=1)
+    res2 = bound.to_pyodbc(filter_column="age", filter_value=2)
+    assert '"id" = ?' in res1.query
+    assert '"age" = ?' in res2.query
+    assert res2.parameters == [2]
+
+
+def test_bind__repeated_fields__named_parameters_shared():
+    """If a dynamic field is written twice, its named parameters are shared."""
+    bound = SelectWithRepeated.bind()
+    res = bound.to_psycopg_named(value=1, list=[2, 3])
+    assert res == altqq.to_psycopg_named(SelectWithRepeated(1, [2, 3]))
+    res = bound.to_psycopg_named(value=4, list=[5, 6])
+    assert res.parameters == {"value": 4, "list__0": 5, "list__1": 6}
+
+
+def test_bind__calculated_fields__recomputed():
+    """If the query has calculated fields, they are taken from each query."""
+    bound = SelectWithCalculated.bind()
+    assert bound.to_psycopg(param=1).parameters == (1, 20, 30)
+    assert bound.to_psycopg(param=2).parameters == (2, 20, 30)
+
+
+def test_bind__bound_subquery__parameters_kept():
+    """If a nested query is bound, its parameters are reused as they are."""
+    subquery = SelectTableByFilter("Users", "last_name", "Fine")
+    bound = OrderQuery.bind(subquery=subquery, order_column="age")
+    res = bound.to_psycopg(order="desc")
+    assert cws(res.query) == cws("""
+        SELECT * FROM (
+            SELECT *, (15 %% 10) AS t FROM "Users" WHERE "last_name" = %s
+        ) AS tbl
+        ORDER BY "age" desc
+    """)
+    assert res.parameters == ("Fine",)
+
+
+def test_bind__dynamic_subquery__fully_translated():
+    """If a dynamic field holds a nested query, it is translated as usual."""
+    bound = OrderQuery.bind(order_column="age", order="asc")
+    for value in ["a", "b"]:
+        subquery = SelectTableByFilter("Users", "last_name", value)
+        res = bound.to_pyodbc(subquery=subquery)
+        assert res == altqq.to_pyodbc(OrderQuery(subquery, "age", "asc"))
+
+
+def test_bind__list_bucketing__padded_values():
+    """If the translator buckets lists, the template values are padded too."""
+    translator = altqq.AsyncpgTranslator(list_bucketing=altqq.ListBucketing((4,)))
+    bound = SelectWithDollar.bind(table="Users")
+    res1 = bound.translate(translator, list=[1, 2], value=3)
+    res2 = bound.translate(translator, list=[4, 5, 6], value=7)
+    assert res1.query == res2.query
+    assert res2.parameters == (4, 5, 6, 6, 7)
+
+
+def test_bind__unknown_field__raises_type_error():
+    """If an unknown field is bound, a TypeError is raised."""
+    with pytest.raises(TypeError, match="Unknown fields"):
+        SelectTableByFilter.bind(tables="Users")
+
+
+def test_bind__field_already_bound__raises_type_error():
+    """If a bound field is given again, a TypeError is raised."""
+    bound = SelectTableByFilter.bind(table="Users")
+    with pytest.raises(TypeError, match="already bound"):
+        bound.to_psycopg(table="Other", filter_column="id", filter_value=1)
@@ -0,0 +1,134 @@
+"""Tests the memoization of the translations."""
+
+import dataclasses as dc
+import sys
+from decimal import Decimal
+from typing import Any
+
+import altqq
+import pytest
+
+from tests.queries import SelectTableByFilter
+
+
+class FrozenFilter(altqq.Query, frozen=True):
+    """Test query that can be cached."""
+
+    __query__ = 'SELECT * FROM "{table}" WHERE id IN {ids} AND age = {age}'
+
+    table: altqq.NonParameter[str]
+    ids: altqq.ListParameter[int]
+    age: int
+
+
+class FrozenWrap(altqq.Query, frozen=True):
+    """Test query nesting a cached query."""
+
+    __query__ = "SELECT * FROM ({inner}) AS t"
+
+    inner: FrozenFilter
+
+
+class FrozenAny(altqq.Query, frozen=True):
+    """Test query with a value of any type."""
+
+    __query__ = "SELECT * FROM Users WHERE a = {value}"
+
+    value: Any
+
+
+def test_cache__equal_queries__translated_once():
+    """If equal frozen queries are translated, the cached result is returned."""
+    translator = altqq.PsycopgTranslator(cache_size=2)
+    first = translator(FrozenWrap(FrozenFilter("Users", (1, 2), 20)))
+    second = translator(FrozenWrap(FrozenFilter("Users", (1, 2), 20)))
+
+    assert second is first
+    info = translator.cache.info()
+    assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+
+def test_cache__over_max_size__least_recent_evicted():
+    """If the cache is full, the least recently used translation is removed."""
+    translator = altqq.PyODBCTranslator(cache_size=2)
+    queries = [FrozenFilter("Users", (i,), i) for i in range(3)]
+    translator(queries[0])
+    translator(queries[1])
+    translator(queries[0])
+    translator(queries[2])
+    translator(queries[0])
+
+    info = translator.cache.info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (2, 3, 1, 2)
+
+
+def test_cache__unhashable_query__translated_every_time():
+    """If the query is not hashable, it is translated without caching."""
+    translator = altqq.PlainTextTranslator(cache_size=2)
+    query = SelectTableByFilter("Users", "age", 20)
+    assert translator(query) == altqq.to_plain_text(query)
+    assert translator(FrozenFilter("Users", [1], 2)) != translator(query)
+
+    info = translator.cache.info()
+    assert (info.unhashable, info.size) == (3, 0)
+
+
+def test_cache__clear__translations_and_stats_reset():
+    """If the cache is cleared, it starts empty again."""
+    translator = altqq.AsyncpgTranslator(cache_size=2)
+    translator(FrozenFilter("Users", (1,), 2))
+    translator.cache.clear()
+    assert translator.cache.info().misses == 0
+    assert translator.cache.info().size == 0
+
+
+def test_frozen_query__assignment__raises_error():
+    """If the query is frozen, its fields cannot be changed."""
+    query = FrozenFilter("Users", (1,), 2)
+    with pytest.raises(dc.FrozenInstanceError):
+        query.age = 3  # type: ignore
+
+
+def test_cache__disabled__no_cache():
+    """If no cache size is given, the translator has no cache."""
+    assert altqq.MySQLTranslator().cache is None
+
+
+class FrozenAnyWrap(altqq.Query, frozen=True):
+    """Test query nesting a query with a value of any type."""
+
+    __query__ = "SELECT * FROM ({inner}) AS t"
+
+    inner: FrozenAny
+
+
+@pytest.mark.parametrize(
+    "translator",
+    [altqq.PsycopgTranslator(cache_size=8), altqq.PlainTextTranslator(cache_size=8)],
+)
+def test_cache__equal_values_of_other_types__translated_separately(translator):
+    """If values are equal but of other types, each has its own translation."""
+    values = [1, True, 1.0, Decimal("1.00")]
+    uncached = type(translator)()
+    for value in values:
+        translator(FrozenAny(value))
+        translator(FrozenAnyWrap(FrozenAny(value)))
+
+    for value in values:
+        query = FrozenAnyWrap(FrozenAny(value))
+        assert translator(FrozenAny(value)) == uncached(FrozenAny(value))
+        assert translator(query) == uncached(query)
+    info = translator.cache.info()
+    assert (info.hits, info.misses, info.size) == (8, 8, 8)
+
+
+def test_cache__deeply_nested_query__cached_without_recursion():
+    """If the nesting is deeper than the recursion limit, it is still cached."""
+    translator = altqq.PsycopgTranslator(cache_size=2)
+    query = FrozenAny(1)
+    for _ in range(sys.getrecursionlimit() + 100):
+        query = FrozenAny(query)
+
+    first = translator(query)
+    assert translator(query) is first
+    assert translator.cache.info().hits == 1
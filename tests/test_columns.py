@@ -0,0 +1,112 @@
+"""Tests the batch translations of columnar values."""
+
+import array
+from typing import Any, List
+
+import altqq
+import pydantic
+import pytest
+
+from tests.queries import SelectTableByFilter, SelectWithArray, SelectWithCalculated
+
+
+class InsertUser(altqq.Query):
+    """Test query inserting a row."""
+
+    __query__ = 'INSERT INTO "{table}" (name, age) VALUES ({name}, {age})'
+
+    table: altqq.NonParameter[str]
+    name: str
+    age: int
+
+
+class FakeArray:
+    """Test column converted with `tolist`, like the NumPy arrays."""
+
+    def __init__(self, values: List[Any]):
+        self.values = values
+
+    def tolist(self) -> List[Any]:
+        """Returns the values as a list."""
+        return list(self.values)
+
+
+def test_many_columns__bound_query__same_as_many():
+    """If columns are translated, the batch is the same as from the queries."""
+    names = ["Alice", "Bob", "Carol"]
+    ages = [20, 30, 40]
+    bound = InsertUser.bind(table="Users")
+    res = altqq.Translators.PSYCOPG.many_columns(bound, {"name": names, "age": ages})
+    queries = [InsertUser("Users", n, a) for n, a in zip(names, ages)]
+    assert res == altqq.to_psycopg_many(queries)
+
+
+def test_many_columns__arrays_and_buffers__converted_to_lists():
+    """If the columns are arrays or buffers, their values are used."""
+    columns = {"name": FakeArray(["a", "b"]), "age": array.array("q", [1, 2])}
+    res = altqq.Translators.PYODBC.many_columns(InsertUser.bind(table="T"), columns)
+    assert res.parameters == [("a", 1), ("b", 2)]
+    assert all(type(row[1]) is int for row in res.parameters)
+
+
+def test_many_columns__validation__values_coerced():
+    """If the columns are validated, their values are converted to the types."""
+    columns = {"name": ["a", "b"], "age": ["1", 2.0]}
+    res = altqq.Translators.PSYCOPG.many_columns(InsertUser.bind(table="T"), columns)
+    assert res.parameters == [("a", 1), ("b", 2)]
+
+
+def test_many_columns__invalid_value__error_has_row_index():
+    """If a value is not valid, the error is located by its row."""
+    columns = {"name": ["a", "b", "c"], "age": [1, 2, "three"]}
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        altqq.Translators.PSYCOPG.many_columns(InsertUser.bind(table="T"), columns)
+    assert exc_info.value.errors()[0]["loc"] == (2,)
+
+
+def test_many_columns__no_validation__values_kept():
+    """If the validation is skipped, the values are kept as they are."""
+    columns = {"name": ["a"], "age": ["1"]}
+    bound = InsertUser.bind(table="T")
+    res = altqq.Translators.PSYCOPG.many_columns(bound, columns, validate=False)
+    assert res.parameters == [("a", "1")]
+
+
+def test_many_columns__query_class__arrays_converted_per_row():
+    """If a class is given, array parameters are converted per row."""
+    res = altqq.Translators.ASYNCPG.many_columns(
+        SelectWithArray, {"array": [[1, 2], [3]]}
+    )
+    assert res.query.strip() == "SELECT * FROM table WHERE A = ANY($1)"
+    assert res.parameters == [([1, 2],), ([3],)]
+
+
+def test_many_columns__named_parameters__rows_by_name():
+    """If the placeholders are named, each row maps the names to the values."""
+    columns = {"name": ["a", "b"], "age": [1, 2]}
+    translator = altqq.Translators.PSYCOPG_NAMED
+    res = translator.many_columns(InsertUser.bind(table="T"), columns)
+    assert res.parameters == [{"name": "a", "age": 1}, {"name": "b", "age": 2}]
+
+
+def test_many_columns__structural_column__raises_value_error():
+    """If a column changes the SQL, a ValueError is raised."""
+    columns = {"table": ["a"], "filter_column": ["b"], "filter_value": [1]}
+    with pytest.raises(ValueError, match="changes the SQL"):
+        altqq.Translators.PSYCOPG.many_columns(SelectTableByFilter, columns)
+
+
+def test_many_columns__invalid_columns__raise_errors():
+    """If the columns do not match the fields, an error is raised."""
+    translator = altqq.Translators.PSYCOPG
+    bound = InsertUser.bind(table="T")
+    with pytest.raises(TypeError, match="Unknown fields"):
+        translator.many_columns(bound, {"name": ["a"], "age": [1], "x": [1]})
+    with pytest.raises(TypeError, match="Missing columns"):
+        translator.many_columns(bound, {"name": ["a"]})
+    with pytest.raises(ValueError, match="same length"):
+        translator.many_columns(bound, {"name": ["a"], "age": [1, 2]})
+    with pytest.raises(ValueError, match="At least one row"):
+        translator.many_columns(bound, {"name": [], "age": []})
+    with pytest.raises(ValueError, match="calculated"):
+        translator.many_columns(SelectWithCalculated, {"param": [1]})
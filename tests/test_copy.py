@@ -0,0 +1,118 @@
+"""Tests the PostgreSQL COPY payloads of rows."""
+
+import dataclasses as dc
+import datetime
+import io
+from typing import Any, Optional
+
+import altqq
+import pytest
+
+from tests.queries import SelectTableByFilter, SelectWithList
+
+
+class UserRow(altqq.Query):
+    """Test query of a row of values."""
+
+    __query__ = "({first_name}, {age}, {tags})"
+
+    first_name: Optional[str]
+    age: Optional[int]
+    tags: altqq.ArrayParameter[str]
+
+
+@dc.dataclass
+class Event:
+    """Test dataclass for a row of values."""
+
+    at: datetime.datetime
+    payload: Any
+
+
+def test_copy_writer__query_rows__statement_from_fields():
+    """If the rows are queries, the columns follow the order of `__query__`."""
+    writer = altqq.CopyWriter(UserRow, "public.users")
+    assert writer.columns == ("first_name", "age", "tags")
+    assert writer.statement == (
+        'COPY public.users ("first_name", "age", "tags") FROM STDIN'
+    )
+
+
+def test_copy_writer__csv__statement_has_format():
+    """If the format is CSV, it is given in the statement."""
+    writer = altqq.CopyWriter(Event, "events", altqq.CopyFormat.CSV)
+    assert writer.statement == 'COPY events ("at", "payload") FROM STDIN (FORMAT csv)'
+
+
+def test_copy_writer__text__values_escaped():
+    """If the format is text, nulls and special characters are escaped."""
+    rows = [
+        UserRow("Alice\tA.", 20, ["a", 'b "c"']),
+        UserRow(None, None, []),
+        UserRow("back\\slash\nline", 30, ["x,y", None]),  # type: ignore
+    ]
+    fp = io.BytesIO()
+    written = altqq.CopyWriter(UserRow, "users").write(rows, fp, encoding="utf-8")
+    assert fp.getvalue() == (
+        b'Alice\\tA.\t20\t{"a","b \\\\"c\\\\""}\n'
+        b"\\N\t\\N\t{}\n"
+        b'back\\\\slash\\nline\t30\t{"x,y",NULL}\n'
+    )
+    assert written == len(fp.getvalue())
+
+
+def test_copy_writer__csv__values_quoted():
+    """If the format is CSV, empty strings and special characters are quoted."""
+    at = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    rows = [
+        Event(at, "plain"),
+        Event(at, ""),
+        Event(at, None),
+        Event(at, 'say "hi", bye'),
+        Event(at, {"a": 1}),
+        Event(at, True),
+        Event(at, b"\x01\xff"),
+    ]
+    fp = io.StringIO()
+    altqq.CopyWriter(Event, "events", altqq.CopyFormat.CSV).write(rows, fp)
+    assert fp.getvalue().splitlines() == [
+        "2024-01-02 03:04:05,plain",
+        '2024-01-02 03:04:05,""',
+        "2024-01-02 03:04:05,",
+        '2024-01-02 03:04:05,"say ""hi"", bye"',
+        '2024-01-02 03:04:05,"{""a"": 1}"',
+        "2024-01-02 03:04:05,t",
+        "2024-01-02 03:04:05,\\x01ff",
+    ]
+
+
+def test_copy_writer__tuple_rows__written_as_values():
+    """If the rows are tuples, their values are written in order."""
+    writer = altqq.CopyWriter(Event, "events")
+    assert writer.line(("now", 1.5)) == "now\t1.5\n"
+    with pytest.raises(ValueError, match="2 columns"):
+        writer.line(("now",))
+
+
+def test_copy_writer__iter_chunks__buffered():
+    """If many rows are written, they are generated in chunks."""
+    writer = altqq.CopyWriter(UserRow, "users", buffer_size=100)
+    rows = (UserRow(f"user{i}", i, []) for i in range(1000))
+    chunks = list(writer.iter_chunks(rows))
+    assert len(chunks) > 10
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+    assert "".join(chunks).count("\n") == 1000
+
+
+def test_copy_writer__non_parameter_fields__raises_value_error():
+    """If a query row has non-parameter fields, a ValueError is raised."""
+    with pytest.raises(ValueError, match="must be a parameter"):
+        altqq.CopyWriter(SelectTableByFilter, "users")
+    with pytest.raises(ValueError, match="must be a parameter"):
+        altqq.CopyWriter(SelectWithList, "users")
+
+
+def test_copy_writer__not_a_row_class__raises_type_error():
+    """If the row class is neither a query nor a dataclass, it is a TypeError."""
+    with pytest.raises(TypeError):
+        altqq.CopyWriter(dict, "users")
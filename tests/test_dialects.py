@@ -0,0 +1,106 @@
+"""Tests the translations with custom dialects."""
+
+import dataclasses as dc
+from typing import Any, List, Tuple
+
+import altqq
+import pytest
+from altqq.translators.dialects import Dialect, DialectTranslator, PlaceholderStyle
+
+from tests.queries import OrderQuery, SelectTableByFilter, SelectWithList
+from tests.utils import clean_whitespaces as cws
+
+
+@dc.dataclass
+class NumberedQuery:
+    """Translated query for the test dialect."""
+
+    query: str
+    parameters: List[Any]
+
+
+class NumberedTranslator(DialectTranslator[NumberedQuery, NumberedQuery]):
+    """Test translator using numbered markers."""
+
+    DIALECT = Dialect(placeholder=PlaceholderStyle.NUMERIC, max_parameters=4)
+
+    def _create_query(
+        self, query: str, parameters: List[Any], fingerprint: str
+    ) -> NumberedQuery:
+        return NumberedQuery(query, parameters)
+
+    def _create_batch(
+        self, query: str, parameters: List[Tuple[Any, ...]]
+    ) -> NumberedQuery:
+        return NumberedQuery(query, list(parameters))
+
+
+class PairRow(altqq.Query):
+    """Test query for a row of two values."""
+
+    __query__ = "({a}, {b})"
+
+    a: int
+    b: int
+
+
+def test_numbered_dialect__nested_query__markers_numbered_in_order():
+    """If the dialect uses numbered markers, nested queries continue the count."""
+    query = OrderQuery(SelectTableByFilter("Users", "age", 20), "age", "asc")
+    res = NumberedTranslator()(query)
+    assert '"age" = $1' in cws(res.query)
+    assert res.parameters == [20]
+
+
+def test_numbered_dialect__list_parameter__markers_numbered_in_order():
+    """If the dialect uses numbered markers, the list markers are numbered."""
+    res = NumberedTranslator()(SelectWithList([1, 2, 3]))
+    assert cws(res.query) == "SELECT * FROM table WHERE A IN ($1,$2,$3)"
+
+
+def test_numbered_dialect__values__markers_restart_per_query():
+    """If the values are chunked, each query numbers its markers from one."""
+    rows = [PairRow(1, 2), PairRow(3, 4), PairRow(5, 6)]
+    res = list(NumberedTranslator().values("INSERT INTO t VALUES", rows))
+    assert [r.query for r in res] == [
+        "INSERT INTO t VALUES ($1, $2),($3, $4)",
+        "INSERT INTO t VALUES ($1, $2)",
+    ]
+    assert [r.parameters for r in res] == [[1, 2, 3, 4], [5, 6]]
+
+
+def test_psycopg__escaped_non_parameter__escaped_only_with_parameters():
+    """If there are no parameters, the non-parameter values are not escaped."""
+    with_parameters = altqq.to_psycopg(SelectTableByFilter("100%", "age", 20))
+    without_parameters = altqq.to_psycopg(OrderQuery(SelectWithList([]), "100%", "asc"))
+    assert 'FROM "100%%"' in with_parameters.query
+    assert 'BY "100%"' in without_parameters.query
+
+
+def test_deprecated_formatter__imported__warns_and_formats():
+    """If a removed formatter class is imported, it warns and still works."""
+    from altqq.translators import psycopg, pyodbc
+
+    with pytest.warns(DeprecationWarning, match="PyODBCFormatter"):
+        formatter = pyodbc.PyODBCFormatter()
+    with pytest.warns(DeprecationWarning, match="PsycopgStatement"):
+        statement = psycopg.PsycopgStatement("?", [1])
+    assert formatter.format("a = {a}", a=statement) == "a = ?"
+    assert formatter.parameter_values == [1]
+    with pytest.raises(AttributeError):
+        getattr(pyodbc, "PyODBCStatements")
+
+
+def test_dialect_translator__missing_result_methods__cannot_instantiate():
+    """If a subclass does not create the results, it cannot be instantiated."""
+
+    class PartialTranslator(DialectTranslator[NumberedQuery, NumberedQuery]):
+        DIALECT = NumberedTranslator.DIALECT
+
+        def _create_query(
+            self, query: str, parameters: List[Any], fingerprint: str
+        ) -> NumberedQuery:
+            return NumberedQuery(query, parameters)
+
+    with pytest.raises(TypeError, match="_create_batch"):
+        PartialTranslator()  # type: ignore
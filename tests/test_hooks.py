@@ -0,0 +1,60 @@
+"""Tests the instrumentation hooks of the translators."""
+
+from typing import List
+
+import altqq
+from altqq.translators.plain_text import PlainTextTranslator
+
+from tests.queries import OrderQuery, SelectWithList, UnionAllQuery
+from tests.queries import SelectTableByFilter as Filter
+
+
+def test_add_hook__nested_query__event_reported():
+    """If a hook is added, it receives the details of the translation."""
+    events: List[altqq.TranslationEvent] = []
+    translator = altqq.PsycopgTranslator()
+    translator.add_hook(events.append)
+    query = OrderQuery(
+        UnionAllQuery(Filter("A", "a", 1), Filter("B", "b", 2)), "a", "asc"
+    )
+    res = translator(query)
+
+    [event] = events
+    assert event.query_class is OrderQuery
+    assert event.dialect == "psycopg"
+    assert event.depth == 3
+    assert event.parameter_count == 2
+    assert event.sql_length == len(res.query)
+    assert event.list_sizes == ()
+    assert event.elapsed >= 0
+
+
+def test_add_hook__bucketed_lists__written_list_sizes():
+    """If the lists are padded, the padded sizes are reported."""
+    events: List[altqq.TranslationEvent] = []
+    translator = altqq.AsyncpgTranslator(altqq.ListBucketing())
+    translator.add_hook(events.append)
+    translator(SelectWithList([1, 2, 3]))
+    assert events[0].list_sizes == (4,)
+    assert events[0].parameter_count == 4
+
+
+def test_add_hook__plain_text__no_parameters_reported():
+    """If the translation is plain text, the values are not bound."""
+    events: List[altqq.TranslationEvent] = []
+    translator = PlainTextTranslator()
+    translator.add_hook(events.append)
+    translator(SelectWithList([1, 2]))
+    assert events[0].dialect == "plain_text"
+    assert events[0].parameter_count == 0
+    assert events[0].list_sizes == (2,)
+
+
+def test_remove_hook__translation__not_reported():
+    """If the hook is removed, it is not called anymore."""
+    events: List[altqq.TranslationEvent] = []
+    translator = altqq.PyODBCTranslator()
+    translator.add_hook(events.append)
+    translator.remove_hook(events.append)
+    translator(Filter("A", "a", 1))
+    assert events == []
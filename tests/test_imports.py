@@ -0,0 +1,59 @@
+"""Tests the import of the altqq package."""
+
+import json
+import subprocess
+import sys
+
+import altqq
+
+# Generous budget for slow machines, the import takes a few milliseconds
+IMPORT_TIME_BUDGET = 0.5
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import altqq
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_altqq() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_import__fresh_process__translators_not_imported():
+    """If altqq is imported, the translators and Pydantic are not imported."""
+    modules = _import_altqq()["modules"]
+    assert not [m for m in modules if m.startswith("altqq.translators.")]
+    assert "pydantic" not in modules
+
+
+def test_import__fresh_process__within_budget():
+    """If altqq is imported, it takes less than the import time budget."""
+    assert _import_altqq()["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_getattr__lazy_attribute__same_object():
+    """If a lazy attribute is accessed, the object of its module is returned."""
+    from altqq.translators.pyodbc import PyODBCTranslator
+
+    assert altqq.PyODBCTranslator is PyODBCTranslator
+    assert "PyODBCTranslator" in dir(altqq)
+
+
+def test_getattr__unknown_attribute__raises_error():
+    """If the attribute does not exist, an AttributeError is raised."""
+    assert not hasattr(altqq, "UnknownTranslator")
+
+
+def test_translators__first_access__single_instance():
+    """If a translator is accessed, the same instance is always returned."""
+    assert altqq.Translators.MYSQL is altqq.Translators.MYSQL
+    assert isinstance(altqq.Translators.MYSQL, altqq.MySQLTranslator)
@@ -0,0 +1,80 @@
+"""Tests the SQL literals of the plain text translations."""
+
+import datetime
+import decimal
+import uuid
+
+import altqq
+import pytest
+
+from tests.queries import SelectTableByFilter, SelectWithList
+
+
+@pytest.mark.parametrize(
+    "value,literal",
+    [
+        (None, "NULL"),
+        (True, "TRUE"),
+        (10, "10"),
+        (1.5, "1.5"),
+        (float("nan"), "'NaN'"),
+        (float("-inf"), "'-Infinity'"),
+        (decimal.Decimal("1.10"), "1.10"),
+        ("it's", "'it''s'"),
+        (datetime.datetime(2024, 1, 2, 3, 4, 5), "'2024-01-02 03:04:05'"),
+        (datetime.date(2024, 1, 2), "'2024-01-02'"),
+        (b"\x01\xff", "X'01FF'"),
+        (uuid.UUID(int=1), "'00000000-0000-0000-0000-000000000001'"),
+    ],
+)
+def test_literal_renderer__ansi__literal_written(value: object, literal: str):
+    """If a value is rendered, it is written as the expected literal."""
+    assert altqq.LiteralRenderer()(value) == literal
+
+
+@pytest.mark.parametrize(
+    "dialect,value,literal",
+    [
+        ("sqlserver", False, "0"),
+        ("sqlserver", b"ab", "0x6162"),
+        ("postgresql", b"ab", "'\\x6162'"),
+        ("mysql", "a\\b'c", "'a\\\\b''c'"),
+        ("sqlite", True, "1"),
+    ],
+)
+def test_literal_renderer__dialect__dialect_literal(
+    dialect: str, value: object, literal: str
+):
+    """If a dialect is selected, its literals are used."""
+    assert altqq.LiteralRenderer(dialect)(value) == literal
+
+
+def test_literal_renderer__unknown_dialect__raises_error():
+    """If the dialect is unknown, a ValueError is raised."""
+    with pytest.raises(ValueError):
+        altqq.LiteralRenderer("oracle")
+
+
+def test_literal_renderer__registered_base_class__used_for_subclass():
+    """If a base class is registered, its subclasses use the same function."""
+
+    class Money(decimal.Decimal):
+        pass
+
+    renderer = altqq.LiteralRenderer()
+    assert renderer(Money("1.5")) == "1.5"
+    renderer.register(decimal.Decimal, lambda v: f"CAST({v} AS MONEY)")
+    assert renderer(Money("1.5")) == "CAST(1.5 AS MONEY)"
+
+
+def test_to_plain_text__quote_in_value__escaped():
+    """If a value contains a quote, it is doubled in the literal."""
+    sql = altqq.to_plain_text(SelectTableByFilter("Users", "name", "O'Brien"))
+    assert "\"name\" = 'O''Brien'" in sql
+
+
+def test_plain_text_translator__custom_literals__used_for_lists():
+    """If custom literals are given, they are used for the list values."""
+    translator = altqq.PlainTextTranslator(altqq.LiteralRenderer("sqlite"))
+    sql = translator(SelectWithList([True, False]))
+    assert sql.strip() == "SELECT * FROM table WHERE A IN (1,0)"
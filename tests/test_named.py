@@ -0,0 +1,101 @@
+"""Tests the named and deduplicated parameter translations."""
+
+import dataclasses as dc
+
+import altqq
+import pytest
+from altqq.translators.dialects import PlaceholderStyle
+
+from tests.queries import SelectWithRepeated, UnionAllQuery
+from tests.queries import SelectTableByFilter as Filter
+from tests.utils import clean_whitespaces as cws
+
+
+def test_to_psycopg_named__repeated_fields__bound_once():
+    """If a field is referenced twice, its markers and values are shared."""
+    res = altqq.to_psycopg_named(SelectWithRepeated(1, [2, 3]))
+    assert cws(res.query) == cws("""
+        SELECT * FROM table WHERE (A = %(value)s OR B = %(value)s)
+        AND C IN (%(list__0)s,%(list__1)s) AND D IN (%(list__0)s,%(list__1)s)
+    """)
+    assert res.parameters == {"value": 1, "list__0": 2, "list__1": 3}
+
+
+def test_to_psycopg_named__nested_queries__names_namespaced():
+    """If nested queries have the same fields, their names do not collide."""
+    query = UnionAllQuery(Filter("Music", "title", "a%"), Filter("Music", "n", "b"))
+    res = altqq.to_psycopg_named(query)
+    assert '"title" = %(query1__filter_value)s' in res.query
+    assert '"n" = %(query2__filter_value)s' in res.query
+    assert "(15 %% 10)" in res.query
+    assert res.parameters == {"query1__filter_value": "a%", "query2__filter_value": "b"}
+
+
+def test_to_psycopg_named__same_instance_nested_twice__bound_once():
+    """If the same query instance is nested twice, its parameters are shared."""
+    inner = Filter("Music", "title", "Secret")
+    res = altqq.to_psycopg_named(UnionAllQuery(inner, inner))
+    assert res.query.count("%(query1__filter_value)s") == 2
+    assert res.parameters == {"query1__filter_value": "Secret"}
+
+
+@dc.dataclass
+class UserData:
+    """Test dataclass for a row of values."""
+
+    first_name: str
+    age: int
+
+
+def test_to_psycopg_named__values__names_prefixed_with_row():
+    """If rows are translated, each row has its own parameter names."""
+    rows = [UserData("Alice", 20), UserData("Bob", 30)]
+    [res] = altqq.Translators.PSYCOPG_NAMED.values("INSERT INTO Users VALUES", rows)
+    assert "(%(r0__first_name)s,%(r0__age)s),(%(r1__first_name)s" in res.query
+    assert res.parameters["r1__age"] == 30
+
+
+def test_asyncpg_deduplicate__repeated_fields__markers_reused():
+    """If deduplicating, a field referenced twice reuses its numbered markers."""
+    translator = altqq.AsyncpgTranslator(deduplicate=True)
+    res = translator(SelectWithRepeated(1, [2, 3]))
+    assert cws(res.query) == cws("""
+        SELECT * FROM table WHERE (A = $1 OR B = $1)
+        AND C IN ($2,$3) AND D IN ($2,$3)
+    """)
+    assert res.parameters == (1, 2, 3)
+
+
+def test_asyncpg_deduplicate__distinct_instances__fingerprints_differ():
+    """If an instance is shared, the SQL and the fingerprint change."""
+    translator = altqq.AsyncpgTranslator(deduplicate=True)
+    shared = Filter("Music", "title", "Secret")
+    same = translator(UnionAllQuery(shared, shared))
+    distinct = translator(UnionAllQuery(shared, Filter("Music", "title", "Secret")))
+    assert same.parameters == ("Secret",)
+    assert distinct.parameters == ("Secret", "Secret")
+    assert same.fingerprint != distinct.fingerprint
+    assert translator.fingerprint(UnionAllQuery(shared, shared)) == same.fingerprint
+
+
+def test_deduplicate__repeated_fields__fingerprint_without_sql():
+    """If fields are written again, the fingerprint matches the translation."""
+    query = SelectWithRepeated(1, [2, 3])
+    for translator in [
+        altqq.AsyncpgTranslator(deduplicate=True),
+        altqq.PsycopgNamedTranslator(),
+    ]:
+        assert translator.fingerprint(query) == translator(query).fingerprint
+
+
+def test_deduplicate__positional_markers__raises_error():
+    """If the markers cannot refer to a parameter twice, an error is raised."""
+    with pytest.raises(ValueError, match="QMARK"):
+        altqq.PyODBCTranslator(deduplicate=True)
+
+
+def test_placeholder_style__named__not_numbered():
+    """If the style is named, the marker takes a name instead of a position."""
+    assert PlaceholderStyle.PYFORMAT.marker("a") == "%(a)s"
+    assert not PlaceholderStyle.NAMED.numbered
+    assert PlaceholderStyle.NUMERIC.numbered
@@ -1,9 +1,15 @@
 """Tests the translations of queries."""
 
+import dataclasses as dc
 from typing import ClassVar
 
 import altqq
+import pydantic
 import pytest
+from altqq.structs import QueryMeta
+from altqq.types import QueryValueTypes
+
+from tests import queries
 
 
 def test_query_subclass__no_annotations__raises_error():
@@ -34,3 +40,203 @@ def test_query_subclass__query_typed__works():
 
     class _(altqq.Query):
         __query__: ClassVar[str]
+
+
+def test_query_subclass__unknown_placeholder__raises_error():
+    """If __query__ uses a placeholder that is not a field, raise a ValueError."""
+    with pytest.raises(ValueError):
+
+        class _(altqq.Query):
+            __query__ = "SELECT * FROM Users WHERE id = {user_id}"
+            id: int
+
+
+def test_query_subclass__positional_placeholder__raises_error():
+    """If __query__ uses a positional placeholder, raise a ValueError."""
+    with pytest.raises(ValueError):
+
+        class _(altqq.Query):
+            __query__ = "SELECT * FROM Users WHERE id = {}"
+            id: int
+
+
+def test_query_subclass__escaped_braces__kept_in_template():
+    """If __query__ has escaped braces, they are kept as literal braces."""
+
+    class Query(altqq.Query):
+        __query__ = "SELECT '{{}}' FROM Users WHERE id = {id}"
+        id: int
+
+    assert Query.__query_template__.literals == (
+        "SELECT '{}' FROM Users WHERE id = ",
+        "",
+    )
+    assert Query.__query_template__.placeholders == ("id",)
+
+
+def test_query_plan__field_types__roles_resolved():
+    """The plan of a query class describes the role of each field."""
+    plan = queries.OrderQuery.__query_plan__
+    fields = {f.name: f for f in plan.fields}
+
+    assert fields["subquery"].may_be_query
+    assert fields["order_column"].role == QueryValueTypes.NON_PARAMETER
+    assert not fields["order_column"].may_be_query
+    assert [f.name for f in plan.slots] == ["subquery", "order_column", "order"]
+
+
+def test_query_plan__list_and_any_fields__roles_resolved():
+    """List parameters and untyped values are resolved in the plan."""
+    list_field = queries.SelectWithList.__query_plan__.fields[0]
+    any_field = queries.SelectTableByFilter.__query_plan__.fields[2]
+
+    assert list_field.role == QueryValueTypes.LIST_PARAMETER
+    assert not list_field.may_be_query
+    assert any_field.role == QueryValueTypes.PARAMETER
+    assert any_field.may_be_query
+
+
+class Filter:
+    """Test mixin of the filter queries."""
+
+
+class ByName(Filter, altqq.Query):
+    """Test filter query inheriting a mixin."""
+
+    __query__ = "name = {name}"
+
+    name: str
+
+
+class SelectFiltered(altqq.Query):
+    """Test query with a field typed by the mixin."""
+
+    __query__ = "SELECT * FROM Users WHERE {where}"
+
+    where: Filter
+
+
+def test_query_plan__mixin_field__nested_query_translated():
+    """If a field is typed by a mixin of queries, its queries are translated."""
+    res = altqq.to_pyodbc(SelectFiltered(ByName("x")))
+    assert res.query == "SELECT * FROM Users WHERE name = ?"
+    assert res.parameters == ["x"]
+
+
+def test_query_construct__calculated_fields__post_init_called():
+    """If a query is constructed, the calculated values are still assigned."""
+    query = queries.SelectWithCalculated.construct(param=10)
+    assert altqq.to_psycopg(query) == altqq.to_psycopg(queries.SelectWithCalculated(10))
+
+
+def test_query_construct__invalid_value__not_validated():
+    """If a query is constructed, the values are assigned without validation."""
+    query = queries.SelectWithCalculated.construct(param="10")
+    assert query.param == "10"
+
+
+class SelectWithDefaults(altqq.Query):
+    """Test query with the kinds of default values."""
+
+    __query__ = "SELECT * FROM Users WHERE a = {a} AND b IN {b} AND c IN {c}"
+
+    a: int = pydantic.Field(default=5)
+    b: altqq.ListParameter[int] = pydantic.Field(default_factory=lambda: [1])
+    c: altqq.ListParameter[int] = dc.field(default_factory=lambda: [2])
+
+
+def test_query_construct__field_defaults__unwrapped():
+    """If fields have Pydantic or dataclass defaults, their values are used."""
+    query = SelectWithDefaults.construct()
+    assert (query.a, query.b, query.c) == (5, [1], [2])
+    assert altqq.to_psycopg(query) == altqq.to_psycopg(SelectWithDefaults())
+
+
+def test_query_construct__required_pydantic_field__raises_error():
+    """If a Pydantic field has no default and no value, raise a TypeError."""
+
+    class Query(altqq.Query):
+        __query__ = "SELECT * FROM Users WHERE a = {a}"
+
+        a: int = pydantic.Field(gt=0)
+
+    with pytest.raises(TypeError, match="Missing value"):
+        Query.construct()
+
+
+def test_query_construct__missing_field__raises_error():
+    """If a required field is not provided, raise a TypeError."""
+    with pytest.raises(TypeError):
+        queries.SelectTableByFilter.construct(table="Users")
+
+
+def test_query_construct__unknown_field__raises_error():
+    """If an unknown field is provided, raise a TypeError."""
+    with pytest.raises(TypeError):
+        queries.SelectWithCalculated.construct(param=10, calc1=20)
+
+
+# Pydantic versions before 2.10 ignore defer_build for dataclasses
+requires_defer_build = pytest.mark.skipif(
+    tuple(int(v) for v in pydantic.VERSION.split(".")[:2]) < (2, 10),
+    reason="Pydantic dataclasses are built on definition before 2.10",
+)
+
+
+@requires_defer_build
+def test_query_defer_build__first_instantiation__validator_built():
+    """If the build is deferred, the validator is built on first use."""
+
+    class DeferredQuery(altqq.Query, defer_build=True):
+        __query__ = "SELECT * FROM Users WHERE age = {age}"
+        age: int
+
+    assert not DeferredQuery.__pydantic_complete__
+    assert DeferredQuery(age="20").age == 20
+    assert DeferredQuery.__pydantic_complete__
+    with pytest.raises(pydantic.ValidationError):
+        DeferredQuery(age="twenty")
+
+
+@requires_defer_build
+def test_query_defer_build__global_setting__prewarm_builds():
+    """If the build is deferred globally, prewarm builds the validators."""
+    QueryMeta.defer_build = True
+    try:
+
+        class DeferredQuery(altqq.Query):
+            __query__ = "SELECT * FROM Users WHERE age = {age}"
+            age: int
+
+    finally:
+        QueryMeta.defer_build = False
+
+    assert not DeferredQuery.__pydantic_complete__
+    assert altqq.prewarm([DeferredQuery]) == 1
+    assert DeferredQuery.__pydantic_complete__
+    assert altqq.prewarm([DeferredQuery]) == 0
+
+
+def test_query_validate_many__rows__validated_with_post_init():
+    """If many rows are validated, the values are converted and calculated."""
+    rows = [{"param": "10"}, {"param": 20}]
+    res = queries.SelectWithCalculated.validate_many(iter(rows))
+    assert res == [queries.SelectWithCalculated(10), queries.SelectWithCalculated(20)]
+    assert res[1].calc2 == 30
+
+
+def test_query_validate_many__invalid_row__error_has_row_index():
+    """If a row is not valid, the error is located by its index."""
+    rows = [{"param": 10}, {"param": 20}, {"param": "thirty"}]
+    with pytest.raises(pydantic.ValidationError) as exc_info:
+        queries.SelectWithCalculated.validate_many(rows)
+    assert exc_info.value.errors()[0]["loc"] == (2, "param")
+
+
+def test_query_validate_many__adapter__cached_per_class():
+    """If rows are validated twice, the validator of the list is reused."""
+    queries.SelectWithList.validate_many([{"list": [1]}])
+    adapter = queries.SelectWithList.__query_list_adapter__
+    queries.SelectWithList.validate_many([{"list": [2]}])
+    assert queries.SelectWithList.__query_list_adapter__ is adapter
+    assert queries.SelectWithArray.__query_list_adapter__ is None
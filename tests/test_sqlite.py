@@ -0,0 +1,142 @@
+"""Tests the sqlite3 translations by executing them in memory."""
+
+import sqlite3
+from typing import Iterator
+
+import altqq
+import pytest
+
+from tests.queries import OrderQuery, UnionAllQuery
+from tests.queries import SelectTableByFilter as Filter
+
+
+class SelectUsers(altqq.Query):
+    """Test query selecting the users by their ids."""
+
+    __query__ = "SELECT first_name FROM Users WHERE id IN {ids} ORDER BY id"
+
+    ids: altqq.ListParameter[int]
+
+
+class SelectUsersByArray(altqq.Query):
+    """Test query selecting the users by an array of ids."""
+
+    __query__ = """
+        SELECT first_name FROM Users
+        WHERE id IN (SELECT value FROM json_each({ids})) ORDER BY id
+    """
+
+    ids: altqq.ArrayParameter[int]
+
+
+class UserRow(altqq.Query):
+    """Test query for a single row of values."""
+
+    __query__ = "({id}, {first_name}, {age})"
+
+    id: int
+    first_name: str
+    age: int
+
+
+class InsertUser(altqq.Query):
+    """Test query inserting a single user."""
+
+    __query__ = "INSERT INTO Users (id, first_name, age) VALUES {row}"
+
+    row: UserRow
+
+
+USERS = [(1, "arietta", 20), (2, "fine", 30), (3, "it's", 40)]
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    """Creates an in-memory database with a Users table."""
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE Users (id INTEGER, first_name TEXT, age INT)")
+    connection.executemany("INSERT INTO Users VALUES (?, ?, ?)", USERS)
+    yield connection
+    connection.close()
+
+
+def test_to_sqlite__nested_queries__executes(connection: sqlite3.Connection):
+    """If the query is nested, the parameters are bound in order."""
+    query = UnionAllQuery(Filter("Users", "age", 20), Filter("Users", "id", 3))
+    res = altqq.to_sqlite(OrderQuery(query, "id", "asc"))
+    rows = connection.execute(res.query, res.parameters).fetchall()
+    assert [r[0] for r in rows] == [1, 3]
+    assert res.parameters == (20, 3)
+
+
+def test_to_sqlite__same_as_plain_text__same_rows(connection: sqlite3.Connection):
+    """If the query is run as plain text, the same rows are returned."""
+    query = SelectUsers([1, 3])
+    res = altqq.to_sqlite(query)
+    rows = connection.execute(res.query, res.parameters).fetchall()
+    plain_rows = connection.execute(altqq.to_plain_text(query)).fetchall()
+    assert rows == plain_rows == [("arietta",), ("it's",)]
+
+
+def test_to_sqlite__array_parameter__read_with_json_each(
+    connection: sqlite3.Connection,
+):
+    """If the query uses an array parameter, it is bound as a JSON array."""
+    res = altqq.to_sqlite(SelectUsersByArray([2, 3]))
+    rows = connection.execute(res.query, res.parameters).fetchall()
+    assert rows == [("fine",), ("it's",)]
+    assert res.parameters == ("[2, 3]",)
+
+
+def test_to_sqlite__list_bucketing__same_rows(connection: sqlite3.Connection):
+    """If the lists are padded, the query still returns the same rows."""
+    translator = altqq.SQLiteTranslator(altqq.ListBucketing())
+    res = translator(SelectUsers([1, 2, 3]))
+    rows = connection.execute(res.query, res.parameters).fetchall()
+    assert res.query.count("?") == 4
+    assert len(rows) == 3
+
+
+def test_to_sqlite_many__inserts__all_rows_written(connection: sqlite3.Connection):
+    """If the batch is executed, a row is written for each query."""
+    queries = [InsertUser(UserRow(i, str(i), i)) for i in range(10, 13)]
+    res = altqq.to_sqlite_many(queries)
+    connection.executemany(res.query, res.parameters)
+    rows = connection.execute("SELECT id FROM Users WHERE id >= 10").fetchall()
+    assert rows == [(10,), (11,), (12,)]
+
+
+def test_sqlite_values__chunked__all_rows_written(connection: sqlite3.Connection):
+    """If the rows are chunked, every chunk is a valid insert."""
+    rows = [UserRow(i, str(i), i) for i in range(10, 15)]
+    statement = "INSERT INTO Users (id, first_name, age) VALUES"
+    res = list(altqq.Translators.SQLITE.values(statement, rows, 6))
+    for query in res:
+        connection.execute(query.query, query.parameters)
+    count = connection.execute("SELECT COUNT(*) FROM Users WHERE id >= 10").fetchone()
+    assert len(res) == 3
+    assert count == (5,)
+
+
+def test_to_sqlite_named__repeated_nested_queries__executes(
+    connection: sqlite3.Connection,
+):
+    """If the parameters are named, the nested and repeated fields are bound."""
+    shared = Filter("Users", "age", 20)
+    res = altqq.to_sqlite_named(UnionAllQuery(shared, shared))
+    assert res.query.count(":query1__filter_value") == 2
+    assert res.parameters == {"query1__filter_value": 20}
+    rows = connection.execute(res.query, res.parameters).fetchall()
+    assert len(rows) == 2
+
+
+def test_sqlite_named_many__inserts__all_rows_written(
+    connection: sqlite3.Connection,
+):
+    """If a named batch is executed, a row is written for each query."""
+    queries = [InsertUser(UserRow(i, str(i), i)) for i in range(10, 13)]
+    res = altqq.Translators.SQLITE_NAMED.many(queries)
+    assert res.parameters[0] == {"row__id": 10, "row__first_name": "10", "row__age": 10}
+    connection.executemany(res.query, res.parameters)
+    rows = connection.execute("SELECT id FROM Users WHERE id >= 10").fetchall()
+    assert rows == [(10,), (11,), (12,)]
@@ -0,0 +1,74 @@
+"""Tests the streaming plain text translations."""
+
+import io
+import itertools
+import mmap
+
+import altqq
+from altqq.translators.plain_text import PlainTextTranslator
+
+from tests.queries import OrderQuery, SelectWithList, UnionAllQuery
+from tests.queries import SelectTableByFilter as Filter
+
+QUERIES = [
+    Filter("Users", "name", "O'Brien"),
+    OrderQuery(Filter("Users", "age", 20), "age", "desc"),
+    UnionAllQuery(Filter("Music", "title", "a"), Filter("Cities", "name", None)),
+    SelectWithList([1, 2, 3]),
+    SelectWithList([]),
+]
+
+
+def test_write_plain_text__queries__same_as_to_plain_text():
+    """If queries are written, the script has the plain text of each query."""
+    fp = io.StringIO()
+    written = altqq.write_plain_text(QUERIES, fp)
+    expected = "".join(f"{altqq.to_plain_text(q)};\n" for q in QUERIES)
+    assert fp.getvalue() == expected
+    assert written == len(expected)
+
+
+def test_iter_plain_text__queries__same_as_to_plain_text():
+    """If queries are iterated, the chunks join to the script."""
+    chunks = altqq.iter_plain_text(QUERIES, separator="\nGO\n")
+    expected = "".join(f"{altqq.to_plain_text(q)}\nGO\n" for q in QUERIES)
+    assert "".join(chunks) == expected
+
+
+def test_iter_plain_text__endless_queries__consumed_lazily():
+    """If the queries are endless, the chunks are still generated."""
+    queries = (SelectWithList([i]) for i in itertools.count())
+    chunks = altqq.iter_plain_text(queries)
+    script = "".join(itertools.islice(chunks, 50))
+    assert "A IN (0)" in script
+
+
+class RecordingWriter:
+    """Test file-like object recording the size of each write."""
+
+    def __init__(self):
+        self.sizes = []
+        self.text = io.StringIO()
+
+    def write(self, text):
+        """Records the size of the text and writes it."""
+        self.sizes.append(len(text))
+        self.text.write(text)
+
+
+def test_write__large_list__written_in_pieces():
+    """If a list parameter is large, its values are written in batches."""
+    query = SelectWithList(list(range(100_000)))
+    fp = RecordingWriter()
+    PlainTextTranslator().write([query], fp)
+    assert fp.text.getvalue() == altqq.to_plain_text(query) + ";\n"
+    assert max(fp.sizes) < 10_000
+
+
+def test_write_plain_text__encoding__writes_to_mmap():
+    """If an encoding is given, the bytes are written to the mmap."""
+    expected = "".join(f"{altqq.to_plain_text(q)};\n" for q in QUERIES).encode()
+    with mmap.mmap(-1, len(expected)) as buffer:
+        written = altqq.write_plain_text(QUERIES, buffer, encoding="utf-8")
+        assert written == len(expected)
+        assert buffer[:] == expected
@@ -0,0 +1,176 @@
+"""Tests the translators shared by concurrent threads."""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple
+
+import altqq
+import pytest
+
+from tests.queries import (
+    TEST_DATA,
+    SelectTableByFilter,
+    SelectWithDollar,
+    SelectWithList,
+    SelectWithRepeated,
+    UnionAllQuery,
+)
+
+N_THREADS = 16
+N_ROUNDS = 50
+
+
+class FrozenFilter(altqq.Query, frozen=True):
+    """Test query that can be cached."""
+
+    __query__ = "SELECT * FROM Users WHERE a = {value} AND b IN {values}"
+
+    value: int
+    values: altqq.ListParameter[int]
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches() -> Iterator[None]:
+    """Switches between the threads as often as possible."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_concurrently(func: Callable[[int], Any]) -> List[Any]:
+    """Runs a function in many threads at once and returns their results."""
+    with ThreadPoolExecutor(N_THREADS) as executor:
+        return list(executor.map(func, range(N_THREADS)))
+
+
+def create_workload() -> List[Tuple[Callable[[], Any], Any]]:
+    """Creates translations with their results from a single thread."""
+    cached = altqq.PsycopgTranslator(cache_size=8)
+    bound = SelectWithDollar.bind(table="Users")
+    translations: List[Callable[[], Any]] = []
+    for sample in TEST_DATA:
+        for translate in [altqq.to_pyodbc, altqq.to_psycopg, altqq.to_plain_text]:
+            translations.append(lambda t=translate, q=sample.query: t(q))
+    translations += [
+        lambda: altqq.to_asyncpg(
+            UnionAllQuery(
+                SelectTableByFilter("a", "b", 1), SelectTableByFilter("c", "d", 2)
+            )
+        ),
+        lambda: altqq.to_psycopg_named(SelectWithRepeated(1, [2, 3])),
+        lambda: altqq.to_sqlite_many(SelectWithList([i]) for i in range(20)),
+        lambda: list(altqq.to_mysql_values("INSERT INTO t VALUES", TEST_DATA[:1])),
+        lambda: altqq.fingerprint(SelectWithList([1, 2, 3])),
+        lambda: bound.to_psycopg(list=[1, 2], value=3),
+        lambda: bound.to_asyncpg(list=[1, 2, 3], value=4),
+        lambda: cached(FrozenFilter(1, (2, 3))),
+        lambda: cached(FrozenFilter(2, (3,))),
+    ]
+    return [(translate, translate()) for translate in translations]
+
+
+def test_translators__concurrent_threads__same_results():
+    """If threads share the translators, each gets the single thread results."""
+    workload = create_workload()
+
+    def work(index: int) -> int:
+        checked = 0
+        for i in range(N_ROUNDS):
+            translate, expected = workload[(index + i) % len(workload)]
+            assert translate() == expected
+            checked += 1
+        return checked
+
+    assert sum(run_concurrently(work)) == N_THREADS * N_ROUNDS
+
+
+def test_translation_cache__concurrent_threads__consistent_statistics():
+    """If threads share a cache, its statistics count every translation."""
+    translator = altqq.PyODBCTranslator(cache_size=4)
+    queries = [FrozenFilter(i, (i, i + 1)) for i in range(8)]
+    expected = [altqq.to_pyodbc(q) for q in queries]
+
+    def work(index: int) -> None:
+        for i in range(N_ROUNDS):
+            j = (index + i) % len(queries)
+            assert translator(queries[j]) == expected[j]
+
+    run_concurrently(work)
+    info = translator.cache.info()
+    assert info.hits + info.misses == N_THREADS * N_ROUNDS
+    assert info.size <= 4
+    # Threads missing the same query at once both translate it
+    assert info.misses - info.evictions >= info.size
+
+
+def test_translation_cache__finished_threads__statistics_kept():
+    """If the threads using a cache finish, their statistics are still counted."""
+    translator = altqq.PyODBCTranslator(cache_size=4)
+    query = FrozenFilter(1, (2, 3))
+    translator(query)
+    for _ in range(N_THREADS):
+        thread = threading.Thread(target=translator, args=(query,))
+        thread.start()
+        thread.join()
+
+    assert translator.cache.info().hits == N_THREADS
+
+
+def test_translation_cache__cleared_during_translations__no_negative_counts():
+    """If a cache is cleared while threads translate, the counts stay valid."""
+    translator = altqq.PyODBCTranslator(cache_size=4)
+    queries = [FrozenFilter(i, (i,)) for i in range(8)]
+
+    def work(index: int) -> None:
+        for i in range(N_ROUNDS):
+            translator(queries[(index + i) % len(queries)])
+            if index == 0:
+                translator.cache.clear()
+                info = translator.cache.info()
+                assert min(info.hits, info.misses, info.evictions) >= 0
+
+    run_concurrently(work)
+    translator.cache.clear()
+    translator(queries[0])
+    info = translator.cache.info()
+    assert (info.hits, info.misses, info.size) == (0, 1, 1)
+
+
+def test_hooks__added_during_translations__no_errors():
+    """If hooks change while threads translate, every translation completes."""
+    translator = altqq.PsycopgTranslator()
+    query = SelectTableByFilter("Users", "id", 1)
+    expected = translator(query)
+    events: List[altqq.TranslationEvent] = []
+
+    def work(index: int) -> None:
+        for _ in range(N_ROUNDS):
+            if index % 2:
+                hook = translator.add_hook(events.append)
+                translator.remove_hook(hook)
+            else:
+                assert translator(query) == expected
+
+    run_concurrently(work)
+    assert translator.hooks == []
+
+
+def test_literals__registered_during_translations__no_stale_functions():
+    """If literals are registered while threads translate, they are used."""
+
+    class Money(float):
+        """Test type with a registered literal."""
+
+    translator = altqq.PlainTextTranslator()
+
+    def work(index: int) -> None:
+        for _ in range(N_ROUNDS):
+            translator(SelectTableByFilter("Users", "price", Money(1.5)))
+            if index == 0:
+                translator.literals.register(Money, lambda v: "MONEY")
+
+    run_concurrently(work)
+    res = translator(SelectTableByFilter("Users", "price", Money(1.5)))
+    assert '"price" = MONEY' in res
@@ -1,9 +1,19 @@
 """Tests the translations of queries."""
 
+import sys
+
 import altqq
 import pytest
 
-from tests.queries import TEST_DATA, SampleQuery
+from tests.queries import (
+    TEST_DATA,
+    OrderQuery,
+    SampleQuery,
+    SelectTableByFilter,
+    SelectTableByFilterNonParameter,
+    SelectWithArray,
+    SelectWithList,
+)
 from tests.utils import clean_whitespaces as cws
 
 
@@ -36,3 +46,147 @@ def test_to_plain_text__proper_query__correct_sql(query: SampleQuery):
     """If the query parameters are correct, the sql is returned."""
     sql = altqq.to_plain_text(query.query)
     assert cws(query.plain_text) == cws(sql)
+
+
+def test_to_psycopg__array_parameter__single_list_parameter():
+    """If the query uses an array parameter, a single list is bound."""
+    res = altqq.to_psycopg(SelectWithArray((10, 20, 30)))
+    assert cws(res.query) == "SELECT * FROM table WHERE A = ANY(%s)"
+    assert res.parameters == ([10, 20, 30],)
+
+
+@pytest.mark.parametrize("translate", [altqq.to_pyodbc, altqq.to_mysql])
+def test_to_json_dialects__array_parameter__single_json_parameter(translate):
+    """If the dialect has no array type, a single JSON array is bound."""
+    res = translate(SelectWithArray([10, 20, 30]))
+    assert list(res.parameters) == ["[10, 20, 30]"]
+
+
+def test_to_plain_text__array_parameter__json_string():
+    """If the query uses an array parameter, a JSON array string is written."""
+    sql = altqq.to_plain_text(SelectWithArray([10, 20, 30]))
+    assert cws(sql) == "SELECT * FROM table WHERE A = ANY('[10, 20, 30]')"
+
+
+@pytest.mark.parametrize(
+    "array,expected",
+    [
+        ([10, 20, 30], "ANY(ARRAY[10,20,30])"),
+        (["a'b"], "ANY(ARRAY['a''b'])"),
+        ([], "ANY('{}')"),
+    ],
+)
+def test_plain_text_translator__postgresql_array_parameter__array_literal(
+    array, expected
+):
+    """If the literals are of PostgreSQL, an array literal is written."""
+    translator = altqq.PlainTextTranslator(altqq.LiteralRenderer("postgresql"))
+    query = SelectWithArray(array)
+    assert cws(translator(query)) == f"SELECT * FROM table WHERE A = {expected}"
+    assert "".join(translator.iter_chunks([query], "")) == translator(query)
+
+
+def test_to_psycopg_many__array_parameter__different_lengths_allowed():
+    """If the query uses an array parameter, the length does not change the SQL."""
+    res = altqq.to_psycopg_many([SelectWithArray([1]), SelectWithArray([2, 3])])
+    assert res.parameters == [([1],), ([2, 3],)]
+
+
+@pytest.mark.parametrize(
+    "bucketing,values,parameters",
+    [
+        (altqq.ListBucketing(), [1, 2, 3], [1, 2, 3, 3]),
+        (altqq.ListBucketing(), [1, 2, 3, 4], [1, 2, 3, 4]),
+        (altqq.ListBucketing(sizes=(10, 5)), [1, 2], [1, 2, 2, 2, 2]),
+        (altqq.ListBucketing(pad_with_null=True), [1, 2, 3], [1, 2, 3, None]),
+    ],
+)
+def test_to_pyodbc__list_bucketing__list_padded(bucketing, values, parameters):
+    """If list bucketing is used, the list is padded to the bucket size."""
+    translator = altqq.PyODBCTranslator(list_bucketing=bucketing)
+    res = translator(SelectWithList(values))
+    markers = ",".join("?" for _ in parameters)
+    assert cws(res.query) == f"SELECT * FROM table WHERE A IN ({markers})"
+    assert res.parameters == parameters
+
+
+def test_to_psycopg_many__list_bucketing__same_bucket_allowed():
+    """If list bucketing is used, lists in the same bucket share the SQL."""
+    translator = altqq.PsycopgTranslator(list_bucketing=altqq.ListBucketing())
+    res = translator.many([SelectWithList([1, 2, 3]), SelectWithList([4, 5, 6])])
+    assert cws(res.query) == "SELECT * FROM table WHERE A IN (%s,%s,%s,%s)"
+    assert res.parameters == [(1, 2, 3, 3), (4, 5, 6, 6)]
+
+
+def test_fingerprint__different_parameters__same_fingerprint():
+    """If only the parameters differ, the fingerprints are the same."""
+    query1 = OrderQuery(SelectTableByFilter("Users", "name", "Fine"), "age", "asc")
+    query2 = OrderQuery(SelectTableByFilter("Users", "name", "Arietta"), "age", "asc")
+    assert altqq.fingerprint(query1) == altqq.fingerprint(query2)
+    assert altqq.to_psycopg(query1).fingerprint == altqq.fingerprint(query1)
+    assert altqq.to_pyodbc(query1).fingerprint == altqq.fingerprint(query1)
+    assert altqq.to_mysql(query1).fingerprint == altqq.fingerprint(query1)
+
+
+@pytest.mark.parametrize(
+    "query1,query2",
+    [
+        (SelectWithList([1, 2]), SelectWithList([1, 2, 3])),
+        (
+            SelectTableByFilter("Users", "age", 20),
+            SelectTableByFilter("Users", "name", 20),
+        ),
+        (
+            SelectTableByFilter("Users", "age", 20),
+            SelectTableByFilterNonParameter("Users", "age", 20),
+        ),
+        (
+            SelectTableByFilter("Users", "age", 20),
+            SelectTableByFilter("Users", "age", SelectWithList([20])),
+        ),
+    ],
+)
+def test_fingerprint__different_structure__different_fingerprint(query1, query2):
+    """If the SQL structure differs, the fingerprints are different."""
+    assert altqq.fingerprint(query1) != altqq.fingerprint(query2)
+
+
+class WrapQuery(altqq.Query):
+    """Test query that wraps another query."""
+
+    __query__ = "SELECT * FROM ({query}) AS t WHERE {value} = 1"
+
+    query: altqq.Query
+    value: int
+
+
+def test_translators__deeply_nested_query__no_recursion_limit():
+    """If the query is nested deeper than the recursion limit, it still works."""
+    depth = sys.getrecursionlimit() + 100
+    query = SelectWithList([0])
+    for i in range(depth):
+        query = WrapQuery(query, i)
+
+    psycopg = altqq.to_psycopg(query)
+    pyodbc = altqq.to_pyodbc(query)
+    plain_text = altqq.to_plain_text(query)
+    assert psycopg.parameters == (0,) + tuple(range(depth))
+    assert pyodbc.query.count("?") == depth + 1
+    assert plain_text.startswith("SELECT * FROM (SELECT * FROM (")
+
+
+def test_fingerprint__classes_with_same_name__different_fingerprint():
+    """If classes share their name but not their SQL, the fingerprints differ."""
+
+    def create_query(template: str) -> type:
+        class Select(altqq.Query):
+            __query__ = template
+
+            value: int
+
+        return Select
+
+    query1 = create_query("SELECT * FROM Users WHERE age = {value}")(20)
+    query2 = create_query("DELETE FROM Users WHERE age = {value}")(20)
+    assert type(query1).__qualname__ == type(query2).__qualname__
+    assert altqq.fingerprint(query1) != altqq.fingerprint(query2)
@@ -0,0 +1,81 @@
+"""Tests the multi-row VALUES translations of queries."""
+
+import dataclasses as dc
+
+import altqq
+import pytest
+
+
+class UserRow(altqq.Query):
+    """Test query for a single row of values."""
+
+    __query__ = "({first_name}, {age})"
+
+    first_name: str
+    age: int
+
+
+class InsertUsers(altqq.Query):
+    """Test query for inserting rows to a table."""
+
+    __query__ = 'INSERT INTO "{table}" (first_name, "100%") VALUES'
+
+    table: altqq.NonParameter[str]
+
+
+@dc.dataclass
+class UserData:
+    """Test dataclass for a single row of values."""
+
+    first_name: str
+    age: int
+
+
+def test_to_psycopg_values__rows__single_statement():
+    """If the rows fit the parameter limit, a single statement is returned."""
+    rows = [UserRow("arietta", 20), UserRow("fine", 30)]
+    res = list(altqq.to_psycopg_values(InsertUsers("Users"), rows))
+    assert len(res) == 1
+    assert res[0].query == (
+        'INSERT INTO "Users" (first_name, "100%%") VALUES (%s, %s),(%s, %s)'
+    )
+    assert res[0].parameters == ("arietta", 20, "fine", 30)
+
+
+def test_to_pyodbc_values__dataclass_rows__fields_as_parameters():
+    """If the rows are dataclasses, all the fields are written as parameters."""
+    rows = [UserData("arietta", 20), UserData("fine", 30)]
+    res = list(altqq.to_pyodbc_values("INSERT INTO Users VALUES", rows))
+    assert res[0].query == "INSERT INTO Users VALUES (?,?),(?,?)"
+    assert res[0].parameters == ["arietta", 20, "fine", 30]
+
+
+def test_values__over_parameter_limit__chunked_statements():
+    """If the rows exceed the parameter limit, the statements are chunked."""
+    rows = [UserRow(str(i), i) for i in range(5)]
+    res = list(altqq.Translators.MYSQL.values("INSERT INTO Users VALUES", rows, 4))
+    assert [len(r.parameters) for r in res] == [4, 4, 2]
+    assert res[-1].query == "INSERT INTO Users VALUES (%s, %s)"
+
+
+def test_values__same_rows_structure__same_fingerprint():
+    """If the statements have the same SQL, they have the same fingerprint."""
+    rows = [UserRow(str(i), i) for i in range(5)]
+    res = list(altqq.Translators.MYSQL.values(InsertUsers("Users"), rows, 4))
+    other = list(altqq.to_mysql_values(InsertUsers("Users"), rows[:2]))
+    assert res[0].fingerprint == res[1].fingerprint == other[0].fingerprint
+    assert len({r.fingerprint for r in res}) == 2
+    assert all(r.fingerprint for r in res)
+
+
+def test_values__row_over_parameter_limit__raises_error():
+    """If a single row exceeds the parameter limit, raise a ValueError."""
+    rows = [UserRow("arietta", 20)]
+    with pytest.raises(ValueError):
+        list(altqq.Translators.PYODBC.values("INSERT INTO Users VALUES", rows, 1))
+
+
+def test_values__unsupported_row__raises_error():
+    """If a row is neither a query nor a dataclass, raise a TypeError."""
+    with pytest.raises(TypeError):
+        list(altqq.to_pyodbc_values("INSERT INTO Users VALUES", [("fine", 30)]))